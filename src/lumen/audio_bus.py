@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+except Exception:  # pragma: no cover
+    sd = None
+
+from .config import CONFIG
+
+
+SAMPLERATE = 16000
+
+
+class Subscription:
+    """One consumer's read cursor into the bus.
+
+    Each subscriber reads at its own pace. If it falls more than the ring's
+    capacity behind, the oldest audio is skipped and ``overruns`` is
+    incremented (``lost_frames`` counts the samples skipped).
+    """
+
+    def __init__(self, bus: "AudioBus", name: str) -> None:
+        self.bus = bus
+        self.name = name
+        self.cursor = bus.written
+        self.overruns = 0
+        self.lost_frames = 0
+
+    def available(self) -> int:
+        return self.bus.written - self.cursor
+
+    def read(self, max_frames: int | None = None, timeout: float | None = None,
+             min_frames: int = 1) -> np.ndarray:
+        """Frames written since the last read, as a (frames, channels) int16 view.
+
+        Blocks up to ``timeout`` seconds until ``min_frames`` are available
+        (``timeout=None`` returns immediately). The view points into the ring
+        and stays valid until the writer laps it, i.e. for about the ring
+        length; copy it if it must be kept longer.
+        """
+        if timeout is not None and self.available() < min_frames:
+            self.bus.wait(self.cursor + min_frames, timeout)
+        written = self.bus.written
+        behind = written - self.cursor
+        if behind > self.bus.capacity:
+            skipped = behind - self.bus.capacity
+            self.overruns += 1
+            self.lost_frames += skipped
+            self.cursor += skipped
+            behind = self.bus.capacity
+        n = behind if max_frames is None else min(behind, max_frames)
+        view = self.bus.view(self.cursor, n)
+        self.cursor += n
+        return view
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def stats(self) -> dict:
+        return {"name": self.name, "behind": self.available(), "overruns": self.overruns,
+                "lost_frames": self.lost_frames}
+
+
+class AudioBus:
+    """Single owner of the microphone input stream, fanned out to many readers.
+
+    Audio is written by the stream callback into a mirrored ring buffer: every
+    block is stored twice, ``capacity`` samples apart, so any span of up to
+    ``capacity`` samples is contiguous and can be handed out as a numpy view
+    with no copy. There is one writer; readers keep their own cursors and
+    never lock the writer out.
+    """
+
+    def __init__(self, samplerate: int = SAMPLERATE, channels: int | None = None,
+                 buffer_sec: float | None = None, device: str | int | None = None) -> None:
+        self.samplerate = samplerate
+        self.channels = max(1, channels or CONFIG.audio_channels)
+        self.capacity = int(samplerate * (buffer_sec or CONFIG.audio_buffer_sec))
+        device = device if device is not None else CONFIG.audio_device
+        # sounddevice treats a string as a device name, so AUDIO_DEVICE=1 must become index 1
+        if isinstance(device, str) and device.strip().isdigit():
+            device = int(device)
+        self.device = device
+        self._ring = np.zeros((2 * self.capacity, self.channels), dtype=np.int16)
+        # Total frames ever written; readers compare their cursor against it
+        self.written = 0
+        self.status_errors = 0
+        self._cond = threading.Condition()
+        self._subs: List[Subscription] = []
+        self._subs_lock = threading.Lock()
+        self._stream = None
+
+    # --- writer side ---
+    def write(self, block: np.ndarray) -> None:
+        """Append (frames, channels) int16 samples. Called from the stream callback."""
+        block = np.asarray(block, dtype=np.int16).reshape(-1, self.channels)
+        if len(block) > self.capacity:
+            block = block[-self.capacity:]
+        n = len(block)
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        for base in (start, start + self.capacity):
+            self._ring[base:base + first] = block[:first]
+        if first < n:
+            rest = n - first
+            self._ring[:rest] = block[first:]
+            self._ring[self.capacity:self.capacity + rest] = block[first:]
+        self.written += n
+        with self._cond:
+            self._cond.notify_all()
+
+    def _on_audio(self, indata, frames, time_info, status) -> None:
+        if status:
+            self.status_errors += 1
+        self.write(indata)
+
+    # --- reader side ---
+    def view(self, start: int, frames: int) -> np.ndarray:
+        """Zero-copy view of ``frames`` samples beginning at absolute position ``start``."""
+        frames = max(0, min(frames, self.capacity))
+        offset = start % self.capacity
+        return self._ring[offset:offset + frames]
+
+    def latest(self, frames: int) -> np.ndarray:
+        """View of the most recent ``frames`` samples (fewer if not yet recorded)."""
+        frames = min(frames, self.written, self.capacity)
+        return self.view(self.written - frames, frames)
+
+    def wait(self, position: int, timeout: float) -> bool:
+        """Block until ``position`` frames have been written or ``timeout`` expires."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.written >= position, timeout=timeout)
+
+    def subscribe(self, name: str = "reader") -> Subscription:
+        sub = Subscription(self, name)
+        with self._subs_lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._subs_lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    # --- stream ---
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def start(self) -> bool:
+        """Open the input stream. Returns False in simulation or when no microphone is available."""
+        if self._stream is not None:
+            return True
+        if CONFIG.simulate or sd is None:
+            return False
+        try:
+            self._stream = sd.InputStream(samplerate=self.samplerate, channels=self.channels, dtype='int16',
+                                          blocksize=self.samplerate // 20, device=self.device,
+                                          callback=self._on_audio)
+            self._stream.start()
+        except Exception:
+            self._stream = None
+            return False
+        return True
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+    def stats(self) -> dict:
+        with self._subs_lock:
+            subs = [s.stats() for s in self._subs]
+        return {
+            "running": self.running,
+            "samplerate": self.samplerate,
+            "channels": self.channels,
+            "buffer_sec": self.capacity / self.samplerate,
+            "frames_written": self.written,
+            "status_errors": self.status_errors,
+            "subscribers": subs,
+        }
+
+
+_BUS: Optional[AudioBus] = None
+_BUS_LOCK = threading.Lock()
+
+
+def get_audio_bus(start: bool = True) -> AudioBus:
+    """Process-wide bus; the microphone stream is opened on first use."""
+    global _BUS
+    with _BUS_LOCK:
+        if _BUS is None:
+            _BUS = AudioBus()
+        if start:
+            _BUS.start()
+        return _BUS
+
+
+def to_float(samples: np.ndarray) -> np.ndarray:
+    """int16 samples to float32 in [-1, 1)."""
+    return samples.astype(np.float32) / 32768.0
@@ -1,28 +1,288 @@
 from __future__ import annotations
 
-import numpy as np
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
 
-try:
-    import sounddevice as sd
-except Exception:  # pragma: no cover
-    sd = None
+import numpy as np
 
 from .config import CONFIG
+from .audio_bus import Subscription, get_audio_bus, to_float
+from .vad import StreamingVAD
+
+
+_VAD: Optional[StreamingVAD] = None
+_SUB: Optional[Subscription] = None
+_LOCK = threading.Lock()
 
 
 def detect_sound_activity(duration_sec: float = 0.2, samplerate: int = 16000) -> dict:
-    """Return simple RMS-based activity metric from mic input.
+    """Return a sound-onset flag and energy metrics from mic input.
 
-    With a single mic, we can't localize direction, but we can detect whether
-    sound is present and its approximate energy.
+    Audio recorded since the previous call is run through a streaming VAD with
+    an adaptive noise floor, so ``active`` is True only when a new sound
+    started (steady background noise does not keep re-triggering). With a
+    single mic, we can't localize direction, but we can detect whether sound
+    is present and its approximate energy. With a configured mic array the
+    result also carries the sound's direction (see ``DOAEngine``).
+    ``duration_sec`` bounds how much audio the first call looks at.
     """
-    if CONFIG.simulate or sd is None:
+    global _VAD, _SUB
+    if CONFIG.simulate:
         return {"active": False, "rms": 0.0}
     try:
-        audio = sd.rec(int(duration_sec * samplerate), samplerate=samplerate, channels=1, dtype='float32')
-        sd.wait()
-        arr = audio.reshape(-1)
-        rms = float(np.sqrt(np.mean(arr ** 2)))
-        return {"active": rms > 0.02, "rms": rms}
+        bus = get_audio_bus()
+        if not bus.running:
+            return {"active": False, "rms": 0.0}
+        with _LOCK:
+            if _SUB is None:
+                _VAD = StreamingVAD(bus.samplerate)
+                _SUB = bus.subscribe("sound_activity")
+                _SUB.cursor = max(0, bus.written - int(duration_sec * bus.samplerate))
+            arr = to_float(_SUB.read(timeout=duration_sec, min_frames=_VAD.frame_len)[:, 0])
+            res = _VAD.process(arr)
+        rms = float(np.sqrt(np.mean(arr ** 2))) if arr.size else 0.0
+        out = {
+            "active": res.onset,
+            "speech": bool(res.speech.any()),
+            "rms": rms,
+            "noise_floor_db": round(_VAD.noise_floor_db or 0.0, 1),
+        }
+        doa = get_doa_engine()
+        est = doa.direction() if doa is not None else None
+        if est is not None:
+            out.update({"azimuth_deg": est.azimuth_deg, "direction": est.phrase, "direction_confidence": est.confidence})
+        return out
     except Exception:
-        return {"active": False, "rms": 0.0}
\ No newline at end of file
+        return {"active": False, "rms": 0.0}
+
+
+def stop_sound_activity() -> None:
+    """Close the bus subscription of ``detect_sound_activity``.
+
+    Call when the caller stops polling; an open subscription nobody reads
+    would only pile up overruns. The next call subscribes again.
+    """
+    global _VAD, _SUB
+    with _LOCK:
+        if _SUB is not None:
+            _SUB.close()
+        _SUB = None
+        _VAD = None
+
+
+# --- Direction of arrival (multi-microphone arrays) ---
+
+SPEED_OF_SOUND = 343.0  # m/s
+
+# Mic positions in metres; x points to the wearer's right, y straight ahead
+MIC_ARRAYS = {
+    "respeaker-2mic": [(-0.029, 0.0), (0.029, 0.0)],
+    "respeaker-4mic": [(-0.032, 0.032), (0.032, 0.032), (0.032, -0.032), (-0.032, -0.032)],
+}
+
+
+def mic_positions(spec: str | None = None) -> Optional[np.ndarray]:
+    """Mic geometry from a preset name or "x,y;x,y;..." in metres (CONFIG.mic_array by default)."""
+    spec = spec if spec is not None else CONFIG.mic_array
+    if not spec:
+        return None
+    if spec in MIC_ARRAYS:
+        return np.array(MIC_ARRAYS[spec], dtype=np.float64)
+    try:
+        pts = np.array([[float(v) for v in p.split(",")] for p in spec.split(";") if p.strip()], dtype=np.float64)
+    except ValueError:
+        return None
+    return pts if pts.ndim == 2 and pts.shape[1] == 2 and len(pts) >= 2 else None
+
+
+def direction_phrase(azimuth_deg: float) -> str:
+    """Spoken direction for an azimuth (0 = ahead, positive = clockwise/right)."""
+    a = (azimuth_deg + 180.0) % 360.0 - 180.0
+    side = "right" if a > 0 else "left"
+    m = abs(a)
+    if m < 22.5:
+        return "in front of you"
+    if m < 67.5:
+        return f"ahead to your {side}"
+    if m < 112.5:
+        return f"to your {side}"
+    if m < 157.5:
+        return f"behind you to the {side}"
+    return "behind you"
+
+
+@dataclass
+class DOAEstimate:
+    azimuth_deg: float
+    confidence: float
+    ts: float
+
+    @property
+    def phrase(self) -> str:
+        return direction_phrase(self.azimuth_deg)
+
+
+class DOAEstimator:
+    """GCC-PHAT / steered-response direction finder for a small mic array.
+
+    All overlapping frames and all mic pairs are transformed in one batched
+    FFT. PHAT-weighted cross spectra are averaged over frames, turned into
+    upsampled cross-correlations, and summed at the lags each candidate
+    azimuth would produce. Linear arrays cannot tell front from back, so
+    they only search the front half-plane.
+    """
+
+    def __init__(self, positions: np.ndarray, samplerate: int = 16000, frame_len: int = 512,
+                 step_deg: float = 2.0, upsample: int = 4) -> None:
+        self.positions = np.asarray(positions, dtype=np.float64)
+        self.samplerate = samplerate
+        self.frame_len = frame_len
+        self.hop = frame_len // 2
+        self.nfft = 2 * frame_len
+        self.upsample = upsample
+        m = len(self.positions)
+        self.pairs_i, self.pairs_j = np.triu_indices(m, k=1)
+        centered = self.positions - self.positions.mean(axis=0)
+        linear = np.linalg.matrix_rank(centered, tol=1e-6) < 2
+        lo, hi = (-90.0, 90.0) if linear else (-180.0, 180.0 - step_deg)
+        self.angles = np.arange(lo, hi + step_deg / 2, step_deg)
+        rad = np.deg2rad(self.angles)
+        u = np.stack([np.sin(rad), np.cos(rad)], axis=1)  # (A, 2)
+        # Mic k hears a far-field source from u earlier by p_k.u / c
+        arrival = -(u @ self.positions.T) / SPEED_OF_SOUND  # (A, M)
+        tau = arrival[:, self.pairs_i] - arrival[:, self.pairs_j]  # (A, P)
+        n_cc = self.nfft * upsample
+        self._lag_idx = np.round(tau * samplerate * upsample).astype(np.int64) % n_cc
+        self._pair_idx = np.arange(len(self.pairs_i))[None, :]
+        self._window = np.hanning(frame_len)[None, :, None]
+
+    def estimate(self, audio: np.ndarray) -> Optional[DOAEstimate]:
+        """Direction of the dominant source in (samples, mics) audio, or None if too short."""
+        x = np.asarray(audio, dtype=np.float64)[:, :len(self.positions)]
+        if len(x) < self.frame_len:
+            return None
+        frames = np.lib.stride_tricks.sliding_window_view(x, self.frame_len, axis=0)[::self.hop]
+        frames = frames.transpose(0, 2, 1) * self._window  # (F, frame_len, M)
+        spec = np.fft.rfft(frames, n=self.nfft, axis=1)
+        cross = spec[:, :, self.pairs_i] * np.conj(spec[:, :, self.pairs_j])
+        cross /= np.abs(cross) + 1e-12
+        cc = np.fft.irfft(cross.mean(axis=0), n=self.nfft * self.upsample, axis=0)  # (lags, P)
+        srp = cc[self._lag_idx, self._pair_idx].sum(axis=1)
+        best = int(np.argmax(srp))
+        # A fully coherent pair peaks at about 1 / upsample, so this is the mean pair coherence
+        confidence = float(np.clip(srp[best] * self.upsample / len(self.pairs_i), 0.0, 1.0))
+        return DOAEstimate(float(self.angles[best]), round(confidence, 3), time.time())
+
+
+def synthetic_array_signal(positions: np.ndarray, azimuth_deg: float, duration_sec: float = 1.0,
+                           samplerate: int = 16000, snr_db: float = 20.0, seed: int = 0) -> np.ndarray:
+    """Broadband source at ``azimuth_deg`` as heard by each mic, plus independent sensor noise.
+
+    Returns (samples, mics) int16 for feeding an AudioBus or DOAEstimator without hardware.
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.asarray(positions, dtype=np.float64)
+    n = int(duration_sec * samplerate)
+    src = np.fft.rfft(rng.standard_normal(n))
+    freqs = np.fft.rfftfreq(n, 1.0 / samplerate)
+    rad = np.deg2rad(azimuth_deg)
+    arrival = -(positions @ np.array([np.sin(rad), np.cos(rad)])) / SPEED_OF_SOUND
+    # Fractional delays as phase shifts
+    chans = np.fft.irfft(src[:, None] * np.exp(-2j * np.pi * freqs[:, None] * arrival[None, :]), n=n, axis=0)
+    chans /= np.abs(chans).max() + 1e-12
+    chans *= 0.3
+    chans += rng.standard_normal(chans.shape) * 0.3 / np.sqrt(2.0) * 10 ** (-snr_db / 20.0)
+    return (np.clip(chans, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+class DOAEngine:
+    """Streams direction estimates from the multichannel audio bus.
+
+    Every ``1 / rate_hz`` seconds the newest audio is checked with the VAD;
+    while sound is active the last ``window_sec`` of audio is localized and
+    the estimate published in ``latest``.
+    """
+
+    def __init__(self, positions: np.ndarray, bus=None, rate_hz: float = 10.0, window_sec: float = 0.2,
+                 min_confidence: float = 0.15) -> None:
+        self.bus = bus or get_audio_bus()
+        self.estimator = DOAEstimator(positions, self.bus.samplerate)
+        self.rate_hz = rate_hz
+        self.window = int(window_sec * self.bus.samplerate)
+        self.min_confidence = min_confidence
+        self.vad = StreamingVAD(self.bus.samplerate)
+        self.latest: Optional[DOAEstimate] = None
+        self.estimates = 0
+        self.compute_ms = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        sub = self.bus.subscribe("doa")
+        period = 1.0 / self.rate_hz
+        try:
+            while not self._stop.is_set():
+                new = sub.read(timeout=period, min_frames=int(period * self.bus.samplerate))
+                t0 = time.perf_counter()
+                if len(new) and self.vad.process(new[:, 0]).active.any():
+                    est = self.estimator.estimate(to_float(self.bus.latest(self.window)))
+                    if est is not None:
+                        self.latest = est
+                        self.estimates += 1
+                        ms = (time.perf_counter() - t0) * 1000.0
+                        self.compute_ms = ms if self.estimates == 1 else 0.9 * self.compute_ms + 0.1 * ms
+        finally:
+            sub.close()
+
+    def direction(self, max_age: float = 2.0) -> Optional[DOAEstimate]:
+        """Latest confident estimate no older than ``max_age`` seconds."""
+        est = self.latest
+        if est is None or time.time() - est.ts > max_age or est.confidence < self.min_confidence:
+            return None
+        return est
+
+    def stats(self) -> dict:
+        est = self.latest
+        return {
+            "running": self.running,
+            "mics": len(self.estimator.positions),
+            "estimates": self.estimates,
+            "compute_ms": round(self.compute_ms, 2),
+            "latest": {"azimuth_deg": est.azimuth_deg, "confidence": est.confidence, "ts": est.ts,
+                       "direction": est.phrase} if est else None,
+        }
+
+
+_DOA: Optional[DOAEngine] = None
+
+
+def get_doa_engine() -> Optional[DOAEngine]:
+    """Shared DOA engine, or None without a configured multi-mic array."""
+    global _DOA
+    with _LOCK:
+        if _DOA is None:
+            positions = mic_positions()
+            if positions is None or CONFIG.simulate:
+                return None
+            bus = get_audio_bus()
+            if not bus.running or bus.channels < len(positions):
+                return None
+            _DOA = DOAEngine(positions, bus)
+            _DOA.start()
+        return _DOA
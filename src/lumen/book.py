@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from .camera import CameraRing, get_camera_ring, release_camera_ring
+from .ocr import iter_page_text
+from .scene import SceneChangeDetector
+
+
+BOOKMARKS_PATH = Path("./data/bookmarks.json")
+
+
+def load_bookmark(book_id: str) -> int:
+    """Last page read for ``book_id`` (0 when the book was never opened)."""
+    try:
+        data = json.loads(BOOKMARKS_PATH.read_text())
+        return int(data.get(book_id, {}).get("page", 0))
+    except Exception:
+        return 0
+
+
+def save_bookmark(book_id: str, page: int) -> None:
+    BOOKMARKS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        data = json.loads(BOOKMARKS_PATH.read_text())
+    except Exception:
+        data = {}
+    data[book_id] = {"page": page, "ts": time.time()}
+    tmp = BOOKMARKS_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, BOOKMARKS_PATH)
+
+
+class PageTurnDetector:
+    """Detects "motion, then a stable frame" in a stream of camera frames.
+
+    ``feed`` returns True once per page turn, on the first frame after the
+    motion has settled for ``stable_frames`` consecutive frames. The very first
+    stable view also counts, so the page already in front of the camera is read.
+    """
+
+    def __init__(self, motion_fraction: float = 0.05, stable_fraction: float = 0.01,
+                 stable_frames: int = 3) -> None:
+        self.motion_fraction = motion_fraction
+        self.stable_fraction = stable_fraction
+        self.stable_frames = stable_frames
+        self._diff = SceneChangeDetector(min_changed_fraction=stable_fraction)
+        self._moved = True
+        self._stable = 0
+
+    def feed(self, frame) -> bool:
+        fraction = self._diff.check(frame).changed_fraction
+        if fraction >= self.motion_fraction:
+            self._moved = True
+            self._stable = 0
+            return False
+        if fraction < self.stable_fraction:
+            self._stable += 1
+        else:
+            self._stable = 0
+        if self._moved and self._stable >= self.stable_frames:
+            self._moved = False
+            return True
+        return False
+
+
+@dataclass
+class Page:
+    number: int
+    blocks: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.blocks)
+
+
+class BookReader:
+    """Continuous book reading over the camera ring.
+
+    A watcher thread looks for page turns and hands each settled frame to an
+    OCR thread, which fills a small queue of pages ready to speak. Page N+1 is
+    therefore recognized while page N is still being spoken.
+    """
+
+    def __init__(self, book_id: str = "default", queue_size: int = 3, ring: CameraRing | None = None) -> None:
+        self.book_id = book_id
+        self.ring = ring
+        # Without a ring of its own the reader holds the shared one while it runs
+        self._shared_ring = ring is None
+        self._holds_ring = False
+        self.detector = PageTurnDetector()
+        self.ready: "queue.Queue[Page]" = queue.Queue(maxsize=queue_size)
+        self._captured: "queue.Queue[tuple]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.last_page = load_bookmark(book_id)
+        self._next_number = self.last_page + 1
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        if self._shared_ring and not self._holds_ring:
+            self.ring = get_camera_ring()
+            self._holds_ring = True
+        self._threads = [
+            threading.Thread(target=self._watch, daemon=True),
+            threading.Thread(target=self._recognize, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._holds_ring:
+            self._holds_ring = False
+            release_camera_ring()
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            frame = self.ring.wait_for_frame(timeout=1.0)
+            if frame is None or not self.detector.feed(frame):
+                continue
+            number = self._next_number
+            self._next_number += 1
+            while not self._stop.is_set():
+                try:
+                    self._captured.put((number, frame), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def _recognize(self) -> None:
+        while not self._stop.is_set():
+            try:
+                number, frame = self._captured.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                page = Page(number, list(iter_page_text(frame)))
+            except Exception:
+                page = Page(number)
+            while not self._stop.is_set():
+                try:
+                    self.ready.put(page, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def next_page(self, timeout: float = 0.0) -> Optional[Page]:
+        try:
+            return self.ready.get(timeout=timeout) if timeout > 0 else self.ready.get_nowait()
+        except queue.Empty:
+            return None
+
+    def mark_read(self, page: Page) -> None:
+        self.last_page = page.number
+        save_bookmark(self.book_id, page.number)
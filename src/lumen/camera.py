@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections import deque
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 try:
     import cv2
 except Exception:  # pragma: no cover
     cv2 = None
 
-from .config import CONFIG
+from .config import CONFIG, CONFIG_STORE
+from .devices import DEVICES
 
 
 def capture_image(output_path: str | os.PathLike, camera_index: int | None = None) -> str:
@@ -42,11 +47,223 @@ def capture_image(output_path: str | os.PathLike, camera_index: int | None = Non
             out.touch()
         return str(out)
 
+    frame = capture_frame(camera_index)
+    cv2.imwrite(str(out), frame)
+    return str(out)
+
+
+def capture_frame(camera_index: int | None = None):
+    """Grab a single BGR frame as a numpy array without touching the disk.
+
+    In simulation mode (or without OpenCV), returns the placeholder image.
+    """
+    import numpy as np
+    if CONFIG.simulate or cv2 is None:
+        img = np.zeros((480, 640, 3), dtype=np.uint8)
+        if cv2 is not None:
+            cv2.putText(img, "SIMULATED IMAGE", (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        return img
+
     index = CONFIG.camera_index if camera_index is None else camera_index
+    # The ring already has the device open; a second VideoCapture on it would fail or fight for frames
+    ring = _RING
+    if ring is not None and ring.running and ring.camera_index == index:
+        frame = ring.latest(max_age=1.0)
+        if frame is None:
+            frame = ring.wait_for_frame(timeout=2.0)
+        if frame is not None:
+            return frame
+    return DEVICES.read(f"camera:{index}:frame", lambda: _grab(index), devices=[f"camera:{index}"])
+
+
+def _grab(index: int):
     cap = cv2.VideoCapture(index)
-    ok, frame = cap.read()
-    cap.release()
+    try:
+        ok, frame = cap.read()
+    finally:
+        cap.release()
     if not ok or frame is None:
         raise RuntimeError("Failed to capture image from camera")
-    cv2.imwrite(str(out), frame)
-    return str(out)
\ No newline at end of file
+    return frame
+
+
+def save_frame(frame, output_path: str | os.PathLike) -> str:
+    """Write a frame grabbed with capture_frame/CameraRing to disk."""
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if cv2 is None:
+        out.touch()
+    else:
+        cv2.imwrite(str(out), frame)
+    return str(out)
+
+
+class CameraRing:
+    """Keeps the camera open and holds the most recent frames in a ring.
+
+    A daemon thread grabs frames at ``fps`` so consumers (describe, reading,
+    scene-change gating) get a fresh frame without reopening the device.
+    """
+
+    def __init__(self, size: int | None = None, fps: float | None = None, camera_index: int | None = None) -> None:
+        self.size = size or CONFIG.camera_ring_size
+        self.fps = fps or CONFIG.camera_ring_fps
+        self.camera_index = CONFIG.camera_index if camera_index is None else camera_index
+        self.device = f"camera:{self.camera_index}"
+        self._frames: deque = deque(maxlen=self.size)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reopen = False
+        self.frames_grabbed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running and not self._stop.is_set():
+            return
+        if self._thread is not None:
+            # A grabber that is still stopping must let go of the device before a new one opens it
+            self._thread.join()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def reconfigure(self, changed: dict) -> None:
+        """Follow config changes: resize the ring, change the rate, or switch cameras."""
+        with self._cond:
+            if "camera_ring_size" in changed:
+                self.size = max(1, CONFIG.camera_ring_size)
+                self._frames = deque(self._frames, maxlen=self.size)
+            if "camera_ring_fps" in changed:
+                self.fps = CONFIG.camera_ring_fps
+            if "camera_index" in changed or "simulate" in changed:
+                self.camera_index = CONFIG.camera_index
+                self.device = f"camera:{self.camera_index}"
+                # Frames from the old camera must not be served as current
+                self._frames.clear()
+                self._reopen = True
+
+    def _open(self):
+        if CONFIG.simulate or cv2 is None:
+            return None
+        with DEVICES.hold(self.device):
+            cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            cap.release()
+            raise RuntimeError("Failed to open camera")
+        return cap
+
+    def _loop(self) -> None:
+        cap = None
+        try:
+            while not self._stop.is_set():
+                start = time.time()
+                period = 1.0 / max(0.1, self.fps)
+                if self._reopen:
+                    self._reopen = False
+                    if cap is not None:
+                        cap.release()
+                        cap = None
+                try:
+                    if cap is None and not (CONFIG.simulate or cv2 is None):
+                        cap = self._open()
+                    if cap is None:
+                        frame = capture_frame()
+                    else:
+                        with DEVICES.hold(self.device):
+                            ok, frame = cap.read()
+                        if not ok or frame is None:
+                            cap.release()
+                            cap = None
+                            raise RuntimeError("Camera read failed")
+                except Exception:
+                    self._stop.wait(1.0)
+                    continue
+                with self._cond:
+                    self._frames.append((time.time(), frame))
+                    self.frames_grabbed += 1
+                    self._cond.notify_all()
+                self._stop.wait(max(0.0, period - (time.time() - start)))
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def latest(self, max_age: float | None = None):
+        """Most recent frame, or None if the ring is empty or older than ``max_age`` seconds."""
+        with self._cond:
+            if not self._frames:
+                return None
+            ts, frame = self._frames[-1]
+        if max_age is not None and time.time() - ts > max_age:
+            return None
+        return frame
+
+    def snapshot(self) -> List[Tuple[float, object]]:
+        """All buffered ``(timestamp, frame)`` pairs, oldest first."""
+        with self._cond:
+            return list(self._frames)
+
+    def wait_for_frame(self, timeout: float = 1.0):
+        """Block until the next frame arrives and return it (None on timeout)."""
+        with self._cond:
+            seen = self.frames_grabbed
+            if not self._cond.wait_for(lambda: self.frames_grabbed > seen, timeout):
+                return None
+            return self._frames[-1][1]
+
+
+_RING: Optional[CameraRing] = None
+_RING_LOCK = threading.Lock()
+# Holders of the shared ring (engine, book reader); the camera is closed when the last one releases it
+_RING_USERS = 0
+
+
+def _on_config(changed: dict) -> None:
+    with _RING_LOCK:
+        ring = _RING
+    if ring is not None:
+        ring.reconfigure(changed)
+
+
+CONFIG_STORE.subscribe(_on_config, ("camera_index", "camera_ring_size", "camera_ring_fps", "simulate"))
+
+
+def get_camera_ring() -> CameraRing:
+    """Shared, started CameraRing for the process. Each call must be paired with ``release_camera_ring``."""
+    global _RING, _RING_USERS
+    with _RING_LOCK:
+        if _RING is None:
+            _RING = CameraRing()
+        _RING_USERS += 1
+        _RING.start()
+        return _RING
+
+
+def release_camera_ring() -> None:
+    """Drop one hold on the shared ring; the grabber stops when nobody holds it."""
+    global _RING_USERS
+    with _RING_LOCK:
+        if _RING_USERS == 0:
+            return
+        _RING_USERS -= 1
+        if _RING_USERS == 0 and _RING is not None:
+            _RING.stop()
+
+
+def latest_frame(max_age: float = 1.0):
+    """Fresh frame from the shared ring while it is held, falling back to a one-off capture."""
+    ring = _RING
+    frame = None
+    if ring is not None and ring.running:
+        frame = ring.latest(max_age)
+        if frame is None:
+            frame = ring.wait_for_frame(timeout=max_age)
+    if frame is None:
+        frame = capture_frame()
+    return frame
@@ -1,16 +1,142 @@
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 @dataclass
 class Config:
     simulate: bool = bool(int(os.getenv("SIMULATION", "0")))
     tesseract_cmd: str | None = os.getenv("TESSERACT_CMD")
+    ocr_backend: str = os.getenv("OCR_BACKEND", "auto")  # "auto", "tesserocr" (in-process) or "subprocess"
+    ocr_lang: str | None = os.getenv("OCR_LANG")  # Tesseract language, e.g. "eng" or "ben"; derived from language if unset
+    tessdata_path: str | None = os.getenv("TESSDATA_PREFIX")
+    ocr_workers: int = int(os.getenv("OCR_WORKERS", "0"))  # processes for parallel region OCR; 0 = CPU count
+    ocr_cache_mb: float = float(os.getenv("OCR_CACHE_MB", "16"))  # on-disk OCR result cache size; 0 disables
+    book_dir: str | None = os.getenv("BOOK_DIR")  # digitized book folder played by book mode instead of live OCR
+    ocr_layout: str = os.getenv("OCR_LAYOUT", "morph")  # text-region finder: "morph", "mser", "east" or "none"
+    vosk_model: str | None = os.getenv("VOSK_MODEL")  # Vosk model directory for voice commands and wake word
     gps_serial_port: str | None = os.getenv("GPS_SERIAL_PORT")  # e.g., "COM3" on Windows or "/dev/serial0" on Pi
     gps_baudrate: int = int(os.getenv("GPS_BAUDRATE", "9600"))
     camera_index: int = int(os.getenv("CAMERA_INDEX", "0"))
+    camera_ring_size: int = int(os.getenv("CAMERA_RING_SIZE", "8"))  # frames kept by the background grabber
+    camera_ring_fps: float = float(os.getenv("CAMERA_RING_FPS", "5"))
+    device_fresh_sec: float = float(os.getenv("DEVICE_FRESH_SEC", "0.25"))  # identical device reads this close share one result
+    # Sensor snapshot cache (lumen.sensors): background sampling periods, 0 = read only on demand
+    # (gestures default to on demand so the sampler does not consume the gestures the engine reacts to)
+    sensor_env_sec: float = float(os.getenv("SENSOR_ENV_SEC", "5"))
+    sensor_gps_sec: float = float(os.getenv("SENSOR_GPS_SEC", "2"))
+    sensor_gesture_sec: float = float(os.getenv("SENSOR_GESTURE_SEC", "0"))
+    # Shared microphone capture (lumen.audio_bus)
+    audio_device: str | None = os.getenv("AUDIO_DEVICE")  # sounddevice input name or index; default device if unset
+    audio_channels: int = int(os.getenv("AUDIO_CHANNELS", "1"))
+    audio_buffer_sec: float = float(os.getenv("AUDIO_BUFFER_SEC", "10"))  # ring length; slower readers overrun
+    mic_array: str | None = os.getenv("MIC_ARRAY")  # "respeaker-2mic", "respeaker-4mic" or "x,y;x,y;..." metres
+    voice_grammar: bool = bool(int(os.getenv("VOICE_GRAMMAR", "1")))  # restrict assist-mode ASR to the command grammar
+    # Event log (data/memory.jsonl)
+    memory_flush_sec: float = float(os.getenv("MEMORY_FLUSH_SEC", "2"))  # max delay before buffered events hit disk
+    memory_flush_kb: float = float(os.getenv("MEMORY_FLUSH_KB", "32"))
+    memory_fsync: bool = bool(int(os.getenv("MEMORY_FSYNC", "0")))
+    memory_segment_mb: float = float(os.getenv("MEMORY_SEGMENT_MB", "4"))  # rotate the log past this size
+    memory_segments: int = int(os.getenv("MEMORY_SEGMENTS", "10"))  # rotated segments kept
+    memory_compress: bool = bool(int(os.getenv("MEMORY_COMPRESS", "1")))  # gzip rotated segments
+    # Background jobs (lumen.jobs): worker threads per resource class
+    job_workers_camera: int = int(os.getenv("JOB_WORKERS_CAMERA", "1"))
+    job_workers_vision: int = int(os.getenv("JOB_WORKERS_VISION", "2"))
+    job_workers_ocr: int = int(os.getenv("JOB_WORKERS_OCR", "1"))  # each OCR job already uses OCR_WORKERS processes
+    job_timeout_sec: float = float(os.getenv("JOB_TIMEOUT_SEC", "120"))
+    job_history: int = int(os.getenv("JOB_HISTORY", "100"))  # finished jobs kept for status queries
+    event_queue_size: int = int(os.getenv("EVENT_QUEUE_SIZE", "256"))  # per live-stream client; oldest dropped when full
+    # Persona (data/persona.json)
+    persona_decay_per_sec: float = float(os.getenv("PERSONA_DECAY_PER_SEC", "0.0004"))  # trait drift toward 0.5
+    persona_checkpoint_sec: float = float(os.getenv("PERSONA_CHECKPOINT_SEC", "5"))  # max delay before changes hit disk
     # Language and TTS configuration
     language: str = os.getenv("LANGUAGE", "en")  # e.g., "en" or "bn"
     tts_engine: str = os.getenv("TTS_ENGINE", "pyttsx3")  # "pyttsx3" or "piper"
     piper_voice: str | None = os.getenv("PIPER_VOICE")  # Path to Piper voice model file
+    # Object detector (cv2.dnn) tuning
+    dnn_backend: str = os.getenv("DNN_BACKEND", "default")  # "default", "opencv", "inference_engine", "vkcom", "cuda"
+    dnn_target: str = os.getenv("DNN_TARGET", "cpu")  # "cpu", "opencl", "opencl_fp16", "vulkan", "cuda"
+    dnn_threads: int = int(os.getenv("DNN_THREADS", "0"))  # 0 keeps OpenCV's default
+    model_budget_mb: float = float(os.getenv("MODEL_BUDGET_MB", "0"))  # RSS budget; idle models are unloaded above it (0 = off)
+    ssd_warmup: bool = bool(int(os.getenv("SSD_WARMUP", "0")))  # load the detector in the background at startup
 
-CONFIG = Config()
\ No newline at end of file
+CONFIG = Config()
+
+
+def _coerce(default: Any, annotation: Any, value: Any) -> Any:
+    if value is None or value == "":
+        if "None" in str(annotation):
+            return None
+        raise ValueError("value required")
+    kind = annotation if isinstance(annotation, type) else type(default)
+    if kind is bool or annotation == "bool":
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+    if kind is int or annotation == "int":
+        return int(value)
+    if kind is float or annotation == "float":
+        return float(value)
+    return str(value)
+
+
+Listener = Callable[[Dict[str, Tuple[Any, Any]]], None]
+
+
+class ConfigStore:
+    """Runtime changes to ``CONFIG``, applied in place and announced to subscribers.
+
+    Modules keep reading ``CONFIG`` as before and see new values on their
+    next access. Code that holds long-lived resources built from the config
+    (TTS engine, camera, sensor samplers, Vosk recognizers) subscribes to the
+    fields it depends on and rebuilds only those parts when they change.
+    Callbacks get ``{field: (old, new)}`` and run in the updating thread.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self._types = {f.name: f.type for f in fields(Config)}
+        self._lock = threading.Lock()
+        self._listeners: List[Tuple[Optional[frozenset], Listener]] = []
+
+    def subscribe(self, callback: Listener, names: Iterable[str] | None = None) -> None:
+        """Call ``callback`` when any of the fields in ``names`` (default: any field) changes."""
+        with self._lock:
+            self._listeners.append((frozenset(names) if names is not None else None, callback))
+
+    def unsubscribe(self, callback: Listener) -> None:
+        with self._lock:
+            self._listeners = [(n, cb) for n, cb in self._listeners if cb != callback]
+
+    def update(self, **changes: Any) -> Dict[str, Tuple[Any, Any]]:
+        """Set fields (values are coerced to the field's type) and return what actually changed.
+
+        Raises KeyError for an unknown field and ValueError for a value of the wrong kind.
+        """
+        with self._lock:
+            new = {}
+            for name, value in changes.items():
+                if name not in self._types:
+                    raise KeyError(name)
+                new[name] = _coerce(getattr(self.config, name), self._types[name], value)
+            changed = {}
+            for name, value in new.items():
+                old = getattr(self.config, name)
+                if old != value:
+                    setattr(self.config, name, value)
+                    changed[name] = (old, value)
+            listeners = list(self._listeners)
+        if changed:
+            for wanted, callback in listeners:
+                if wanted is None or wanted & changed.keys():
+                    try:
+                        callback(changed)
+                    except Exception:
+                        pass
+        return changed
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: getattr(self.config, name) for name in self._types}
+
+
+CONFIG_STORE = ConfigStore(CONFIG)
\ No newline at end of file
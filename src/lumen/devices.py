@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .config import CONFIG
+
+# I2C bus 1 on the Pi header; the MLX90614 and the APDS9960 gesture sensor share it
+I2C_BUS = "i2c:1"
+
+
+class _Device:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_ms = 0.0
+        self.wait_ms_max = 0.0
+        self.hold_ms = 0.0
+        self.hold_ms_max = 0.0
+
+
+class _Read:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.ts = 0.0
+
+
+class DeviceArbiter:
+    """Serializes access to physical devices and shared buses.
+
+    Every device or bus has a name (``camera:0``, ``i2c:1``,
+    ``serial:/dev/serial0``, ``gpio:ultrasonic``) and one lock. ``hold``
+    takes the locks of everything a transaction touches, always in sorted
+    order so two callers can never deadlock, and records how long callers
+    queued for the device and how long they held it. ``read`` additionally
+    merges identical reads: while one is in flight the others wait for its
+    result, and a result younger than ``fresh_sec`` is handed out again
+    without touching the hardware.
+    """
+
+    def __init__(self, fresh_sec: float | None = None) -> None:
+        self.fresh_sec = CONFIG.device_fresh_sec if fresh_sec is None else fresh_sec
+        self._devices: Dict[str, _Device] = {}
+        self._reads: Dict[str, _Read] = {}
+        self._read_stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _device(self, name: str) -> _Device:
+        with self._lock:
+            dev = self._devices.get(name)
+            if dev is None:
+                dev = self._devices[name] = _Device(name)
+            return dev
+
+    @contextmanager
+    def hold(self, *names: str) -> Iterator[None]:
+        devices = [self._device(n) for n in sorted(set(n for n in names if n))]
+        acquired = []
+        try:
+            for dev in devices:
+                t0 = time.perf_counter()
+                if not dev.lock.acquire(blocking=False):
+                    dev.contended += 1
+                    dev.lock.acquire()
+                waited = (time.perf_counter() - t0) * 1000.0
+                dev.acquisitions += 1
+                dev.wait_ms += waited
+                dev.wait_ms_max = max(dev.wait_ms_max, waited)
+                acquired.append(dev)
+            t_hold = time.perf_counter()
+            yield
+        finally:
+            held = (time.perf_counter() - t_hold) * 1000.0 if len(acquired) == len(devices) else 0.0
+            for dev in reversed(acquired):
+                dev.hold_ms += held
+                dev.hold_ms_max = max(dev.hold_ms_max, held)
+                dev.lock.release()
+
+    def read(self, key: str, fn: Callable[[], Any], devices: Iterable[str] = (),
+             fresh_sec: float | None = None) -> Any:
+        """``fn()`` under the ``devices`` locks, shared with concurrent callers using the same ``key``.
+
+        Errors are passed to every waiter but never reused after the read.
+        Dict results are copied per caller; other results are shared.
+        """
+        fresh_sec = self.fresh_sec if fresh_sec is None else fresh_sec
+        with self._lock:
+            stats = self._read_stats.setdefault(key, {"reads": 0, "joined": 0, "reused": 0})
+            r = self._reads.get(key)
+            if r is not None and not r.done.is_set():
+                stats["joined"] += 1
+                leader = False
+            elif r is not None and r.error is None and time.monotonic() - r.ts <= fresh_sec:
+                stats["reused"] += 1
+                return _copy(r.result)
+            else:
+                stats["reads"] += 1
+                r = self._reads[key] = _Read()
+                leader = True
+        if leader:
+            try:
+                with self.hold(*devices):
+                    r.result = fn()
+            except BaseException as e:
+                r.error = e
+            r.ts = time.monotonic()
+            r.done.set()
+        else:
+            r.done.wait()
+        if r.error is not None:
+            raise r.error
+        return _copy(r.result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            devices = list(self._devices.values())
+            reads = {k: dict(v) for k, v in self._read_stats.items()}
+        return {
+            "fresh_sec": self.fresh_sec,
+            "devices": {
+                d.name: {
+                    "busy": d.lock.locked(),
+                    "acquisitions": d.acquisitions,
+                    "contended": d.contended,
+                    "wait_ms_avg": round(d.wait_ms / d.acquisitions, 2) if d.acquisitions else 0.0,
+                    "wait_ms_max": round(d.wait_ms_max, 2),
+                    "hold_ms_avg": round(d.hold_ms / d.acquisitions, 2) if d.acquisitions else 0.0,
+                    "hold_ms_max": round(d.hold_ms_max, 2),
+                }
+                for d in devices
+            },
+            "reads": reads,
+        }
+
+
+def _copy(result: Any) -> Any:
+    return dict(result) if isinstance(result, dict) else result
+
+
+DEVICES = DeviceArbiter()
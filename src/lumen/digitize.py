@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .book import load_bookmark, save_bookmark
+from .config import CONFIG
+from .models import process_context
+from .ocr import _WORKER_FIELDS, _init_worker as _init_ocr_worker, read_page
+from .tts import TTS
+
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".ppm"}
+MANIFEST = "manifest.json"
+
+
+def _natural_key(path: Path):
+    # page2.jpg sorts before page10.jpg
+    return [int(p) if p.isdigit() else p.lower() for p in re.split(r"(\d+)", path.name)]
+
+
+def list_pages(folder: str | os.PathLike) -> List[Path]:
+    return sorted((p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS), key=_natural_key)
+
+
+# Workers also run layout analysis and use the OCR cache, so they need these on top of the OCR settings
+_PAGE_FIELDS = _WORKER_FIELDS + ("ocr_layout", "ocr_cache_mb")
+
+
+def _init_worker(settings: dict) -> None:
+    _init_ocr_worker(settings)
+    # Pages are already spread over processes; OCR each page's regions serially
+    CONFIG.ocr_workers = 1
+
+
+def _ocr_page_file(path: str) -> Dict:
+    """Pool worker: OCR one page image."""
+    start = time.perf_counter()
+    try:
+        page = read_page(path)
+        return {"blocks": page["blocks"], "ms": (time.perf_counter() - start) * 1000.0}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+def _compress(wav: Path) -> Path:
+    """Encode to Opus with ffmpeg when available; otherwise keep the wav."""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return wav
+    out = wav.with_suffix(".ogg")
+    res = subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", str(wav), "-c:a", "libopus", "-b:a", "24k", str(out)],
+                         check=False)
+    if res.returncode == 0 and out.exists():
+        wav.unlink(missing_ok=True)
+        return out
+    return wav
+
+
+def _load_manifest(out_dir: Path) -> Dict:
+    try:
+        return json.loads((out_dir / MANIFEST).read_text())
+    except Exception:
+        return {"pages": {}}
+
+
+def _save_manifest(out_dir: Path, manifest: Dict) -> None:
+    tmp = out_dir / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    os.replace(tmp, out_dir / MANIFEST)
+
+
+def digitize(folder: str | os.PathLike, out_dir: str | os.PathLike | None = None, audio: bool = False,
+             workers: int | None = None, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """OCR every page image in ``folder`` into ordered text (and optionally audio).
+
+    Output goes to ``out_dir`` (default ``<folder>/digitized``): one text file per
+    page, ``book.txt`` with all pages, optional per-page audio, and a manifest.
+    The manifest is updated after every page, so an interrupted run resumes
+    where it stopped. Returns a summary including pages per minute.
+    """
+    src = Path(folder)
+    out = Path(out_dir) if out_dir else src / "digitized"
+    out.mkdir(parents=True, exist_ok=True)
+    pages = list_pages(src)
+    manifest = _load_manifest(out)
+    manifest["source"] = str(src)
+    done: Dict = manifest.setdefault("pages", {})
+
+    todo = [p for p in pages if p.name not in done or (audio and not done[p.name].get("audio"))]
+    tts = TTS() if audio else None
+    start = time.time()
+    processed = 0
+    errors: List[str] = []
+    number_of = {p.name: i + 1 for i, p in enumerate(pages)}
+
+    ocr_todo = [p for p in todo if p.name not in done]
+    settings = {name: getattr(CONFIG, name) for name in _PAGE_FIELDS}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                             initializer=_init_worker, initargs=(settings,)) as pool:
+        results = pool.map(_ocr_page_file, [str(p) for p in ocr_todo])
+        for path, res in zip(ocr_todo, results):
+            if "error" in res:
+                errors.append(f"{path.name}: {res['error']}")
+                continue
+            stem = f"{number_of[path.name]:04d}"
+            (out / f"{stem}.txt").write_text("\n\n".join(res["blocks"]), encoding="utf-8")
+            done[path.name] = {"page": number_of[path.name], "text": f"{stem}.txt", "ocr_ms": round(res["ms"], 1)}
+            processed += 1
+            if tts is not None:
+                _render_audio(tts, out, stem, res["blocks"], done[path.name])
+            _save_manifest(out, manifest)
+            if progress:
+                progress({"page": path.name, "done": len(done), "total": len(pages)})
+
+    # Pages OCR'd in an earlier run that still need audio
+    if tts is not None:
+        for path in todo:
+            entry = done.get(path.name)
+            if entry and not entry.get("audio"):
+                text = (out / entry["text"]).read_text(encoding="utf-8")
+                _render_audio(tts, out, entry["text"][:-4], [text], entry)
+                _save_manifest(out, manifest)
+
+    ordered = sorted(done.values(), key=lambda e: e["page"])
+    with (out / "book.txt").open("w", encoding="utf-8") as f:
+        for entry in ordered:
+            f.write((out / entry["text"]).read_text(encoding="utf-8"))
+            f.write("\n\n")
+
+    elapsed = time.time() - start
+    return {
+        "ok": not errors,
+        "output": str(out),
+        "pages": len(pages),
+        "processed": processed,
+        "skipped": len(pages) - len(todo),
+        "errors": errors,
+        "elapsed_sec": round(elapsed, 1),
+        "pages_per_minute": round(processed / elapsed * 60.0, 1) if elapsed > 0 and processed else 0.0,
+    }
+
+
+def _render_audio(tts: TTS, out: Path, stem: str, blocks: List[str], entry: Dict) -> None:
+    text = "\n\n".join(blocks).strip()
+    if not text:
+        return
+    wav = out / f"{stem}.wav"
+    if tts.synthesize_to_file(text, str(wav)):
+        entry["audio"] = _compress(wav).name
+
+
+@dataclass
+class PreparedPage:
+    number: int
+    blocks: List[str] = field(default_factory=list)
+    audio: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.blocks)
+
+
+class PreparedBook:
+    """Reads a digitized book folder page by page, with no OCR at read time.
+
+    Offers the same ``next_page``/``mark_read``/``last_page`` interface as
+    BookReader so book mode can play either.
+    """
+
+    def __init__(self, out_dir: str | os.PathLike) -> None:
+        self.dir = Path(out_dir)
+        self.book_id = f"prepared:{self.dir.resolve()}"
+        manifest = _load_manifest(self.dir)
+        self.entries = sorted(manifest.get("pages", {}).values(), key=lambda e: e["page"])
+        self.last_page = load_bookmark(self.book_id)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    @property
+    def finished(self) -> bool:
+        return not any(e["page"] > self.last_page for e in self.entries)
+
+    def next_page(self, timeout: float = 0.0) -> Optional[PreparedPage]:
+        for entry in self.entries:
+            if entry["page"] > self.last_page:
+                text = (self.dir / entry["text"]).read_text(encoding="utf-8")
+                audio = str(self.dir / entry["audio"]) if entry.get("audio") else None
+                return PreparedPage(entry["page"], [b for b in text.split("\n\n") if b.strip()], audio)
+        return None
+
+    def mark_read(self, page: PreparedPage) -> None:
+        self.last_page = page.number
+        save_bookmark(self.book_id, page.number)
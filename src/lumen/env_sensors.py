@@ -15,6 +15,9 @@ except Exception:  # pragma: no cover
     smbus2 = None
 
 from .config import CONFIG
+from .devices import DEVICES, I2C_BUS
+
+DHT_PIN = "gpio:4"  # DHT22 data line
 
 
 def read_environment() -> dict:
@@ -31,14 +34,20 @@ def read_environment() -> dict:
             "ir_temp_c": round(random.uniform(20.0, 30.0), 1),
         }
 
+    # Callers arriving while a read is in progress share its result
+    return DEVICES.read("environment", _read_hardware)
+
+
+def _read_hardware() -> dict:
     data: dict = {}
 
     # DHT22 via adafruit-circuitpython-dht
     try:
         if adafruit_dht is not None and board is not None:
-            dht_device = adafruit_dht.DHT22(board.D4)  # GPIO4 as example
-            data["temperature_c"] = float(dht_device.temperature)
-            data["humidity_pct"] = float(dht_device.humidity)
+            with DEVICES.hold(DHT_PIN):
+                dht_device = adafruit_dht.DHT22(board.D4)  # GPIO4 as example
+                data["temperature_c"] = float(dht_device.temperature)
+                data["humidity_pct"] = float(dht_device.humidity)
     except Exception:
         pass
 
@@ -50,14 +59,15 @@ def read_environment() -> dict:
     # GY906 (MLX90614) via I2C, address 0x5A
     try:
         if smbus2 is not None:
-            bus = smbus2.SMBus(1)
-            # MLX90614 object temperature register 0x07 returns 0.02K units
-            raw = bus.read_word_data(0x5A, 0x07)
-            # Swap bytes due to SMBus endianness
-            raw = ((raw & 0xFF) << 8) | (raw >> 8)
-            temp_k = raw * 0.02
-            data["ir_temp_c"] = temp_k - 273.15
-            bus.close()
+            with DEVICES.hold(I2C_BUS):
+                bus = smbus2.SMBus(1)
+                # MLX90614 object temperature register 0x07 returns 0.02K units
+                raw = bus.read_word_data(0x5A, 0x07)
+                # Swap bytes due to SMBus endianness
+                raw = ((raw & 0xFF) << 8) | (raw >> 8)
+                temp_k = raw * 0.02
+                data["ir_temp_c"] = temp_k - 273.15
+                bus.close()
     except Exception:
         pass
 
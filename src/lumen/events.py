@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import threading
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .config import CONFIG
+
+
+def _as_dict(data: Any) -> Dict:
+    return data if isinstance(data, dict) else {"value": data}
+
+
+class _Message:
+    __slots__ = ("seq", "topic", "ts", "data", "state")
+
+    def __init__(self, seq: int, topic: str, ts: float, data: Dict, state: bool) -> None:
+        self.seq = seq
+        self.topic = topic
+        self.ts = ts
+        self.data = data
+        self.state = state
+
+
+class EventSubscription:
+    """One client's view of the bus.
+
+    Messages wait in a bounded queue; when it is full the oldest message is
+    dropped (``dropped`` counts them), so a slow client never holds up the
+    publishers or the other clients. State topics are delta-encoded against
+    what this client last received, so an unchanged field is sent once and
+    a dropped message cannot break the chain. Threads wait with ``get``;
+    async handlers use ``aget``, which waits on the event loop so a
+    connected client does not tie up a worker thread.
+    """
+
+    def __init__(self, bus: "EventBus", topics: Iterable[str] | None, maxlen: int) -> None:
+        self._bus = bus
+        self.topics = [t for t in (topics or []) if t]
+        self._queue: Deque[_Message] = collections.deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        # Event loop and event of a pending ``aget``, woken from publisher threads
+        self._waiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+        self._sent: Dict[str, Dict] = {}
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+
+    def wants(self, topic: str) -> bool:
+        # "sensor" matches "sensor" and "sensor.location"
+        return not self.topics or any(topic == t or topic.startswith(t + ".") for t in self.topics)
+
+    def _put(self, msg: _Message) -> None:
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(msg)
+            self._cond.notify()
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._cond:
+            waiter, self._waiter = self._waiter, None
+        if waiter is not None:
+            loop, event = waiter
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # the loop already closed
+
+    def get(self, timeout: float | None = None) -> Optional[Dict]:
+        """Next message for this client, or None on timeout/close.
+
+        State messages are ``{"full": true, "data": {...}}`` the first time a
+        topic is seen and ``{"full": false, "changed": {...}, "removed": [...]}``
+        afterwards; updates that change nothing are skipped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._queue and not self.closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+                if self.closed:
+                    return None
+                msg = self._queue.popleft()
+            out = self._encode(msg)
+            if out is not None:
+                self.delivered += 1
+                return out
+
+    async def aget(self, timeout: float | None = None) -> Optional[Dict]:
+        """Like ``get``, but waits on the running event loop instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            event = asyncio.Event()
+            with self._cond:
+                if self.closed:
+                    return None
+                msg = self._queue.popleft() if self._queue else None
+                if msg is None:
+                    self._waiter = (loop, event)
+            if msg is not None:
+                out = self._encode(msg)
+                if out is not None:
+                    self.delivered += 1
+                    return out
+                continue
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    return None
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                with self._cond:
+                    if self._waiter is not None and self._waiter[1] is event:
+                        self._waiter = None
+
+    def _encode(self, msg: _Message) -> Optional[Dict]:
+        out: Dict[str, Any] = {"seq": msg.seq, "topic": msg.topic, "ts": msg.ts}
+        if not msg.state:
+            out["data"] = msg.data
+            return out
+        prev = self._sent.get(msg.topic)
+        self._sent[msg.topic] = msg.data
+        if prev is None:
+            out.update(full=True, data=msg.data)
+            return out
+        changed = {k: v for k, v in msg.data.items() if k not in prev or prev[k] != v}
+        removed = [k for k in prev if k not in msg.data]
+        if not changed and not removed:
+            return None
+        out.update(full=False, changed=changed)
+        if removed:
+            out["removed"] = removed
+        return out
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        self._wake()
+        self._bus.unsubscribe(self)
+
+    def stats(self) -> dict:
+        return {"topics": self.topics, "queued": len(self._queue), "delivered": self.delivered,
+                "dropped": self.dropped}
+
+
+class EventBus:
+    """Fan-out of engine events and sensor snapshots to live clients.
+
+    ``publish`` is cheap and safe from any thread: it appends the message to
+    each interested subscriber's queue and returns. Topics are dotted names
+    (``engine.state``, ``sensor.location``, ``event.obstacle``); ``state=True``
+    marks a topic whose messages replace the previous value and are delta
+    encoded, while plain events are delivered as-is. The latest value of
+    every state topic is kept so new clients start with a full picture.
+    """
+
+    def __init__(self, queue_size: int | None = None) -> None:
+        self.queue_size = CONFIG.event_queue_size if queue_size is None else queue_size
+        self._subs: List[EventSubscription] = []
+        self._latest: Dict[str, _Message] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    def publish(self, topic: str, data: Any = None, state: bool = False) -> None:
+        msg = _Message(next(self._seq), topic, time.time(), _as_dict(data if data is not None else {}), state)
+        with self._lock:
+            self.published += 1
+            if state:
+                self._latest[topic] = msg
+            subs = list(self._subs)
+        for sub in subs:
+            if sub.wants(topic):
+                sub._put(msg)
+
+    def subscribe(self, topics: Iterable[str] | None = None) -> EventSubscription:
+        sub = EventSubscription(self, topics, self.queue_size)
+        with self._lock:
+            self._subs.append(sub)
+            latest = [m for m in self._latest.values() if sub.wants(m.topic)]
+        for msg in sorted(latest, key=lambda m: m.seq):
+            sub._put(msg)
+        return sub
+
+    def unsubscribe(self, sub: EventSubscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subs = [s.stats() for s in self._subs]
+        return {"published": self.published, "queue_size": self.queue_size, "subscribers": subs}
+
+
+EVENTS = EventBus()
+
+
+def publish(topic: str, data: Any = None, state: bool = False) -> None:
+    try:
+        EVENTS.publish(topic, data, state)
+    except Exception:
+        pass
@@ -4,21 +4,24 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-from .config import CONFIG
-from .tts import speak
-from .ocr import read_text_from_image
-from .camera import capture_image
-from .voice import VoiceRecognizer
+from .config import CONFIG, CONFIG_STORE
+from .tts import speak, play_audio
+from .ocr import iter_page_text
+from .camera import get_camera_ring, latest_frame, release_camera_ring
+from .voice import StreamingVoiceRecognizer
+from .intents import IntentMatcher, engine_slots, grammar_langs, vosk_grammar
 from .gesture import read_gesture
-from .gps import get_location
-from .env_sensors import read_environment
+from .sensors import SENSORS
 from .stick import read_distance_cm
 from .actuators import buzz
 from .memory import log_event
-from .persona import update_on_event, get_persona, step_decay
-from .vision import recognize
-from .objects import detect_objects
-from .audio_localization import detect_sound_activity
+from .events import publish
+from .persona import update_on_event, get_persona
+from .tracking import SceneTracker
+from .scene import SceneChangeDetector, SceneResultCache
+from .book import BookReader
+from .digitize import PreparedBook
+from .audio_localization import detect_sound_activity, stop_sound_activity
 
 
 @dataclass
@@ -34,6 +37,7 @@ class Mode:
     READING = "reading"
     DESCRIBE = "describe"
     STATUS = "status"
+    BOOK = "book"
 
 
 class AssistEngine:
@@ -46,7 +50,16 @@ class AssistEngine:
     def __init__(self, vosk_model: str | None = None) -> None:
         self.mode = Mode.IDLE
         self.target = None  # type: Optional[Target]
-        self.vr = VoiceRecognizer(vosk_model)
+        # Always-on microphone stream; commands are picked up between loop iterations.
+        # While the engine runs, decoding is restricted to the command grammar.
+        self._intent_slots = engine_slots()
+        self.intents = IntentMatcher(slots=self._intent_slots)
+        self.vosk_model = vosk_model or CONFIG.vosk_model
+        self.vr = self._make_recognizer()
+        # Set from the config listener; the loop swaps the recognizer on its own thread
+        self._voice_changed = False
+        # Enrolled person the user asked about; answered on the next describe
+        self.looking_for: Optional[str] = None
         self.last_obstacle_alert_ts = 0.0
         self.last_status_ts = 0.0
         self.stop_requested = False
@@ -55,6 +68,19 @@ class AssistEngine:
         self.last_sound_ts = 0.0
         # Remember recently seen objects to detect novelty
         self._recent_objects: dict[str, float] = {}
+        # Tracks people/objects across frames so detection and recognition run only when needed
+        self.scene = SceneTracker()
+        # When set, describe mode keeps running and only announces newly tracked things
+        self.describe_continuous = False
+        # Set when describe was triggered by sound/curiosity rather than the user
+        self.describe_autonomous = False
+        # Scene-change gates: skip describe/read inference when the camera view is unchanged
+        self.scene_gate = SceneChangeDetector(keep_reference=True)
+        self.scene_cache = SceneResultCache()
+        self.read_gate = SceneChangeDetector(keep_reference=True)
+        self.read_cache = SceneResultCache()
+        # Continuous book reading (page-turn detection + background OCR)
+        self.book: Optional[BookReader | PreparedBook] = None
 
     # --- INTENT HANDLERS ---
     def handle_voice(self, text: str) -> None:
@@ -62,23 +88,43 @@ class AssistEngine:
         if not t or t.startswith("error"):
             return
         log_event("voice", {"text": t})
-        if "navigate" in t:
-            # naive parse: navigate to <place>
-            place = t.replace("navigate to", "").strip() or "destination"
+        # People can be enrolled while the engine runs; closed slots need the current names
+        slots = engine_slots()
+        if slots != self._intent_slots:
+            self._intent_slots = slots
+            self.intents = IntentMatcher(slots=slots)
+        match = self.intents.match(t)
+        intent = match.intent if match else None
+        if intent == "navigate":
+            place = match.slots.get("place") or "destination"
             # Without maps, set target unknown coordinates and announce.
             self.target = Target(name=place)
             self.mode = Mode.NAVIGATION
             speak(f"Navigation mode. Heading to {place}.")
-        elif t.startswith("read") or "read text" in t:
+        elif intent == "find_person":
+            self.looking_for = match.slots.get("person")
+            self.mode = Mode.DESCRIBE
+            self.describe_autonomous = False
+            speak(f"Looking for {self.looking_for}.")
+        elif intent == "read_book":
+            self.mode = Mode.BOOK
+            self._start_book()
+        elif intent == "read":
             self.mode = Mode.READING
             speak("Reading mode.")
-        elif "describe" in t or "what's around" in t:
+        elif intent == "describe_continuous":
+            self.mode = Mode.DESCRIBE
+            self.describe_continuous = True
+            self.describe_autonomous = False
+            speak("Continuous describe mode.")
+        elif intent == "describe":
             self.mode = Mode.DESCRIBE
+            self.describe_autonomous = False
             speak("Describe mode.")
-        elif "status" in t or "how am i" in t:
+        elif intent == "status":
             self.mode = Mode.STATUS
             speak("Status mode.")
-        elif "stop" in t or "idle" in t:
+        elif intent == "stop":
             self.mode = Mode.IDLE
             speak("Idle mode.")
             update_on_event("interrupt", {})
@@ -101,6 +147,7 @@ class AssistEngine:
             speak("Reading mode.")
         elif g == "right":
             self.mode = Mode.DESCRIBE
+            self.describe_autonomous = False
             speak("Describe mode.")
         elif g == "near":
             self.mode = Mode.STATUS
@@ -111,9 +158,10 @@ class AssistEngine:
 
     # --- SENSOR POLLING ---
     def poll(self) -> dict:
-        env = read_environment()
+        # Environment and GPS come from the sampled snapshots; a slow GPS read never stalls the loop
+        env = SENSORS.value("environment") or {}
         dist_cm = read_distance_cm()
-        loc = get_location()
+        loc = SENSORS.value("location") or {}
         return {"env": env, "dist_cm": dist_cm, "loc": loc}
 
     # --- DECISION LOGIC ---
@@ -122,6 +170,13 @@ class AssistEngine:
         self._check_obstacle(data.get("dist_cm"))
         self._check_environment(data.get("env", {}))
 
+        if self.mode != Mode.DESCRIBE:
+            self.describe_continuous = False
+            self.describe_autonomous = False
+            self.looking_for = None
+        if self.mode != Mode.BOOK and self.book is not None:
+            self.book.stop()
+            self.book = None
         # Mode-specific actions
         if self.mode == Mode.NAVIGATION:
             self._navigation_step(data.get("loc", {}))
@@ -131,6 +186,8 @@ class AssistEngine:
             self._describe_step()
         elif self.mode == Mode.STATUS:
             self._status_step(data)
+        elif self.mode == Mode.BOOK:
+            self._book_step()
         # Track time spent idle
         if self.mode == Mode.IDLE:
             # Keep idle_since at first entry to idle
@@ -201,21 +258,100 @@ class AssistEngine:
             self.last_status_ts = now
 
     def _reading_step(self) -> None:
-        # Capture then OCR
-        img_path = "./data/read.jpg"
-        capture_image(img_path)
-        text = read_text_from_image(img_path)
-        speak(text or "No text detected.")
-        log_event("read", {"text": text})
+        frame = latest_frame()
+        change = self.read_gate.check(frame)
+        text = None if change.changed else self.read_cache.get(change.scene_hash)
+        if text is None:
+            # Speak each block as soon as it is recognized; later ones are still being OCR'd
+            blocks = []
+            for block in iter_page_text(frame):
+                speak(block)
+                blocks.append(block)
+            text = "\n\n".join(blocks)
+            self.read_cache.put(change.scene_hash, text)
+            if not blocks:
+                speak("No text detected.")
+        else:
+            speak(text or "No text detected.")
+        log_event("read", {"text": text, "cached": not change.changed})
         # Return to idle after one read
         self.mode = Mode.IDLE
 
+    def _start_book(self, book_id: str = "default") -> None:
+        if self.book is None:
+            # A digitized book plays straight from prepared text/audio with no OCR delay
+            self.book = PreparedBook(CONFIG.book_dir) if CONFIG.book_dir else BookReader(book_id)
+        self.book.start()
+        if isinstance(self.book, PreparedBook):
+            # Pages come from the digitized folder, so there is nothing to turn
+            if self.book.last_page:
+                speak(f"Book mode. Resuming after page {self.book.last_page}.")
+            else:
+                speak("Book mode. Reading the digitized book.")
+        elif self.book.last_page:
+            speak(f"Book mode. Resuming after page {self.book.last_page}. Turn the page when ready.")
+        else:
+            speak("Book mode. Hold the book in front of me and turn pages as you go.")
+
+    def _book_step(self) -> None:
+        if self.book is None:
+            self._start_book()
+        page = self.book.next_page()
+        if page is None:
+            if isinstance(self.book, PreparedBook) and self.book.finished:
+                speak("End of the book.")
+                self.mode = Mode.IDLE
+            return
+        if getattr(page, "audio", None):
+            play_audio(page.audio)
+        else:
+            if not page.blocks:
+                speak("I couldn't read this page.")
+            for block in page.blocks:
+                if self.stop_requested:
+                    return
+                speak(block)
+        self.book.mark_read(page)
+        log_event("read", {"page": page.number, "text": page.text})
+
     def _describe_step(self) -> None:
-        # Placeholder: capture and announce image captured. Scene description would require a model.
-        img_path = "./data/scene.jpg"
-        capture_image(img_path)
-        names = recognize(img_path)
-        objs = detect_objects(img_path)
+        frame = latest_frame()
+        change = self.scene_gate.check(frame)
+        if not change.changed and not self.looking_for:
+            cached = self.scene_cache.get(change.scene_hash)
+            if self.describe_continuous:
+                return
+            if self.describe_autonomous or cached is not None:
+                # Nothing moved since the last look: skip inference entirely
+                if not self.describe_autonomous:
+                    speak(cached)
+                log_event("describe", {"recognized": [], "cached": True})
+                self.mode = Mode.IDLE
+                return
+        # A real scene change needs fresh detections; otherwise the tracker decides
+        state = self.scene.process(frame, force_detect=change.changed, roi=change.region)
+        # In continuous mode only newly tracked people/objects are announced
+        only_new = self.describe_continuous
+        names = state.names(only_new)
+        objs = state.objects(only_new)
+        if only_new and not names and not objs:
+            return
+        msg = self._describe_message(names, objs)
+        if self.looking_for:
+            wanted = self.looking_for
+            self.looking_for = None
+            found = [n for n in state.names() if n.lower() == wanted.lower()]
+            speak((f"{found[0]} is here. " if found else f"I don't see {wanted}. ") + msg)
+        else:
+            speak(msg)
+        if not only_new:
+            self.scene_cache.put(change.scene_hash, msg)
+        log_event("describe", {"recognized": names})
+        # Return to idle
+        if not self.describe_continuous:
+            self.mode = Mode.IDLE
+
+    def _describe_message(self, names: list, objs: list) -> str:
         now = time.time()
         # Clean up very old object sightings (older than 5 minutes)
         stale_before = now - 300
@@ -239,22 +375,7 @@ class AssistEngine:
                 if labels:
                     msg += ", and nearby: " + ", ".join(labels)
                 msg += "."
-                speak(msg)
-            else:
-                if objs:
-                    objs_sorted = sorted(objs, key=lambda x: -x[1])[:3]
-                    labels = [o[0] for o in objs_sorted if o[0] != "person"]
-                    if labels:
-                        for lbl in labels:
-                            if lbl not in self._recent_objects:
-                                update_on_event("novel_object", {"label": lbl})
-                            self._recent_objects[lbl] = now
-                        speak("I don't recognize anyone, but I notice " + ", ".join(labels) + ".")
-                    else:
-                        speak("I don't recognize anyone here.")
-                else:
-                    speak("I don't recognize anyone here.")
-        else:
+                return msg
             if objs:
                 objs_sorted = sorted(objs, key=lambda x: -x[1])[:3]
                 labels = [o[0] for o in objs_sorted if o[0] != "person"]
@@ -263,14 +384,18 @@ class AssistEngine:
                         if lbl not in self._recent_objects:
                             update_on_event("novel_object", {"label": lbl})
                         self._recent_objects[lbl] = now
-                    speak("I notice " + ", ".join(labels) + ".")
-                else:
-                    speak("Captured an image of the surroundings.")
-            else:
-                speak("Captured an image of the surroundings.")
-        log_event("describe", {"recognized": names})
-        # Return to idle
-        self.mode = Mode.IDLE
+                    return "I don't recognize anyone, but I notice " + ", ".join(labels) + "."
+            return "I don't recognize anyone here."
+        if objs:
+            objs_sorted = sorted(objs, key=lambda x: -x[1])[:3]
+            labels = [o[0] for o in objs_sorted if o[0] != "person"]
+            if labels:
+                for lbl in labels:
+                    if lbl not in self._recent_objects:
+                        update_on_event("novel_object", {"label": lbl})
+                    self._recent_objects[lbl] = now
+                return "I notice " + ", ".join(labels) + "."
+        return "Captured an image of the surroundings."
 
     def _status_step(self, data: dict) -> None:
         env = data.get("env", {})
@@ -284,50 +409,102 @@ class AssistEngine:
     def request_stop(self) -> None:
         self.stop_requested = True
 
+    def _make_recognizer(self) -> StreamingVoiceRecognizer:
+        grammar = vosk_grammar(slots=engine_slots(), langs=grammar_langs()) if CONFIG.voice_grammar else None
+        return StreamingVoiceRecognizer(self.vosk_model, grammar=grammar)
+
+    def _on_config(self, changed: dict) -> None:
+        if "vosk_model" in changed:
+            self.vosk_model = CONFIG.vosk_model
+        self._voice_changed = True
+
+    def _rebuild_voice(self) -> None:
+        """Switch to a new Vosk model/grammar after a config change without restarting the engine."""
+        self._voice_changed = False
+        self.vr.stop()
+        self.vr.close()
+        self.vr = self._make_recognizer()
+        self.vr.start()
+
+    def publish_state(self, running: bool = True, data: dict | None = None) -> None:
+        """Push the engine state to live clients (unchanged fields are not resent)."""
+        publish("engine.state", {
+            "running": running,
+            "mode": self.mode,
+            "target": self.target.name if self.target else None,
+            "looking_for": self.looking_for,
+            "describe_continuous": self.describe_continuous,
+            "dist_cm": (data or {}).get("dist_cm"),
+        }, state=True)
+
     def run_loop(self, iterations: int | None = 30, interval_sec: float = 1.0) -> None:
         speak("Assistive engine started.")
-        count = 0
-        while True:
-            if self.stop_requested:
-                break
-            # Voice intent (simulation will return a canned phrase occasionally)
-            heard = self.vr.listen_once(timeout_sec=0.5)
-            self.handle_voice(heard)
-            # Gesture intent
-            g = read_gesture()
-            self.handle_gesture(g)
-            # Sensors
-            data = self.poll()
-            # Passive audio awareness: if sound activity spikes and idle, investigate
-            s = detect_sound_activity(duration_sec=0.15, samplerate=16000)
-            act = bool(s.get("active"))
-            energy = float(s.get("rms", 0.0))
-            now = time.time()
-            if act:
-                self.last_sound_ts = now
+        SENSORS.start()
+        self.vr.start()
+        # Keeps the camera open for describe/reading while the engine runs
+        get_camera_ring()
+        CONFIG_STORE.subscribe(self._on_config, ("vosk_model", "language", "voice_grammar"))
+        try:
+            count = 0
+            while True:
+                if self.stop_requested:
+                    break
+                if self._voice_changed:
+                    self._rebuild_voice()
+                # Voice intent: drain utterances recognized since the last iteration
+                # (simulation will return a canned phrase)
+                heard = self.vr.poll()
+                while heard:
+                    self.handle_voice(heard)
+                    heard = self.vr.poll() if self.vr.running else ""
+                # Gesture intent
+                g = read_gesture()
+                self.handle_gesture(g)
+                # Sensors
+                data = self.poll()
+                # Passive audio awareness: if sound activity spikes and idle, investigate
+                s = detect_sound_activity(duration_sec=0.15, samplerate=16000)
+                act = bool(s.get("active"))
+                energy = float(s.get("rms", 0.0))
+                now = time.time()
+                if act:
+                    self.last_sound_ts = now
+                    if self.mode == Mode.IDLE:
+                        log_event("sound_activity", {"rms": energy, "azimuth_deg": s.get("azimuth_deg")})
+                        if s.get("direction"):
+                            speak(f"Sound {s['direction']}. Let me take a look.")
+                        else:
+                            speak("I hear something. Let me take a look.")
+                        self.mode = Mode.DESCRIBE
+                        self.describe_autonomous = True
+                # Autonomous curiosity-driven exploration when idle and quiet
                 if self.mode == Mode.IDLE:
-                    log_event("sound_activity", {"rms": energy})
-                    speak("I hear something. Let me take a look.")
-                    self.mode = Mode.DESCRIBE
-            # Autonomous curiosity-driven exploration when idle and quiet
-            if self.mode == Mode.IDLE:
-                # If it's been quiet for a bit and we've been idle long enough, explore
-                quiet_for = now - self.last_sound_ts
-                idle_for = now - self.idle_since
-                persona = get_persona()
-                curiosity = float(persona.get("curiosity", 0.5))
-                # Probability increases with curiosity and idle time
-                should_explore = (quiet_for > 5.0 and idle_for > 10.0 and (curiosity > 0.4))
-                if should_explore and (count % max(2, int(8 - 6 * curiosity)) == 0):
-                    speak("Exploring my surroundings.")
-                    self.mode = Mode.DESCRIBE
-            # Decide and act
-            self.decide_and_act(data)
-            # Personality drift
-            if count % 5 == 0:
-                step_decay(0.002)
-            time.sleep(interval_sec)
-            count += 1
-            if iterations is not None and count >= iterations:
-                break
+                    # If it's been quiet for a bit and we've been idle long enough, explore
+                    quiet_for = now - self.last_sound_ts
+                    idle_for = now - self.idle_since
+                    persona = get_persona()
+                    curiosity = float(persona.get("curiosity", 0.5))
+                    # Probability increases with curiosity and idle time
+                    should_explore = (quiet_for > 5.0 and idle_for > 10.0 and (curiosity > 0.4))
+                    if should_explore and (count % max(2, int(8 - 6 * curiosity)) == 0):
+                        speak("Exploring my surroundings.")
+                        self.mode = Mode.DESCRIBE
+                        self.describe_autonomous = True
+                # Decide and act
+                self.decide_and_act(data)
+                self.publish_state(data=data)
+                time.sleep(interval_sec)
+                count += 1
+                if iterations is not None and count >= iterations:
+                    break
+        finally:
+            CONFIG_STORE.unsubscribe(self._on_config)
+            stop_sound_activity()
+            if self.book is not None:
+                self.book.stop()
+                self.book = None
+            release_camera_ring()
+            self.vr.stop()
+            self.vr.close()
+            self.publish_state(running=False)
         speak("Assistive engine stopped.")
\ No newline at end of file
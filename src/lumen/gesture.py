@@ -8,6 +8,7 @@ except Exception:  # pragma: no cover
     smbus2 = None
 
 from .config import CONFIG
+from .devices import DEVICES, I2C_BUS
 
 # APDS9960 I2C address and registers would be defined here.
 # For now, we provide a simulation stub.
@@ -19,5 +20,10 @@ def read_gesture() -> str:
     """Read a gesture from APDS9960. Simulation returns random gesture."""
     if CONFIG.simulate or smbus2 is None:
         return random.choice(GESTURES)
+    # A gesture is consumed by reading it, so only in-flight reads are shared
+    return DEVICES.read("gesture", _read_apds9960, devices=[I2C_BUS], fresh_sec=0.0)
+
+
+def _read_apds9960() -> str:
     # TODO: Implement APDS9960 init and read sequence using I2C
     raise NotImplementedError("APDS9960 integration pending")
\ No newline at end of file
@@ -8,6 +8,7 @@ except Exception:  # pragma: no cover
     serial = None
 
 from .config import CONFIG
+from .devices import DEVICES
 
 
 _nmea_re = re.compile(r"GP(GGA|RMC),")
@@ -20,9 +21,14 @@ def get_location(timeout_sec: float = 3.0) -> dict:
     """
     if CONFIG.simulate or serial is None or not CONFIG.gps_serial_port:
         return {"lat": 37.4219999, "lon": -122.0840575, "sat": 8, "fix": True}
+    port = CONFIG.gps_serial_port
+    # One reader per serial port; simultaneous callers get the same fix
+    return DEVICES.read(f"gps:{port}", lambda: _read_serial(port, timeout_sec), devices=[f"serial:{port}"])
 
+
+def _read_serial(port: str, timeout_sec: float) -> dict:
     try:
-        ser = serial.Serial(CONFIG.gps_serial_port, CONFIG.gps_baudrate, timeout=timeout_sec)
+        ser = serial.Serial(port, CONFIG.gps_baudrate, timeout=timeout_sec)
     except Exception:
         return {"error": "Serial port unavailable"}
 
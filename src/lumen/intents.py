@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import CONFIG
+
+
+@dataclass(frozen=True)
+class Intent:
+    """One command: phrase patterns with ``{slot}`` placeholders, in priority order.
+
+    A pattern starting with ``^`` only matches at the start of the utterance.
+    Slots named in ``closed`` accept only values from the slot vocabulary (an
+    English "the" before the value is allowed), so generic phrasings such as
+    "go to ..." do not swallow unrelated sentences.
+    """
+    name: str
+    patterns: Tuple[str, ...]
+    lang: str = "en"
+    closed: Tuple[str, ...] = ()
+
+
+# Earlier entries win when several match ("read the book" before "read")
+INTENTS: List[Intent] = [
+    Intent("navigate", ("navigate to {place}", "navigate")),
+    Intent("navigate", ("take me to {place}", "go to {place}"), closed=("place",)),
+    Intent("find_person", ("where is {person}", "find {person}", "is {person} here"), closed=("person",)),
+    Intent("read_book", ("read book", "read the book", "continue reading")),
+    Intent("read", ("read text", "read this", "^read")),
+    Intent("describe_continuous", ("keep describing", "describe continuously")),
+    Intent("describe", ("describe", "what's around", "what is around")),
+    Intent("status", ("status", "how am i")),
+    Intent("stop", ("stop", "idle")),
+    Intent("navigate", ("{place} এ নিয়ে চলো", "{place} যাও"), "bn", closed=("place",)),
+    Intent("find_person", ("{person} কোথায়",), "bn", closed=("person",)),
+    Intent("read_book", ("বই পড়ো", "পড়া চালিয়ে যাও"), "bn"),
+    Intent("read", ("পড়ো", "পড়ে শোনাও"), "bn"),
+    Intent("describe_continuous", ("বর্ণনা করতে থাকো",), "bn"),
+    Intent("describe", ("বর্ণনা করো", "চারপাশে কী আছে"), "bn"),
+    Intent("status", ("অবস্থা", "আমি কেমন আছি"), "bn"),
+    Intent("stop", ("থামো", "বন্ধ করো"), "bn"),
+]
+
+# Slot vocabularies for the restricted recognizer and for the matcher's closed slots
+DEFAULT_SLOTS: Dict[str, List[str]] = {
+    "place": ["library", "home", "classroom", "canteen", "bus stop", "office", "toilet", "exit",
+              "লাইব্রেরি", "বাড়ি", "ক্লাসরুম"],
+    "person": [],
+}
+
+_SLOT = re.compile(r"\{(\w+)\}")
+_BENGALI = re.compile("[\u0980-\u09ff]")
+_PUNCT = re.compile(r"[.,!?;:।]+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(_PUNCT.sub(" ", text.lower()).split())
+
+
+@dataclass
+class IntentMatch:
+    intent: str
+    slots: Dict[str, str] = field(default_factory=dict)
+    pattern: str = ""
+
+
+class IntentMatcher:
+    """Compiled form of an intent table.
+
+    Slot-free phrases are looked up directly when they are the whole
+    utterance. Otherwise each pattern is indexed by its first literal word,
+    so only the patterns whose keyword occurs in the utterance are tried (in
+    priority order), each with its own small regex. Phrases must sit on
+    whitespace boundaries (this also holds for Bengali, where ``\\b`` is
+    unreliable around vowel signs). ``slots`` supplies the vocabularies of
+    closed slots; rebuild the matcher when they change.
+    """
+
+    def __init__(self, intents: Sequence[Intent] = INTENTS, langs: Iterable[str] | None = None,
+                 slots: Dict[str, List[str]] | None = None) -> None:
+        langs = set(langs) if langs is not None else None
+        slots = slots if slots is not None else DEFAULT_SLOTS
+        self.intents = [i for i in intents if langs is None or i.lang in langs]
+        self._exact: Dict[str, IntentMatch] = {}
+        self._patterns: List[Tuple[str, "re.Pattern[str]", List[Tuple[str, str]]]] = []
+        self._index: Dict[str, List[int]] = {}
+        for intent in self.intents:
+            for pattern in intent.patterns:
+                anchored = pattern.startswith("^")
+                pattern = pattern.lstrip("^")
+                if not _SLOT.search(pattern) and not anchored:
+                    self._exact.setdefault(pattern, IntentMatch(intent.name, {}, pattern))
+                regex = self._compile(pattern, anchored, intent.closed, slots)
+                if regex is None:
+                    continue
+                n = len(self._patterns)
+                self._patterns.append((intent.name, regex, [(f"s_{k}", k) for k in _SLOT.findall(pattern)]))
+                keyword = _SLOT.sub(" ", pattern).split()[0]
+                self._index.setdefault(keyword, []).append(n)
+
+    @staticmethod
+    def _compile(pattern: str, anchored: bool, closed: Tuple[str, ...],
+                 slots: Dict[str, List[str]]) -> Optional["re.Pattern[str]"]:
+        regex = "^" if anchored else r"(?<!\S)"
+        pos = 0
+        for m in _SLOT.finditer(pattern):
+            regex += re.escape(pattern[pos:m.start()])
+            name = m.group(1)
+            if name in closed:
+                values = sorted({normalize(v) for v in slots.get(name, []) if v.strip()}, key=len, reverse=True)
+                if not values:
+                    return None
+                regex += rf"(?:the )?(?P<s_{name}>{'|'.join(map(re.escape, values))})"
+            else:
+                regex += rf"(?P<s_{name}>\S.*?)"
+            pos = m.end()
+        regex += re.escape(pattern[pos:])
+        # A trailing open slot runs to the end of the utterance
+        open_tail = pattern.endswith("}") and pattern[pattern.rindex("{") + 1:-1] not in closed
+        regex += r"\s*$" if open_tail else r"(?!\S)"
+        return re.compile(regex)
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        t = normalize(text)
+        if not t:
+            return None
+        hit = self._exact.get(t)
+        if hit is not None:
+            return IntentMatch(hit.intent, {}, hit.pattern)
+        candidates = set()
+        for word in t.split():
+            found = self._index.get(word)
+            if found:
+                candidates.update(found)
+        for n in sorted(candidates):
+            name, regex, slots = self._patterns[n]
+            m = regex.search(t)
+            if m is not None:
+                return IntentMatch(name, {slot: m.group(g).strip() for g, slot in slots}, m.group(0).strip())
+        return None
+
+
+def vosk_grammar(intents: Sequence[Intent] = INTENTS, slots: Dict[str, List[str]] | None = None,
+                 langs: Iterable[str] | None = None) -> List[str]:
+    """Every phrase the intent table can produce, for ``KaldiRecognizer(model, rate, json.dumps(grammar))``.
+
+    Slots are expanded with the values written in the pattern's script;
+    patterns whose slot has no such values are left out. Vosk's garbage token
+    ``[unk]`` is appended.
+    """
+    slots = slots if slots is not None else DEFAULT_SLOTS
+    langs = set(langs) if langs is not None else None
+    phrases: List[str] = []
+    seen = set()
+    for intent in intents:
+        if langs is not None and intent.lang not in langs:
+            continue
+        for pattern in intent.patterns:
+            expanded = [pattern.lstrip("^")]
+            for name in _SLOT.findall(pattern):
+                values = [v for v in slots.get(name, []) if bool(_BENGALI.search(v)) == (intent.lang == "bn")]
+                expanded = [p.replace("{" + name + "}", v.lower(), 1) for p in expanded for v in values]
+            for p in expanded:
+                if p not in seen:
+                    seen.add(p)
+                    phrases.append(p)
+    phrases.append("[unk]")
+    return phrases
+
+
+def engine_slots() -> Dict[str, List[str]]:
+    """Default slot vocabularies plus the names of enrolled people."""
+    from .vision import list_people
+
+    slots = {k: list(v) for k, v in DEFAULT_SLOTS.items()}
+    try:
+        slots["person"] = slots.get("person", []) + list_people()
+    except Exception:
+        pass
+    return slots
+
+
+def grammar_langs() -> List[str]:
+    # A Vosk model covers one language; only offer it phrases it can decode
+    return ["bn"] if CONFIG.language == "bn" else ["en"]
+
+
+# Labelled utterances for the benchmark; "" marks no intent
+BENCH_PEOPLE = ["rahim", "karim"]
+CORPUS: List[Tuple[str, str]] = [
+    ("navigate to library", "navigate"),
+    ("please navigate to the bus stop", "navigate"),
+    ("take me to home", "navigate"),
+    ("take me to the library", "navigate"),
+    ("Simulation: navigate to library", "navigate"),
+    ("navigate", "navigate"),
+    ("where is rahim", "find_person"),
+    ("is karim here", "find_person"),
+    ("read the book", "read_book"),
+    ("can you continue reading", "read_book"),
+    ("read this", "read"),
+    ("read", "read"),
+    ("keep describing", "describe_continuous"),
+    ("describe", "describe"),
+    ("what's around me", "describe"),
+    ("status", "status"),
+    ("how am i doing", "status"),
+    ("stop", "stop"),
+    ("go idle", "stop"),
+    ("লাইব্রেরি এ নিয়ে চলো", "navigate"),
+    ("বই পড়ো", "read_book"),
+    ("পড়ে শোনাও", "read"),
+    ("চারপাশে কী আছে", "describe"),
+    ("থামো", "stop"),
+    ("hello there", ""),
+    ("the weather is nice today", ""),
+    ("i already read that", ""),
+    ("where is the library", ""),
+    ("go to sleep", ""),
+    ("", ""),
+]
+
+
+def _substring_chain(text: str) -> str:
+    """The original ``in``-chain from AssistEngine.handle_voice, kept as the benchmark baseline."""
+    t = text.lower().strip()
+    if "navigate" in t:
+        return "navigate"
+    if "read book" in t or "read the book" in t or "continue reading" in t:
+        return "read_book"
+    if t.startswith("read") or "read text" in t:
+        return "read"
+    if "keep describing" in t or "describe continuously" in t:
+        return "describe_continuous"
+    if "describe" in t or "what's around" in t:
+        return "describe"
+    if "status" in t or "how am i" in t:
+        return "status"
+    if "stop" in t or "idle" in t:
+        return "stop"
+    return ""
+
+
+def benchmark(runs: int = 200, corpus: Sequence[Tuple[str, str]] = CORPUS) -> dict:
+    """Accuracy and throughput of the compiled matcher against the old substring chain."""
+    t0 = time.perf_counter()
+    matcher = IntentMatcher(slots={**DEFAULT_SLOTS, "person": BENCH_PEOPLE})
+    compile_ms = (time.perf_counter() - t0) * 1000.0
+    results = {}
+    for name, fn in (("compiled", lambda u: (matcher.match(u) or IntentMatch("")).intent),
+                     ("substring", _substring_chain)):
+        correct = sum(fn(u) == want for u, want in corpus)
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            for u, _want in corpus:
+                fn(u)
+        elapsed = time.perf_counter() - t0
+        n = runs * len(corpus)
+        results[name] = {
+            "accuracy": round(correct / len(corpus), 3),
+            "us_per_utterance": round(elapsed / n * 1e6, 2),
+            "utterances_per_sec": round(n / elapsed) if elapsed > 0 else 0,
+        }
+    return {
+        "utterances": len(corpus),
+        "runs": runs,
+        "compile_ms": round(compile_ms, 2),
+        "grammar_phrases": len(vosk_grammar(slots=engine_slots(), langs=grammar_langs())),
+        **results,
+    }
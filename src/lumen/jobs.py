@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import collections
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .config import CONFIG
+from .events import publish
+
+FINISHED = ("done", "failed", "cancelled", "timeout")
+
+
+class JobCancelled(Exception):
+    """Raised by ``Job.checkpoint`` once a job has been cancelled or timed out."""
+
+
+class Job:
+    """One queued or running unit of work.
+
+    ``future`` resolves with the result (or the error) when the job
+    finishes, whatever the outcome; cancelled and timed-out jobs resolve with
+    ``JobCancelled``. Work functions can call ``checkpoint()`` between stages
+    to stop early once the job is no longer wanted.
+    """
+
+    def __init__(self, job_id: str, kind: str, resource: str, timeout_sec: float) -> None:
+        self.id = job_id
+        self.kind = kind
+        self.resource = resource
+        self.timeout_sec = timeout_sec
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.future: Future = Future()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stop.is_set()
+
+    def checkpoint(self) -> None:
+        if self._stop.is_set():
+            raise JobCancelled(self.status)
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None) -> bool:
+        """Record the outcome once; later outcomes (e.g. a result after a timeout) are ignored."""
+        with self._lock:
+            if self.status in FINISHED:
+                return False
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished = time.time()
+            if status != "done":
+                self._stop.set()
+        if self.future.done():
+            return True
+        if status == "done":
+            self.future.set_result(result)
+        elif status == "failed":
+            self.future.set_exception(RuntimeError(error))
+        else:
+            self.future.set_exception(JobCancelled(status))
+        return True
+
+    def summary(self, with_result: bool = True) -> dict:
+        out = {
+            "id": self.id,
+            "kind": self.kind,
+            "resource": self.resource,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+        if with_result and self.status == "done":
+            out["result"] = self.result
+        return out
+
+
+class JobManager:
+    """Runs slow requests on bounded worker pools, one pool per resource class.
+
+    Each resource ("camera", "vision", "ocr") has its own small thread pool, so
+    a burst of OCR requests queues behind the OCR workers instead of tying up
+    the camera or the web server's threads. ``submit`` returns a ``Job`` at
+    once. Queued jobs are dropped on cancel. Running jobs are marked
+    cancelled (or timed out after ``timeout_sec``) and stop at their next
+    ``checkpoint``; any result they still produce is discarded. Deadlines
+    are enforced by one reaper thread for all jobs. Every status change is
+    published on the ``job`` topic of the event bus.
+    """
+
+    def __init__(self, workers: Dict[str, int] | None = None, history: int | None = None) -> None:
+        self.workers = workers or {
+            "camera": CONFIG.job_workers_camera,
+            "vision": CONFIG.job_workers_vision,
+            "ocr": CONFIG.job_workers_ocr,
+        }
+        self.history = CONFIG.job_history if history is None else history
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._order: Deque[str] = collections.deque()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # (deadline, seq, job) of jobs with a timeout, earliest first
+        self._deadlines: List[Tuple[float, int, Job]] = []
+        self._reaper_wake = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    def _pool(self, resource: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(resource)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=max(1, self.workers.get(resource, 1)),
+                                          thread_name_prefix=f"job-{resource}")
+                self._pools[resource] = pool
+            return pool
+
+    def submit(self, kind: str, resource: str, fn: Callable[[Job], Any], timeout_sec: float | None = None) -> Job:
+        """Queue ``fn(job)`` on the ``resource`` pool and return the job.
+
+        ``timeout_sec`` <= 0 means no timeout. Raises ValueError if it is not a number.
+        """
+        timeout_sec = CONFIG.job_timeout_sec if timeout_sec is None else timeout_sec
+        if isinstance(timeout_sec, bool):
+            raise ValueError("timeout must be a number of seconds")
+        try:
+            timeout_sec = float(timeout_sec)
+        except (TypeError, ValueError):
+            raise ValueError("timeout must be a number of seconds") from None
+        seq = next(self._ids)
+        job = Job(f"{int(time.time())}-{seq}", kind, resource, timeout_sec)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._order.append(job.id)
+            self._trim()
+        if timeout_sec > 0:
+            self._add_deadline(time.monotonic() + timeout_sec, seq, job)
+        self._publish(job)
+        self._pool(resource).submit(self._run, job, fn)
+        return job
+
+    def run(self, resource: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the ``resource`` pool and wait for it (for stages inside another job)."""
+        return self._pool(resource).submit(fn, *args).result()
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        with job._lock:
+            if job.status in FINISHED:
+                return
+            job.status = "running"
+            job.started = time.time()
+        self._publish(job)
+        try:
+            result = fn(job)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if job._finish("failed", error=str(e) or type(e).__name__):
+                self._publish(job)
+            return
+        if job._finish("done", result=result):
+            self._publish(job)
+
+    def _add_deadline(self, deadline: float, seq: int, job: Job) -> None:
+        with self._reaper_wake:
+            heapq.heappush(self._deadlines, (deadline, seq, job))
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap, name="job-reaper", daemon=True)
+                self._reaper.start()
+            self._reaper_wake.notify()
+
+    def _reap(self) -> None:
+        while True:
+            with self._reaper_wake:
+                while not self._deadlines or self._deadlines[0][0] > time.monotonic():
+                    wait = self._deadlines[0][0] - time.monotonic() if self._deadlines else None
+                    self._reaper_wake.wait(wait)
+                _deadline, _seq, job = heapq.heappop(self._deadlines)
+            if job.status not in FINISHED:
+                self._expire(job)
+
+    def _expire(self, job: Job) -> None:
+        if job._finish("timeout", error=f"Timed out after {job.timeout_sec:g} s"):
+            self._publish(job)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is not None and job._finish("cancelled"):
+            self._publish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            ids = list(self._order)[-limit:]
+            return [self._jobs[i].summary(with_result=False) for i in reversed(ids)]
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs past the history limit; unfinished ones are kept
+        excess = len(self._order) - self.history
+        if excess <= 0:
+            return
+        keep: Deque[str] = collections.deque()
+        for job_id in self._order:
+            if excess > 0 and self._jobs[job_id].status in FINISHED:
+                del self._jobs[job_id]
+                excess -= 1
+            else:
+                keep.append(job_id)
+        self._order = keep
+
+    def _publish(self, job: Job) -> None:
+        publish("job", job.summary())
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts: Dict[str, Dict[str, int]] = {}
+            for job in self._jobs.values():
+                per = counts.setdefault(job.resource, {})
+                per[job.status] = per.get(job.status, 0) + 1
+        return {"workers": self.workers, "counts": counts}
+
+
+JOBS = JobManager()
@@ -1,29 +1,398 @@
 from __future__ import annotations
 
+import atexit
+import gzip
 import json
+import os
+import queue
+import shutil
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
+
+from .config import CONFIG
+from .events import publish
 
 MEMORY_LOG = Path("./data/memory.jsonl")
+STORE_PATH = Path("./data/memory.sqlite")
+
+
+class EventStore:
+    """Indexed copy of the event log in SQLite for filtered, paged queries.
+
+    Events are indexed by ``ts`` and by ``(kind, ts)``. Pages are ordered
+    newest first (or oldest first) and continue from an opaque cursor
+    (``"<ts>:<id>"``), so the cost of a page does not depend on how many
+    events were stored before it. The store keeps the same history as the
+    rotated log: ``prune`` drops whatever the log no longer holds.
+    """
+
+    def __init__(self, path: Path = STORE_PATH) -> None:
+        self.path = Path(path)
+        self.importing = False
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new = not self.path.exists()
+            db = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, ts REAL NOT NULL,"
+                       " kind TEXT NOT NULL, payload TEXT NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS events_ts ON events (ts)")
+            db.execute("CREATE INDEX IF NOT EXISTS events_kind_ts ON events (kind, ts)")
+            self._db = db
+            if new:
+                self._start_import()
+        return self._db
+
+    def _start_import(self) -> None:
+        """One-time import of an existing memory.jsonl (and its segments) into a new store.
+
+        The files are opened and the live log's size noted right away, so
+        batches appended later (which are already inserted by the writer) are
+        not imported twice. The import itself runs on its own thread and
+        connection, so flushes and queries are not held up by it.
+        """
+        sources = []
+        for f in sorted(MEMORY_LOG.parent.glob(f"{MEMORY_LOG.stem}-*.jsonl*")) + [MEMORY_LOG]:
+            try:
+                fh = gzip.open(f, "rb") if f.suffix == ".gz" else f.open("rb")
+            except Exception:
+                continue
+            # Rotated segments never change; the live log is read only up to its current size
+            limit = f.stat().st_size if f == MEMORY_LOG else None
+            sources.append((fh, limit))
+        if sources:
+            self.importing = True
+            threading.Thread(target=self._import, args=(sources,), daemon=True).start()
+
+    def _import(self, sources: list, chunk: int = 1000) -> None:
+        try:
+            db = sqlite3.connect(str(self.path), timeout=30.0)
+            for fh, limit in sources:
+                with fh:
+                    rows, read = [], 0
+                    for line in fh:
+                        read += len(line)
+                        if limit is not None and read > limit:
+                            break
+                        try:
+                            e = json.loads(line)
+                            rows.append((float(e["ts"]), str(e["kind"]), json.dumps(e.get("payload") or {})))
+                        except Exception:
+                            continue
+                        # Small transactions with a pause between them so the writer's inserts can interleave
+                        if len(rows) >= chunk:
+                            db.executemany("INSERT INTO events (ts, kind, payload) VALUES (?, ?, ?)", rows)
+                            db.commit()
+                            rows = []
+                            time.sleep(0.002)
+                    db.executemany("INSERT INTO events (ts, kind, payload) VALUES (?, ?, ?)", rows)
+                    db.commit()
+            db.close()
+        except Exception:
+            pass
+        finally:
+            self.importing = False
+
+    def insert_many(self, entries: Iterable[Dict], sync: bool = False) -> None:
+        rows = [(e["ts"], e["kind"], json.dumps(e.get("payload") or {}, ensure_ascii=False)) for e in entries]
+        with self._lock:
+            db = self._conn()
+            if sync:
+                db.execute("PRAGMA synchronous=FULL")
+            db.executemany("INSERT INTO events (ts, kind, payload) VALUES (?, ?, ?)", rows)
+            db.commit()
+            if sync:
+                db.execute("PRAGMA synchronous=NORMAL")
+
+    def prune(self, before_ts: float) -> int:
+        """Delete events older than ``before_ts``; returns how many were removed."""
+        with self._lock:
+            db = self._conn()
+            n = db.execute("DELETE FROM events WHERE ts < ?", (float(before_ts),)).rowcount
+            db.commit()
+        return n
+
+    def query(self, kind: str | None = None, since: float | None = None, until: float | None = None,
+              limit: int = 50, cursor: str | None = None, order: str = "desc") -> Dict:
+        """Events matching the filters, one page at a time.
+
+        Returns ``{"events": [...], "next_cursor": str | None}``; pass
+        ``next_cursor`` back to get the following page. ``order`` is "desc"
+        (newest first) or "asc".
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        desc = order == "desc"
+        where, args = [], []
+        if kind:
+            where.append("kind = ?")
+            args.append(kind)
+        if since is not None:
+            where.append("ts >= ?")
+            args.append(float(since))
+        if until is not None:
+            where.append("ts < ?")
+            args.append(float(until))
+        if cursor:
+            c_ts, c_id = cursor.split(":")
+            op = "<" if desc else ">"
+            where.append(f"(ts {op} ? OR (ts = ? AND id {op} ?))")
+            args += [float(c_ts), float(c_ts), int(c_id)]
+        direction = "DESC" if desc else "ASC"
+        sql = "SELECT id, ts, kind, payload FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY ts {direction}, id {direction} LIMIT ?"
+        limit = max(1, min(int(limit), 1000))
+        with self._lock:
+            rows = self._conn().execute(sql, args + [limit]).fetchall()
+        events = [{"ts": ts, "kind": k, "payload": json.loads(p)} for _, ts, k, p in rows]
+        next_cursor = f"{rows[-1][1]!r}:{rows[-1][0]}" if len(rows) == limit else None
+        return {"events": events, "next_cursor": next_cursor}
+
+    def hourly_counts(self, kind: str | None = None, since: float | None = None,
+                      until: float | None = None) -> List[Dict]:
+        """Number of events per kind per hour (hour = start of the hour, epoch seconds)."""
+        where, args = [], []
+        if kind:
+            where.append("kind = ?")
+            args.append(kind)
+        if since is not None:
+            where.append("ts >= ?")
+            args.append(float(since))
+        if until is not None:
+            where.append("ts < ?")
+            args.append(float(until))
+        sql = "SELECT kind, CAST(ts / 3600 AS INTEGER) * 3600 AS hour, COUNT(*) FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY kind, hour ORDER BY hour, kind"
+        with self._lock:
+            rows = self._conn().execute(sql, args).fetchall()
+        return [{"kind": k, "hour": h, "count": n} for k, h, n in rows]
+
+
+class EventLogWriter:
+    """Background writer for the event log.
+
+    ``write`` only enqueues, so it is cheap and safe from any thread. A
+    daemon thread batches queued events and appends them once
+    ``flush_bytes`` are buffered or ``flush_sec`` has passed (fsync after each
+    flush when ``fsync`` is set). When the log passes ``segment_bytes`` it is
+    rotated to ``memory-<timestamp>.jsonl[.gz]``; only the newest
+    ``max_segments`` rotated segments are kept. Each batch is also inserted
+    into ``store`` (one transaction) for indexed queries, and after each
+    rotation the store is pruned to the events the kept segments still hold.
+    """
+
+    def __init__(self, path: Path = MEMORY_LOG, store: EventStore | None = None, flush_sec: float | None = None,
+                 flush_bytes: int | None = None, fsync: bool | None = None, segment_bytes: int | None = None,
+                 max_segments: int | None = None, compress: bool | None = None, max_queue: int = 10000) -> None:
+        self.path = Path(path)
+        self.store = store
+        self.flush_sec = CONFIG.memory_flush_sec if flush_sec is None else flush_sec
+        self.flush_bytes = int(CONFIG.memory_flush_kb * 1024) if flush_bytes is None else flush_bytes
+        self.fsync = CONFIG.memory_fsync if fsync is None else fsync
+        self.segment_bytes = int(CONFIG.memory_segment_mb * 1024 * 1024) if segment_bytes is None else segment_bytes
+        self.max_segments = CONFIG.memory_segments if max_segments is None else max_segments
+        self.compress = CONFIG.memory_compress if compress is None else compress
+        self.dropped = 0
+        self.flushes = 0
+        self.rotations = 0
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._flush_req = threading.Event()
+        self._flushed = threading.Condition()
+        self._written_seq = 0
+        self._queued_seq = 0
+        self._seq_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def write(self, entry: Dict) -> None:
+        self._ensure_thread()
+        with self._seq_lock:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                # Never block the caller; losing an event beats stalling the engine
+                self.dropped += 1
+                return
+            self._queued_seq += 1
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return
+        with self._seq_lock:
+            target = self._queued_seq
+        self._flush_req.set()
+        with self._flushed:
+            self._flushed.wait_for(lambda: self._written_seq >= target, timeout=timeout)
+
+    def _run(self) -> None:
+        buf: List[str] = []
+        entries: List[Dict] = []
+        size = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_sec - (time.monotonic() - last_flush))
+            try:
+                entry = self._queue.get(timeout=timeout if not self._flush_req.is_set() else 0.0)
+                line = json.dumps(entry, ensure_ascii=False) + "\n"
+                buf.append(line)
+                entries.append(entry)
+                size += len(line)
+            except queue.Empty:
+                pass
+            due = size >= self.flush_bytes or time.monotonic() - last_flush >= self.flush_sec
+            if self._flush_req.is_set() and self._queue.empty():
+                due = True
+                self._flush_req.clear()
+            if not due:
+                continue
+            if buf:
+                n = len(buf)
+                # Index first: a brand-new store imports the existing log, which must not hold this batch yet
+                if self.store is not None:
+                    try:
+                        self.store.insert_many(entries, sync=self.fsync)
+                    except Exception:
+                        pass
+                try:
+                    self._append("".join(buf))
+                except Exception:
+                    pass
+                buf, entries, size = [], [], 0
+                with self._flushed:
+                    self._written_seq += n
+                    self._flushed.notify_all()
+            else:
+                with self._flushed:
+                    self._flushed.notify_all()
+            last_flush = time.monotonic()
+
+    def _append(self, data: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.flushes += 1
+        if self.segment_bytes > 0 and self.path.stat().st_size >= self.segment_bytes:
+            self._rotate()
+
+    def segments(self) -> List[Path]:
+        """Rotated segments, oldest first."""
+        return sorted(self.path.parent.glob(f"{self.path.stem}-*.jsonl*"))
+
+    def _rotate(self) -> None:
+        seg = self.path.with_name(f"{self.path.stem}-{time.strftime('%Y%m%d-%H%M%S')}-{self.rotations:04d}.jsonl")
+        os.replace(self.path, seg)
+        self.rotations += 1
+        if self.compress:
+            with seg.open("rb") as src, gzip.open(str(seg) + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            seg.unlink()
+        if self.max_segments <= 0:
+            return
+        segments = self.segments()
+        for old in segments[:-self.max_segments]:
+            try:
+                old.unlink()
+            except Exception:
+                pass
+        oldest = _first_ts(segments[-self.max_segments:][0]) if segments else None
+        if self.store is not None and oldest is not None:
+            try:
+                self.store.prune(oldest)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+            "segments": len(self.segments()),
+        }
+
+
+def _first_ts(path: Path) -> Optional[float]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            return float(json.loads(f.readline())["ts"])
+    except Exception:
+        return None
+
+
+_STORE = EventStore()
+_WRITER = EventLogWriter(store=_STORE)
+atexit.register(_WRITER.flush)
 
 
 def log_event(kind: str, payload: Dict | None = None) -> None:
-    MEMORY_LOG.parent.mkdir(parents=True, exist_ok=True)
     entry = {"ts": time.time(), "kind": kind, "payload": payload or {}}
     try:
-        with MEMORY_LOG.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        _WRITER.write(entry)
     except Exception:
         pass
+    publish(f"event.{kind}", entry["payload"])
 
 
 def list_events(limit: int = 50) -> List[Dict]:
-    if not MEMORY_LOG.exists():
-        return []
+    """The latest ``limit`` events, oldest first."""
+    return list(reversed(query_events(limit=limit)["events"]))
+
+
+def query_events(kind: str | None = None, since: float | None = None, until: float | None = None,
+                 limit: int = 50, cursor: str | None = None, order: str = "desc", fresh: bool = False) -> Dict:
+    """A page of events, newest first by default; see ``EventStore.query``.
+
+    Events still buffered by the writer (at most ``memory_flush_sec`` old)
+    are not included unless ``fresh`` forces a flush first; polling callers
+    should leave it off so they do not defeat the write batching.
+    Raises ValueError for a malformed cursor or an unknown order.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    if cursor:
+        ts, _, id_ = cursor.partition(":")
+        try:
+            float(ts), int(id_)
+        except ValueError:
+            raise ValueError("Invalid cursor") from None
+    if fresh:
+        _WRITER.flush()
     try:
-        lines = MEMORY_LOG.read_text().splitlines()
-        out = [json.loads(l) for l in lines[-limit:]]
-        return out
+        return _STORE.query(kind, since, until, limit, cursor, order)
     except Exception:
-        return []
\ No newline at end of file
+        return {"events": [], "next_cursor": None}
+
+
+def event_counts(kind: str | None = None, since: float | None = None, until: float | None = None,
+                 fresh: bool = False) -> List[Dict]:
+    if fresh:
+        _WRITER.flush()
+    try:
+        return _STORE.hourly_counts(kind, since, until)
+    except Exception:
+        return []
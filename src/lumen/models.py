@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .config import CONFIG
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    try:
+        import psutil
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        return None
+
+
+def process_context():
+    """Start method for worker process pools.
+
+    Forking this multithreaded process could copy a lock (the model registry,
+    the Tesseract handle, the camera) in its held state into the child, which
+    would then deadlock; workers start from a clean interpreter instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+@dataclass
+class _Entry:
+    name: str
+    loader: Callable[[], Any]
+    unloader: Optional[Callable[[Any], None]] = None
+    obj: Any = None
+    loaded: bool = False
+    refs: int = 0
+    size_bytes: int = 0
+    last_used: float = 0.0
+    loads: int = 0
+    evictions: int = 0
+    load_ms: float = 0.0
+    # Serializes loads of this model only; other models stay usable meanwhile
+    load_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ModelRegistry:
+    """Process-wide cache of heavy models, shared by reference count.
+
+    ``acquire`` loads a model on first use and hands every caller the same
+    instance; ``release`` marks it idle again. When the process RSS exceeds
+    ``budget_mb``, idle models are unloaded least-recently-used first.
+    Loading happens outside the registry lock, so a slow load never blocks
+    callers of models that are already loaded. A model's size is the RSS
+    growth measured while it loaded; allocations made by other threads in
+    the meantime are counted too, so treat it as an estimate.
+    """
+
+    def __init__(self, budget_mb: float | None = None) -> None:
+        self.budget_mb = CONFIG.model_budget_mb if budget_mb is None else budget_mb
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 unloader: Optional[Callable[[Any], None]] = None) -> None:
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(name, loader, unloader)
+
+    def acquire(self, name: str, loader: Optional[Callable[[], Any]] = None,
+                unloader: Optional[Callable[[Any], None]] = None) -> Any:
+        """Return the shared instance of ``name``, loading it if needed, and take a reference.
+
+        ``loader``/``unloader`` register the model on first acquire. A loader
+        that returns None (e.g. missing model files) is cached like any other
+        result, so the load is not retried on every call.
+        """
+        with self._lock:
+            if loader is not None:
+                self.register(name, loader, unloader)
+            entry = self._entries[name]
+            # Holding a reference keeps the entry from being evicted while it loads
+            entry.refs += 1
+            entry.last_used = time.time()
+        try:
+            if not entry.loaded:
+                with entry.load_lock:
+                    if not entry.loaded:
+                        self._load(entry)
+        except BaseException:
+            self.release(name)
+            raise
+        with self._lock:
+            obj = entry.obj
+            self._enforce_budget()
+            return obj
+
+    def _load(self, entry: _Entry) -> None:
+        # Called with the entry's load lock held, not the registry lock
+        before = rss_bytes()
+        t0 = time.perf_counter()
+        obj = entry.loader()
+        load_ms = (time.perf_counter() - t0) * 1000.0
+        after = rss_bytes()
+        with self._lock:
+            entry.obj = obj
+            entry.load_ms = load_ms
+            entry.size_bytes = max(0, after - before) if before is not None and after is not None else 0
+            entry.loaded = True
+            entry.loads += 1
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            entry.last_used = time.time()
+            self._enforce_budget()
+
+    @contextmanager
+    def use(self, name: str, loader: Optional[Callable[[], Any]] = None,
+            unloader: Optional[Callable[[Any], None]] = None) -> Iterator[Any]:
+        obj = self.acquire(name, loader, unloader)
+        try:
+            yield obj
+        finally:
+            self.release(name)
+
+    def unload(self, name: str) -> bool:
+        """Unload ``name`` now if nobody holds it. Returns True if it was unloaded."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or not entry.loaded or entry.refs > 0:
+                return False
+            self._evict(entry)
+            gc.collect()
+            return True
+
+    def _evict(self, entry: _Entry) -> None:
+        obj, entry.obj = entry.obj, None
+        entry.loaded = False
+        entry.evictions += 1
+        if entry.unloader is not None and obj is not None:
+            try:
+                entry.unloader(obj)
+            except Exception:
+                pass
+
+    def _enforce_budget(self) -> None:
+        if self.budget_mb <= 0:
+            return
+        rss = rss_bytes()
+        if rss is None:
+            return
+        budget = self.budget_mb * 1024 * 1024
+        idle = sorted((e for e in self._entries.values() if e.loaded and e.refs == 0), key=lambda e: e.last_used)
+        evicted = False
+        for entry in idle:
+            if rss <= budget:
+                break
+            self._evict(entry)
+            # The allocator may not hand memory back right away, so count the model's measured size as freed
+            rss -= entry.size_bytes
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = [
+                {
+                    "name": e.name,
+                    "loaded": e.loaded,
+                    "refs": e.refs,
+                    "size_mb": round(e.size_bytes / (1024 * 1024), 1),
+                    "last_used": e.last_used or None,
+                    "load_ms": round(e.load_ms, 1),
+                    "loads": e.loads,
+                    "evictions": e.evictions,
+                }
+                for e in self._entries.values()
+            ]
+        rss = rss_bytes()
+        return {
+            "budget_mb": self.budget_mb,
+            "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+            "models": models,
+        }
+
+
+MODELS = ModelRegistry()
@@ -1,4 +1,5 @@
 import os
+import threading
 from pathlib import Path
 from typing import List, Tuple
 
@@ -6,6 +7,8 @@ import cv2
 import numpy as np
 
 from .camera import capture_image
+from .config import CONFIG
+from .models import MODELS
 
 
 # Default model paths (optional). If missing, we fall back gracefully.
@@ -21,18 +24,102 @@ SSD_CLASSES = [
     "sheep", "sofa", "train", "tvmonitor"
 ]
 
+NMS_THRESHOLD = 0.45
+
+_BACKENDS = {
+    "default": "DNN_BACKEND_DEFAULT",
+    "opencv": "DNN_BACKEND_OPENCV",
+    "inference_engine": "DNN_BACKEND_INFERENCE_ENGINE",
+    "vkcom": "DNN_BACKEND_VKCOM",
+    "cuda": "DNN_BACKEND_CUDA",
+}
+_TARGETS = {
+    "cpu": "DNN_TARGET_CPU",
+    "opencl": "DNN_TARGET_OPENCL",
+    "opencl_fp16": "DNN_TARGET_OPENCL_FP16",
+    "vulkan": "DNN_TARGET_VULKAN",
+    "cuda": "DNN_TARGET_CUDA",
+}
+
+# The network is loaded through the model registry on first use (or by warm_up)
+# rather than at import time, and may be unloaded when idle under memory pressure.
+MODEL_NAME = "ssd_mobilenet"
+# A cv2.dnn.Net is not safe to run from several threads at once
+_INFER_LOCK = threading.Lock()
+
 
 def _load_net():
     if PROTOTXT.exists() and CAFFEMODEL.exists():
         try:
             net = cv2.dnn.readNetFromCaffe(str(PROTOTXT), str(CAFFEMODEL))
-            return net
         except Exception:
             return None
+        _configure_net(net)
+        return net
     return None
 
 
-_NET = _load_net()
+def _configure_net(net) -> None:
+    backend = _BACKENDS.get((CONFIG.dnn_backend or "default").lower())
+    target = _TARGETS.get((CONFIG.dnn_target or "cpu").lower())
+    try:
+        if backend and hasattr(cv2.dnn, backend):
+            net.setPreferableBackend(getattr(cv2.dnn, backend))
+        if target and hasattr(cv2.dnn, target):
+            net.setPreferableTarget(getattr(cv2.dnn, target))
+    except Exception:
+        pass
+    if CONFIG.dnn_threads > 0:
+        cv2.setNumThreads(CONFIG.dnn_threads)
+
+
+MODELS.register(MODEL_NAME, _load_net)
+
+
+def _preload() -> None:
+    MODELS.acquire(MODEL_NAME)
+    MODELS.release(MODEL_NAME)
+
+
+def warm_up(background: bool = True) -> None:
+    """Load the detector ahead of the first describe request.
+
+    With ``background`` the model is read on a daemon thread so startup is not delayed.
+    """
+    if background:
+        threading.Thread(target=_preload, daemon=True).start()
+    else:
+        _preload()
+
+
+def _postprocess(detections: np.ndarray, w: int, h: int, conf_threshold: float,
+                 nms_threshold: float = NMS_THRESHOLD) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+    """Decode raw SSD output (1, 1, N, 7) with numpy masking and batched per-class NMS."""
+    dets = detections.reshape(-1, 7)
+    conf = dets[:, 2]
+    cls = dets[:, 1].astype(np.int32)
+    keep = (conf >= conf_threshold) & (cls > 0) & (cls < len(SSD_CLASSES))
+    if not keep.any():
+        return []
+    conf = conf[keep]
+    cls = cls[keep]
+    boxes = (dets[keep, 3:7] * np.array([w, h, w, h], dtype=np.float32)).astype(np.int32)
+
+    # NMS works on (x, y, w, h) rectangles
+    rects = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+    if hasattr(cv2.dnn, "NMSBoxesBatched"):
+        idx = cv2.dnn.NMSBoxesBatched(rects.tolist(), conf.tolist(), cls.tolist(), conf_threshold, nms_threshold)
+    else:
+        # Shift each class into its own coordinate range so a single NMS call stays per-class
+        offset = (cls * (max(w, h) + 1))[:, None]
+        shifted = rects.copy()
+        shifted[:, :2] += offset
+        idx = cv2.dnn.NMSBoxes(shifted.tolist(), conf.tolist(), conf_threshold, nms_threshold)
+    idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+    return [
+        (SSD_CLASSES[cls[i]], float(conf[i]), tuple(int(v) for v in boxes[i]))
+        for i in idx
+    ]
 
 
 def detect_objects(image_path: str | None = None, conf_threshold: float = 0.5) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
@@ -45,25 +132,17 @@ def detect_objects(image_path: str | None = None, conf_threshold: float = 0.5) -
     img = cv2.imread(path)
     if img is None:
         return []
+    return detect_objects_in_frame(img, conf_threshold)
 
-    if _NET is None:
-        return []
 
-    (h, w) = img.shape[:2]
-    blob = cv2.dnn.blobFromImage(cv2.resize(img, (300, 300)), 0.007843, (300, 300), 127.5)
-    _NET.setInput(blob)
-    detections = _NET.forward()
-
-    results = []
-    for i in range(detections.shape[2]):
-        confidence = float(detections[0, 0, i, 2])
-        if confidence < conf_threshold:
-            continue
-        idx = int(detections[0, 0, i, 1])
-        if idx < 0 or idx >= len(SSD_CLASSES):
-            continue
-        box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-        (x1, y1, x2, y2) = box.astype("int")
-        label = SSD_CLASSES[idx]
-        results.append((label, confidence, (int(x1), int(y1), int(x2), int(y2))))
-    return results
\ No newline at end of file
+def detect_objects_in_frame(img: np.ndarray, conf_threshold: float = 0.5) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+    """Same as detect_objects, for a BGR frame already in memory."""
+    with MODELS.use(MODEL_NAME) as net:
+        if net is None:
+            return []
+        (h, w) = img.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(img, (300, 300)), 0.007843, (300, 300), 127.5)
+        with _INFER_LOCK:
+            net.setInput(blob)
+            detections = net.forward()
+    return _postprocess(detections, w, h, conf_threshold)
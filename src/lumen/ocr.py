@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
 
 try:
     import cv2
@@ -13,31 +19,310 @@ try:
 except Exception:  # pragma: no cover
     pytesseract = None
 
-from .config import CONFIG
+try:
+    import tesserocr
+except Exception:  # pragma: no cover
+    tesserocr = None
 
+from .config import CONFIG, CONFIG_STORE
+from .models import MODELS, process_context
+from .ocr_cache import get_cache, page_hash, settings_key
 
-def read_text_from_image(image_path: str | os.PathLike) -> str:
-    """Perform OCR on an image and return extracted text.
 
-    In simulation mode or when deps are missing, return a canned string.
-    """
-    if CONFIG.simulate or cv2 is None or pytesseract is None:
-        return "Simulation: This is sample text from a book page."
+SIMULATED_TEXT = "Simulation: This is sample text from a book page."
+
+# Tesseract page segmentation modes used here
+PSM_AUTO = 3
+PSM_SINGLE_BLOCK = 6
+
+# Lumen language codes -> Tesseract traineddata names
+_TESS_LANGS = {"en": "eng", "bn": "ben"}
+
+# In-process Tesseract handles live in the model registry, one per language and
+# tessdata path. The API object is not thread-safe, so every call goes through _API_LOCK.
+_API_LOCK = threading.Lock()
+
+
+def ocr_language() -> str:
+    if CONFIG.ocr_lang:
+        return CONFIG.ocr_lang
+    lang = (CONFIG.language or "en").lower().split("-")[0]
+    return _TESS_LANGS.get(lang, "eng")
+
+
+def _use_tesserocr() -> bool:
+    backend = (CONFIG.ocr_backend or "auto").lower()
+    return tesserocr is not None and backend in ("auto", "tesserocr")
+
+
+def _api_model(lang: str):
+    """Registry name and loader for the tesserocr handle for ``lang``."""
+    path = CONFIG.tessdata_path
+
+    def _load():
+        kwargs = {"lang": lang}
+        if path:
+            kwargs["path"] = path
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    return f"tesseract:{lang}:{path or ''}", _load
+
 
+def _ocr_tesserocr(gray, lang: str, psm: int) -> str:
+    gray = np.ascontiguousarray(gray)
+    h, w = gray.shape[:2]
+    name, loader = _api_model(lang)
+    with _API_LOCK, MODELS.use(name, loader, lambda api: api.End()) as api:
+        api.SetPageSegMode(psm)
+        api.SetImageBytes(gray.tobytes(), w, h, 1, w)
+        return api.GetUTF8Text()
+
+
+def _ocr_subprocess(gray, lang: str, psm: int) -> str:
     # Configure tesseract binary if provided
     if CONFIG.tesseract_cmd:
         pytesseract.pytesseract.tesseract_cmd = CONFIG.tesseract_cmd
+    return pytesseract.image_to_string(gray, lang=lang, config=f"--psm {psm}")
+
+
+def _recognize(gray, backend: str | None = None, psm: int = PSM_AUTO, lang: str | None = None) -> str:
+    """OCR a single-channel uint8 image with the configured backend."""
+    lang = lang or ocr_language()
+    if backend == "tesserocr" or (backend is None and _use_tesserocr()):
+        try:
+            return _ocr_tesserocr(gray, lang, psm)
+        except Exception:
+            if backend == "tesserocr" or pytesseract is None:
+                raise
+    if pytesseract is None:
+        raise RuntimeError("No OCR backend available")
+    return _ocr_subprocess(gray, lang, psm)
+
+
+def _binarize(img):
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # Basic preprocessing can improve OCR
+    return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+def _available() -> bool:
+    return cv2 is not None and (pytesseract is not None or tesserocr is not None)
+
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+# Settings a pool worker reads from CONFIG; it starts from a fresh interpreter,
+# so runtime changes made in this process are handed over explicitly
+_WORKER_FIELDS = ("simulate", "tesseract_cmd", "ocr_backend", "ocr_lang", "tessdata_path", "language")
+
+
+def _init_worker(settings: dict) -> None:
+    """Pool initializer: apply the parent's OCR settings and load this worker's own Tesseract handle."""
+    for name, value in settings.items():
+        setattr(CONFIG, name, value)
+    if _use_tesserocr():
+        try:
+            name, loader = _api_model(ocr_language())
+            # Held for the worker's lifetime so the handle is never unloaded between calls
+            MODELS.acquire(name, loader, lambda api: api.End())
+        except Exception:
+            pass
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            settings = {name: getattr(CONFIG, name) for name in _WORKER_FIELDS}
+            _POOL = ProcessPoolExecutor(max_workers=CONFIG.ocr_workers or None, mp_context=process_context(),
+                                        initializer=_init_worker, initargs=(settings,))
+        return _POOL
+
+
+def _on_config(changed: dict) -> None:
+    # Workers were started with the old settings; the next OCR call starts fresh ones
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+CONFIG_STORE.subscribe(_on_config, _WORKER_FIELDS + ("ocr_workers",))
+
+
+def _ocr_block(gray, lang: str, psm: int) -> str:
+    """Pool worker: each process keeps its own Tesseract handle between calls."""
+    return _recognize(gray, psm=psm, lang=lang).strip()
+
+
+def _layout_method(layout: str | None) -> str:
+    return (layout or CONFIG.ocr_layout or "morph").lower()
+
+
+def _cache_key(frame, method: str) -> tuple:
+    """``(page hash, settings digest)`` for the OCR cache, computed from the raw frame before any layout work."""
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return page_hash(gray), settings_key({"lang": ocr_language(), "layout": method})
+
+
+def _prepare_page(frame, method: str) -> dict:
+    """Layout stage of read_page: returns the images to OCR plus layout info and timings."""
+    from .ocr_layout import analyze_page, region_images
+
+    timings: dict = {}
+    skew, regions, crops = 0.0, [], []
+    if method != "none":
+        page = analyze_page(frame, method)
+        skew, regions, timings = page.skew_deg, page.regions, dict(page.timings)
+        t = time.perf_counter()
+        crops = region_images(page)
+        timings["threshold_ms"] = (time.perf_counter() - t) * 1000.0
+    if crops:
+        psm = PSM_SINGLE_BLOCK
+    else:
+        crops, psm = [_binarize(frame)], PSM_AUTO
+    return {"crops": crops, "psm": psm, "skew_deg": skew, "regions": regions, "timings": timings}
+
+
+def _ocr_blocks(crops: List, psm: int) -> Iterator[str]:
+    """OCR crops in parallel on the process pool and yield results in reading order."""
+    lang = ocr_language()
+    if len(crops) == 1 or CONFIG.ocr_workers == 1:
+        for c in crops:
+            yield _ocr_block(c, lang, psm)
+        return
+    pool = _get_pool()
+    futures = [pool.submit(_ocr_block, c, lang, psm) for c in crops]
+    try:
+        for f in futures:
+            yield f.result()
+    finally:
+        # Stop queued work if the consumer goes away early (e.g. reading was interrupted)
+        for f in futures:
+            f.cancel()
+
+
+def iter_page_text(frame, layout: str | None = None) -> Iterator[str]:
+    """Yield a page's text blocks in reading order as soon as each is recognized.
+
+    Later blocks keep being OCR'd on the pool while earlier ones are consumed,
+    so the first paragraph can be spoken before the page is finished.
+    """
+    if CONFIG.simulate or not _available():
+        yield SIMULATED_TEXT
+        return
+    if isinstance(frame, (str, os.PathLike)):
+        frame = _load_image(frame)
+    method = _layout_method(layout)
+    key = _cache_key(frame, method)
+    cache = get_cache()
+    cached = cache.get(*key)
+    if cached is not None:
+        yield from cached
+        return
+    prep = _prepare_page(frame, method)
+    blocks = []
+    for text in _ocr_blocks(prep["crops"], prep["psm"]):
+        if text:
+            blocks.append(text)
+            yield text
+    # Only complete pages are cached (the consumer may stop early)
+    cache.put(*key, blocks)
+
+
+def read_page(frame, layout: str | None = None) -> dict:
+    """OCR a page (numpy frame or image path): deskew, find text regions,
+    threshold and OCR each region in reading order.
+
+    Returns ``{"text", "blocks", "skew_deg", "regions", "timings", "cached"}``
+    with per-stage timings in milliseconds. With ``layout="none"`` (or when no
+    regions are found) the whole page is OCR'd with a global Otsu threshold.
+    Results are served from the OCR cache when the same page was read before;
+    the lookup happens before any layout work, so a hit skips it entirely.
+    """
+    if CONFIG.simulate or not _available():
+        return {"text": SIMULATED_TEXT, "blocks": [SIMULATED_TEXT], "skew_deg": 0.0, "regions": [],
+                "timings": {}, "cached": False}
+    start = time.perf_counter()
+    if isinstance(frame, (str, os.PathLike)):
+        frame = _load_image(frame)
+    method = _layout_method(layout)
+    key = _cache_key(frame, method)
+    cache = get_cache()
+    blocks = cache.get(*key)
+    cached = blocks is not None
+    timings = {"cache_ms": (time.perf_counter() - start) * 1000.0}
+    prep = {"skew_deg": 0.0, "regions": []}
+    if not cached:
+        prep = _prepare_page(frame, method)
+        timings.update(prep["timings"])
+        t = time.perf_counter()
+        blocks = [b for b in _ocr_blocks(prep["crops"], prep["psm"]) if b]
+        timings["ocr_ms"] = (time.perf_counter() - t) * 1000.0
+        cache.put(*key, blocks)
+    timings["total_ms"] = (time.perf_counter() - start) * 1000.0
+    return {
+        "text": "\n\n".join(blocks),
+        "blocks": blocks,
+        "skew_deg": prep["skew_deg"],
+        "regions": [list(r) for r in prep["regions"]],
+        "timings": {k: round(v, 1) for k, v in timings.items()},
+        "cached": cached,
+    }
+
+
+def read_text_from_frame(frame) -> str:
+    """OCR a BGR or grayscale numpy frame directly, without writing it to disk."""
+    return read_page(frame)["text"]
+
+
+def read_text_from_image(image_path: str | os.PathLike) -> str:
+    """Perform OCR on an image and return extracted text.
+
+    In simulation mode or when deps are missing, return a canned string.
+    """
+    if CONFIG.simulate or not _available():
+        return SIMULATED_TEXT
 
     path = Path(image_path)
     if not path.exists():
         raise FileNotFoundError(f"Image not found: {path}")
 
+    return read_page(_load_image(path))["text"]
+
+
+def _load_image(path: str | os.PathLike):
     img = cv2.imread(str(path))
     if img is None:
         raise RuntimeError("OpenCV failed to read the image")
+    return img
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    # Basic preprocessing can improve OCR
-    gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
-    text = pytesseract.image_to_string(gray)
-    return text.strip()
\ No newline at end of file
+
+def benchmark(image_path: str | os.PathLike, runs: int = 5) -> dict:
+    """Measure per-page OCR latency for each available backend.
+
+    The first in-process call also pays for loading the traineddata, so it is
+    reported separately from the steady-state mean.
+    """
+    gray = _binarize(_load_image(image_path))
+    backends = []
+    if pytesseract is not None:
+        backends.append("subprocess")
+    if tesserocr is not None:
+        backends.append("tesserocr")
+    out: dict = {"lang": ocr_language(), "runs": runs}
+    for backend in backends:
+        times = []
+        for _ in range(max(1, runs)):
+            start = time.perf_counter()
+            _recognize(gray, backend)
+            times.append((time.perf_counter() - start) * 1000.0)
+        steady = times[1:] or times
+        out[backend] = {
+            "first_ms": round(times[0], 1),
+            "mean_ms": round(sum(steady) / len(steady), 1),
+            "min_ms": round(min(steady), 1),
+        }
+    return out
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from .config import CONFIG
+
+
+CACHE_PATH = Path("./data/ocr_cache.sqlite")
+
+
+def page_hash(page_gray: np.ndarray, hash_size: int = 16) -> int:
+    """Perceptual hash of a page as the camera sees it (before deskew or layout).
+
+    The page is shrunk to 256 px wide and blurred so sensor noise, small
+    shifts and lighting changes wash out, then reduced to a ``hash_size`` x
+    ``hash_size`` difference hash (256 bits by default). Re-reads of one page
+    land a few dozen bits apart; different pages of the same book differ in
+    many more.
+    """
+    h, w = page_gray.shape[:2]
+    small = cv2.resize(page_gray, (256, max(1, round(256 * h / w))), interpolation=cv2.INTER_AREA)
+    small = cv2.GaussianBlur(small, (0, 0), 3)
+    grid = cv2.resize(small, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (grid[:, 1:] > grid[:, :-1]).reshape(-1)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def settings_key(settings: dict) -> str:
+    """Digest of the OCR settings that affect the result; only entries with equal settings can match."""
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class OCRCache:
+    """Small on-disk store (SQLite) of OCR results with LRU eviction.
+
+    Entries are keyed by the page's perceptual hash plus a settings digest.
+    A lookup matches the closest stored page with the same settings whose
+    hash is within ``max_distance`` bits, so a re-read of the same page hits
+    even though the camera never produces identical frames. Entries are
+    evicted least-recently-used first once the stored text exceeds
+    ``max_bytes``. Hit and miss counters are kept for the lifetime of the process.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_bytes: int | None = None, max_distance: int = 64) -> None:
+        self.path = Path(path)
+        self.max_bytes = int(CONFIG.ocr_cache_mb * 1024 * 1024) if max_bytes is None else max_bytes
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Digitize workers share this file; wait for their writes instead of failing with "database is locked"
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY, settings TEXT NOT NULL,"
+                " phash TEXT NOT NULL, blocks TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS pages_settings ON pages (settings)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        return self._db
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _nearest(self, db: sqlite3.Connection, phash: int, settings: str) -> Optional[tuple]:
+        best = None
+        for row_id, stored, blocks in db.execute("SELECT id, phash, blocks FROM pages WHERE settings = ?",
+                                                 (settings,)):
+            dist = _hamming(phash, int(stored, 16))
+            if dist <= self.max_distance and (best is None or dist < best[0]):
+                best = (dist, row_id, blocks)
+        return best
+
+    def get(self, phash: int, settings: str) -> Optional[List[str]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            db = self._conn()
+            best = self._nearest(db, phash, settings)
+            if best is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE pages SET last_access = ? WHERE id = ?", (time.time(), best[1]))
+            db.commit()
+            self.hits += 1
+        return json.loads(best[2])
+
+    def put(self, phash: int, settings: str, blocks: List[str]) -> None:
+        if not self.enabled:
+            return
+        data = json.dumps(blocks)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            db = self._conn()
+            # A near-identical page already stored is replaced rather than duplicated
+            best = self._nearest(db, phash, settings)
+            if best is not None:
+                db.execute("DELETE FROM pages WHERE id = ?", (best[1],))
+            db.execute(
+                "INSERT INTO pages (settings, phash, blocks, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (settings, format(phash, "x"), data, size, time.time()),
+            )
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            while total > self.max_bytes:
+                old = db.execute("SELECT id, size FROM pages ORDER BY last_access LIMIT 1").fetchone()
+                if old is None:
+                    break
+                db.execute("DELETE FROM pages WHERE id = ?", (old[0],))
+                total -= old[1]
+                self.evictions += 1
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM pages")
+            db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self.enabled:
+                entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            else:
+                entries, size = 0, 0
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "max_distance": self.max_distance,
+        }
+
+
+_CACHE: Optional[OCRCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> OCRCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = OCRCache()
+        return _CACHE
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from .models import MODELS
+
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+MODELS_DIR = Path("./data/models")
+EAST_MODEL = MODELS_DIR / "frozen_east_text_detection.pb"
+
+
+@dataclass
+class PageLayout:
+    """Deskewed page, its text regions in reading order and per-stage timings (ms)."""
+    image: np.ndarray
+    skew_deg: float
+    regions: List[Box]
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def _ink(gray: np.ndarray) -> np.ndarray:
+    return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+
+
+def estimate_skew(gray: np.ndarray, max_angle: float = 15.0, step: float = 0.5) -> float:
+    """Rotation in degrees (cv2 convention) that makes text lines horizontal.
+
+    Ink pixels are projected onto the vertical axis for every candidate angle
+    at once; the angle whose row histogram is sharpest wins.
+    """
+    small = gray
+    if max(gray.shape) > 800:
+        scale = 800.0 / max(gray.shape)
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ys, xs = np.nonzero(_ink(small))
+    if xs.size < 50:
+        return 0.0
+    if xs.size > 20000:
+        pick = np.random.default_rng(0).choice(xs.size, 20000, replace=False)
+        xs, ys = xs[pick], ys[pick]
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    rad = np.deg2rad(angles)[:, None]
+    # Row coordinate after cv2.getRotationMatrix2D(angle): y' = -sin(a) x + cos(a) y
+    rows = np.round(-np.sin(rad) * xs[None, :] + np.cos(rad) * ys[None, :]).astype(np.int64)
+    rows -= rows.min(axis=1, keepdims=True)
+    width = int(rows.max()) + 1
+    flat = rows + (np.arange(len(angles)) * width)[:, None]
+    hist = np.bincount(flat.ravel(), minlength=len(angles) * width).reshape(len(angles), width)
+    score = (hist.astype(np.float64) ** 2).sum(axis=1)
+    return float(angles[int(np.argmax(score))])
+
+
+def deskew(image: np.ndarray, angle: float) -> np.ndarray:
+    if abs(angle) < 0.3:
+        return image
+    h, w = image.shape[:2]
+    m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    border = 255 if image.ndim == 2 else (255, 255, 255)
+    return cv2.warpAffine(image, m, (w, h), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+
+
+def _reading_order(boxes: List[Box]) -> List[Box]:
+    """Group blocks into vertically overlapping bands, top to bottom, then left to right."""
+    rows: List[List[Box]] = []
+    bottom = -1
+    for b in sorted(boxes, key=lambda b: b[1]):
+        if rows and b[1] < bottom:
+            rows[-1].append(b)
+            bottom = max(bottom, b[1] + b[3])
+        else:
+            rows.append([b])
+            bottom = b[1] + b[3]
+    return [b for row in rows for b in sorted(row, key=lambda b: b[0])]
+
+
+def _merge_overlapping(boxes: List[Box]) -> List[Box]:
+    merged = [list(b) for b in boxes]
+    changed = True
+    while changed:
+        changed = False
+        out: List[List[int]] = []
+        for x, y, w, h in merged:
+            for m in out:
+                if x < m[0] + m[2] and m[0] < x + w and y < m[1] + m[3] and m[1] < y + h:
+                    x2 = max(m[0] + m[2], x + w)
+                    y2 = max(m[1] + m[3], y + h)
+                    m[0], m[1] = min(m[0], x), min(m[1], y)
+                    m[2], m[3] = x2 - m[0], y2 - m[1]
+                    changed = True
+                    break
+            else:
+                out.append([x, y, w, h])
+        merged = out
+    return [tuple(m) for m in merged]
+
+
+def _text_height(ink: np.ndarray) -> int:
+    """Median glyph height from connected components (used to size kernels)."""
+    n, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[(heights > 3) & (heights < ink.shape[0] // 4)]
+    return int(np.median(heights)) if heights.size else 12
+
+
+def _blocks_from_mask(mask: np.ndarray, th: int, min_area: int) -> List[Box]:
+    """Close character blobs into lines, then lines into paragraph blocks."""
+    lines = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (3 * th, max(1, th // 3))))
+    # Lines closer than about one text height belong to the same paragraph
+    blocks = cv2.dilate(lines, cv2.getStructuringElement(cv2.MORPH_RECT, (th, th)))
+    contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for c in contours:
+        x, y, w, h = cv2.boundingRect(c)
+        if w * h < min_area or h < 8 or w < 8:
+            continue
+        boxes.append((x, y, w, h))
+    return boxes
+
+
+def find_text_regions_morph(gray: np.ndarray, min_area: int = 300) -> List[Box]:
+    """Paragraph blocks from the binarized ink mask."""
+    ink = _ink(gray)
+    return _blocks_from_mask(ink, _text_height(ink), min_area)
+
+
+def find_text_regions_mser(gray: np.ndarray, min_area: int = 300) -> List[Box]:
+    """Paragraph blocks from MSER character candidates (more robust on low-contrast photos)."""
+    mser = cv2.MSER_create()
+    regions, _ = mser.detectRegions(gray)
+    mask = np.zeros_like(gray)
+    for pts in regions:
+        x, y, w, h = cv2.boundingRect(pts)
+        if h > gray.shape[0] // 4 or w > gray.shape[1] // 2:
+            continue
+        mask[y:y + h, x:x + w] = 255
+    return _blocks_from_mask(mask, _text_height(mask), min_area)
+
+
+def _load_east():
+    return cv2.dnn.readNet(str(EAST_MODEL)) if EAST_MODEL.exists() else None
+
+
+MODELS.register("east_text", _load_east)
+
+
+def find_text_regions_east(image: np.ndarray, conf_threshold: float = 0.5) -> List[Box]:
+    """Text boxes from the EAST detector in data/models (empty if the model is absent)."""
+    if not EAST_MODEL.exists():
+        return []
+    bgr = image if image.ndim == 3 else cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    h, w = bgr.shape[:2]
+    nw, nh = 320, 320
+    blob = cv2.dnn.blobFromImage(bgr, 1.0, (nw, nh), (123.68, 116.78, 103.94), swapRB=True, crop=False)
+    with MODELS.use("east_text") as east:
+        if east is None:
+            return []
+        east.setInput(blob)
+        scores, geo = east.forward(["feature_fusion/Conv_7/Sigmoid", "feature_fusion/concat_3"])
+    ys, xs = np.nonzero(scores[0, 0] >= conf_threshold)
+    if xs.size == 0:
+        return []
+    # Decode axis-aligned boxes (rotation is ignored; the page was deskewed already)
+    d = geo[0, :, ys, xs]  # (N, 5): top, right, bottom, left, angle
+    ox, oy = xs * 4.0, ys * 4.0
+    x2 = ox + d[:, 1]
+    x1 = ox - d[:, 3]
+    y1 = oy - d[:, 0]
+    y2 = oy + d[:, 2]
+    rx, ry = w / nw, h / nh
+    rects = np.column_stack([x1 * rx, y1 * ry, (x2 - x1) * rx, (y2 - y1) * ry]).astype(int)
+    conf = scores[0, 0, ys, xs]
+    keep = cv2.dnn.NMSBoxes(rects.tolist(), conf.tolist(), conf_threshold, 0.4)
+    keep = np.asarray(keep, dtype=np.int64).reshape(-1)
+    return [tuple(int(v) for v in rects[i]) for i in keep]
+
+
+def _merge_line_boxes(boxes: List[Box], shape: Tuple[int, int]) -> List[Box]:
+    """Merge word-level boxes (e.g. from EAST) into blocks with a mask + dilation."""
+    if not boxes:
+        return []
+    mask = np.zeros(shape[:2], dtype=np.uint8)
+    for x, y, w, h in boxes:
+        mask[max(0, y):y + h, max(0, x):x + w] = 255
+    mask = cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_RECT, (25, 9)))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return [cv2.boundingRect(c) for c in contours]
+
+
+def binarize_region(gray: np.ndarray) -> np.ndarray:
+    """Adaptive threshold sized to the region, so uneven lighting across a page is handled locally."""
+    block = max(11, (min(gray.shape[:2]) // 8) | 1)
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block, 10)
+
+
+def analyze_page(image: np.ndarray, method: str = "morph", pad: int = 4) -> PageLayout:
+    """Deskew a page and locate its text regions in reading order.
+
+    ``method`` is "morph" (default), "mser" or "east" (falls back to morph when
+    the EAST model is missing).
+    """
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    angle = estimate_skew(gray)
+    gray = deskew(gray, angle)
+    t1 = time.perf_counter()
+    timings["deskew_ms"] = (t1 - t0) * 1000.0
+
+    boxes: List[Box] = []
+    if method == "east":
+        boxes = _merge_line_boxes(find_text_regions_east(gray), gray.shape)
+    elif method == "mser":
+        boxes = find_text_regions_mser(gray)
+    if not boxes:
+        boxes = find_text_regions_morph(gray)
+    h, w = gray.shape[:2]
+    boxes = [
+        (max(0, x - pad), max(0, y - pad), min(w, x + bw + pad) - max(0, x - pad), min(h, y + bh + pad) - max(0, y - pad))
+        for x, y, bw, bh in boxes
+    ]
+    regions = _reading_order(_merge_overlapping(boxes))
+    timings["regions_ms"] = (time.perf_counter() - t1) * 1000.0
+    return PageLayout(gray, angle, regions, timings)
+
+
+def region_images(layout: PageLayout) -> List[np.ndarray]:
+    """Binarized crops for each region, in reading order."""
+    return [binarize_region(layout.image[y:y + h, x:x + w]) for x, y, w, h in layout.regions]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+from .config import CONFIG
 
 PERSONA_PATH = Path("./data/persona.json")
 
@@ -14,80 +20,182 @@ DEFAULT_PERSONA = {
     "last_update": 0.0,
 }
 
+TRAITS = ("curiosity", "patience")
+
+
+def _clamp(v: float) -> float:
+    return max(0.0, min(1.0, v))
+
+
+def _toward_neutral(v: float, amount: float) -> float:
+    if v > 0.5:
+        return max(0.5, v - amount)
+    if v < 0.5:
+        return min(0.5, v + amount)
+    return v
+
+
+class PersonaManager:
+    """Persona state held in memory and shared by the engine and API threads.
+
+    Reads and updates only touch the in-memory copy under a lock. Drift
+    toward neutral (0.5) is applied lazily: traits move ``decay_per_sec``
+    per second of elapsed time (affinities half as fast), computed in one
+    step whenever the state is read or changed. Changes are written behind
+    by a background thread at most ``checkpoint_sec`` later, atomically
+    (temp file + rename), so a crash never leaves a torn ``persona.json``.
+    """
 
-def _load() -> Dict:
-    if PERSONA_PATH.exists():
+    def __init__(self, path: Path = PERSONA_PATH, decay_per_sec: float | None = None,
+                 checkpoint_sec: float | None = None) -> None:
+        self.path = Path(path)
+        self.decay_per_sec = CONFIG.persona_decay_per_sec if decay_per_sec is None else decay_per_sec
+        self.checkpoint_sec = CONFIG.persona_checkpoint_sec if checkpoint_sec is None else checkpoint_sec
+        self.saves = 0
+        self._state: Optional[Dict] = None
+        self._decay_ts = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self) -> Dict:
+        # Called with the lock held
+        if self._state is None:
+            state = copy.deepcopy(DEFAULT_PERSONA)
+            if self.path.exists():
+                try:
+                    state.update(json.loads(self.path.read_text()))
+                except Exception:
+                    pass
+            self._state = state
+            # Drift is counted from when the state was loaded, not while the device was off
+            self._decay_ts = time.time()
+        return self._state
+
+    def _decay(self, now: float) -> None:
+        p = self._load()
+        elapsed = now - self._decay_ts
+        if elapsed <= 0 or self.decay_per_sec <= 0:
+            return
+        self._decay_ts = now
+        step = self.decay_per_sec * elapsed
+        for trait in TRAITS:
+            p[trait] = _toward_neutral(float(p.get(trait, 0.5)), step)
+        aff = p.setdefault("affinity", {})
+        for name, val in aff.items():
+            aff[name] = _toward_neutral(float(val), step / 2)
+
+    def get(self) -> Dict:
+        with self._lock:
+            self._decay(time.time())
+            return copy.deepcopy(self._state)
+
+    def update(self, traits: Dict[str, float] | None = None, affinity: Dict[str, float] | None = None) -> Dict:
+        """Apply trait and affinity deltas in one step and return the new state."""
+        now = time.time()
+        with self._lock:
+            self._decay(now)
+            p = self._state
+            for name, delta in (traits or {}).items():
+                p[name] = _clamp(float(p.get(name, 0.5)) + float(delta))
+            aff = p.setdefault("affinity", {})
+            for name, delta in (affinity or {}).items():
+                aff[name] = _clamp(float(aff.get(name, 0.5)) + float(delta))
+            p["last_update"] = now
+            self._dirty = True
+            snapshot = copy.deepcopy(p)
+        self._schedule()
+        return snapshot
+
+    def settle(self, amount: float) -> Dict:
+        """Move traits ``amount`` toward neutral right away (affinities half as far)."""
+        now = time.time()
+        with self._lock:
+            self._decay(now)
+            p = self._state
+            for trait in TRAITS:
+                p[trait] = _toward_neutral(float(p.get(trait, 0.5)), amount)
+            aff = p.setdefault("affinity", {})
+            for name, val in aff.items():
+                aff[name] = _toward_neutral(float(val), amount / 2)
+            p["last_update"] = now
+            self._dirty = True
+            snapshot = copy.deepcopy(p)
+        self._schedule()
+        return snapshot
+
+    def _schedule(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Coalesce every change made during the checkpoint window into one write
+            time.sleep(self.checkpoint_sec)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the current state now if it changed since the last checkpoint."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._decay(time.time())
+            data = json.dumps(self._state)
+            self._dirty = False
         try:
-            return json.loads(PERSONA_PATH.read_text())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            with tmp.open("w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self.saves += 1
         except Exception:
-            pass
-    return DEFAULT_PERSONA.copy()
+            with self._lock:
+                self._dirty = True
 
 
-def _save(p: Dict) -> None:
-    PERSONA_PATH.parent.mkdir(parents=True, exist_ok=True)
-    p["last_update"] = time.time()
-    PERSONA_PATH.write_text(json.dumps(p))
+_MANAGER = PersonaManager()
+atexit.register(_MANAGER.flush)
 
 
 def get_persona() -> Dict:
-    return _load()
+    return _MANAGER.get()
 
 
 def update_trait(name: str, delta: float) -> Dict:
-    p = _load()
-    p[name] = max(0.0, min(1.0, float(p.get(name, 0.5)) + float(delta)))
-    _save(p)
-    return p
+    return _MANAGER.update(traits={name: delta})
 
 
 def update_affinity(person_name: str, delta: float) -> Dict:
-    p = _load()
-    aff = p.get("affinity", {})
-    aff[person_name] = max(0.0, min(1.0, float(aff.get(person_name, 0.5)) + float(delta)))
-    p["affinity"] = aff
-    _save(p)
-    return p
+    return _MANAGER.update(affinity={person_name: delta})
 
 
 def update_on_event(event: str, payload: Dict | None = None) -> Dict:
-    p = _load()
     # Simple rules
     if event == "greet" and payload and payload.get("name"):
-        update_affinity(payload["name"], +0.05)
-        update_trait("curiosity", +0.01)
-    elif event == "interrupt":
-        update_trait("patience", -0.10)
-    elif event == "novel_object":
-        update_trait("curiosity", +0.02)
-    elif event == "obstacle":
-        update_trait("patience", -0.02)
-    else:
-        _save(p)
-    return _load()
+        return _MANAGER.update(traits={"curiosity": +0.01}, affinity={payload["name"]: +0.05})
+    if event == "interrupt":
+        return _MANAGER.update(traits={"patience": -0.10})
+    if event == "novel_object":
+        return _MANAGER.update(traits={"curiosity": +0.02})
+    if event == "obstacle":
+        return _MANAGER.update(traits={"patience": -0.02})
+    return _MANAGER.update()
 
 
 def step_decay(rate: float = 0.001) -> Dict:
-    """Gently moves traits toward neutral (0.5) over time.
+    """Moves traits ``rate`` toward neutral (0.5) right away, affinities half as far.
 
-    Also softly decays extreme affinities toward 0.5 to simulate settling.
+    Time-based drift already happens on its own (``PERSONA_DECAY_PER_SEC``);
+    this is an extra nudge on top of it.
     """
-    p = _load()
-    for trait in ("curiosity", "patience"):
-        v = float(p.get(trait, 0.5))
-        if v > 0.5:
-            v = max(0.5, v - rate)
-        elif v < 0.5:
-            v = min(0.5, v + rate)
-        p[trait] = v
-    aff = p.get("affinity", {})
-    for name, val in list(aff.items()):
-        v = float(val)
-        if v > 0.5:
-            v = max(0.5, v - rate / 2)
-        elif v < 0.5:
-            v = min(0.5, v + rate / 2)
-        aff[name] = v
-    p["affinity"] = aff
-    _save(p)
-    return p
\ No newline at end of file
+    return _MANAGER.settle(rate)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+Box = Tuple[int, int, int, int]  # x1, y1, x2, y2
+
+
+def _small_gray(frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def dhash(frame: np.ndarray, hash_size: int = 8) -> int:
+    """64-bit difference hash: robust to small lighting and noise changes."""
+    small = _small_gray(frame, (hash_size + 1, hash_size)).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).reshape(-1)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class SceneChange:
+    changed: bool
+    scene_hash: int
+    changed_fraction: float
+    # Full-resolution bounding box of the changed pixels when only part of the frame moved
+    region: Optional[Box] = None
+
+
+class SceneChangeDetector:
+    """Cheap scene-change check using downscaled frame differencing plus a dHash.
+
+    Each call compares the frame against the previous one passed to ``check``;
+    with ``keep_reference`` it is compared against the last frame reported as
+    changed instead (the one a cached result belongs to), so slow drift adds
+    up until it counts as a change. A scene counts as unchanged when both the
+    fraction of changed pixels and the hash distance are small. When the
+    change is confined to part of the frame, its bounding box is returned so
+    inference can be cropped to it.
+    """
+
+    def __init__(self, work_size: Tuple[int, int] = (160, 120), pixel_threshold: int = 25,
+                 min_changed_fraction: float = 0.01, max_hash_distance: int = 4,
+                 max_region_fraction: float = 0.5, keep_reference: bool = False) -> None:
+        self.work_size = work_size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.max_hash_distance = max_hash_distance
+        self.max_region_fraction = max_region_fraction
+        self.keep_reference = keep_reference
+        self._ref: Optional[np.ndarray] = None
+        self._ref_hash: Optional[int] = None
+        self.checks = 0
+        self.unchanged = 0
+
+    def reset(self) -> None:
+        self._ref = None
+        self._ref_hash = None
+
+    def check(self, frame: np.ndarray) -> SceneChange:
+        self.checks += 1
+        small = cv2.GaussianBlur(_small_gray(frame, self.work_size), (5, 5), 0)
+        h = dhash(frame)
+        if self._ref is None:
+            self._ref, self._ref_hash = small, h
+            return SceneChange(True, h, 1.0)
+
+        diff = cv2.absdiff(small, self._ref)
+        mask = diff > self.pixel_threshold
+        fraction = float(mask.mean())
+        dist = hamming(h, self._ref_hash)
+        unchanged = fraction < self.min_changed_fraction and dist <= self.max_hash_distance
+        if not (unchanged and self.keep_reference):
+            self._ref, self._ref_hash = small, h
+        if unchanged:
+            self.unchanged += 1
+            return SceneChange(False, h, fraction)
+
+        region = None
+        if fraction <= self.max_region_fraction:
+            ys, xs = np.nonzero(mask)
+            if xs.size:
+                fh, fw = frame.shape[:2]
+                sx = fw / self.work_size[0]
+                sy = fh / self.work_size[1]
+                # Pad the region so objects straddling its edge stay detectable
+                pad_x, pad_y = 0.1 * fw, 0.1 * fh
+                region = (
+                    int(max(0, xs.min() * sx - pad_x)),
+                    int(max(0, ys.min() * sy - pad_y)),
+                    int(min(fw, (xs.max() + 1) * sx + pad_x)),
+                    int(min(fh, (ys.max() + 1) * sy + pad_y)),
+                )
+        return SceneChange(True, h, fraction, region)
+
+
+class SceneResultCache:
+    """Small LRU of results keyed by scene hash; near-identical hashes also hit."""
+
+    def __init__(self, capacity: int = 32, max_distance: int = 4) -> None:
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self._items: "OrderedDict[int, Any]" = OrderedDict()
+
+    def get(self, scene_hash: int) -> Any:
+        if scene_hash in self._items:
+            self._items.move_to_end(scene_hash)
+            return self._items[scene_hash]
+        for key in reversed(self._items):
+            if hamming(key, scene_hash) <= self.max_distance:
+                self._items.move_to_end(key)
+                return self._items[key]
+        return None
+
+    def put(self, scene_hash: int, value: Any) -> None:
+        self._items[scene_hash] = value
+        self._items.move_to_end(scene_hash)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
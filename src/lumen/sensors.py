@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import CONFIG, CONFIG_STORE
+from .env_sensors import read_environment
+from .events import publish
+from .gesture import read_gesture
+from .gps import get_location
+
+
+class _Sensor:
+    def __init__(self, name: str, reader: Callable[[], Any], interval_sec: float) -> None:
+        self.name = name
+        self.reader = reader
+        self.interval_sec = interval_sec
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.ts = 0.0
+        self.read_ms = 0.0
+        self.reads = 0
+        self.coalesced = 0
+        self.lock = threading.Lock()
+        self.inflight: Optional[threading.Event] = None
+
+
+class SensorCache:
+    """Timestamped snapshots of slow sensors (environment, GPS, gesture).
+
+    A sampler thread per sensor refreshes its snapshot every
+    ``interval_sec``; callers normally get the latest snapshot without
+    touching hardware. A read goes to the device only when forced, when the
+    snapshot is older than the caller's ``max_age``, or before the first
+    sample; sensors without a sampler are read on every request. Concurrent
+    reads of one sensor are merged: one caller reads the device and the
+    others wait for its result.
+    """
+
+    def __init__(self) -> None:
+        self._sensors: Dict[str, _Sensor] = {}
+        self._stop = threading.Event()
+        self._threads: Dict[str, threading.Thread] = {}
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    def register(self, name: str, reader: Callable[[], Any], interval_sec: float) -> None:
+        """Add a sensor; ``interval_sec`` <= 0 means it is only read on demand."""
+        self._sensors[name] = _Sensor(name, reader, interval_sec)
+
+    def _refresh(self, s: _Sensor, timeout: float = 10.0) -> None:
+        with s.lock:
+            leader = s.inflight is None
+            if leader:
+                s.inflight = threading.Event()
+            else:
+                s.coalesced += 1
+            done = s.inflight
+        if not leader:
+            done.wait(timeout)
+            return
+        t0 = time.perf_counter()
+        try:
+            value, error = s.reader(), None
+        except Exception as e:
+            value, error = None, str(e) or type(e).__name__
+        with s.lock:
+            if error is None:
+                s.value = value
+            s.error = error
+            s.ts = time.time()
+            s.read_ms = (time.perf_counter() - t0) * 1000.0
+            s.reads += 1
+            s.inflight = None
+        done.set()
+        if error is None:
+            publish(f"sensor.{s.name}", value, state=True)
+
+    def get(self, name: str, max_age: float | None = None, force: bool = False) -> dict:
+        """Snapshot of ``name``: ``{"value", "ts", "age_sec", "error"}``.
+
+        ``max_age`` (seconds) asks for data at most that old, reading the
+        device if the snapshot is older; ``force`` always reads it. An
+        on-demand sensor (``interval_sec`` <= 0) is read unless ``max_age``
+        says the snapshot is recent enough.
+        """
+        s = self._sensors[name]
+        age = time.time() - s.ts if s.ts else None
+        if max_age is None and s.interval_sec <= 0:
+            force = True
+        if force or age is None or (max_age is not None and age > max_age):
+            self._refresh(s)
+        with s.lock:
+            return {
+                "value": s.value,
+                "ts": s.ts or None,
+                "age_sec": round(time.time() - s.ts, 3) if s.ts else None,
+                "error": s.error,
+            }
+
+    def invalidate(self, name: str) -> None:
+        """Forget the snapshot so the next read goes to the device."""
+        s = self._sensors[name]
+        with s.lock:
+            s.ts = 0.0
+            s.value = None
+            s.error = None
+
+    def set_interval(self, name: str, interval_sec: float) -> None:
+        self._sensors[name].interval_sec = interval_sec
+        # Start a sampler for a sensor that just got a period, unless sampling was stopped
+        if self._started and not self._stop.is_set():
+            self.start()
+
+    def value(self, name: str, max_age: float | None = None, force: bool = False) -> Any:
+        return self.get(name, max_age, force)["value"]
+
+    def start(self) -> None:
+        """Start the background samplers (no-op if they are running)."""
+        with self._start_lock:
+            self._started = True
+            self._stop.clear()
+            for name, s in self._sensors.items():
+                t = self._threads.get(name)
+                if s.interval_sec <= 0 or (t is not None and t.is_alive()):
+                    continue
+                t = threading.Thread(target=self._sample, args=(s,), daemon=True)
+                self._threads[name] = t
+                t.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _sample(self, s: _Sensor) -> None:
+        while not self._stop.is_set() and s.interval_sec > 0:
+            age = time.time() - s.ts if s.ts else None
+            if age is None or age >= s.interval_sec:
+                self._refresh(s)
+                age = 0.0
+            self._stop.wait(max(0.05, s.interval_sec - age))
+
+    def stats(self) -> dict:
+        now = time.time()
+        out = {}
+        for name, s in self._sensors.items():
+            with s.lock:
+                out[name] = {
+                    "interval_sec": s.interval_sec,
+                    "age_sec": round(now - s.ts, 3) if s.ts else None,
+                    "read_ms": round(s.read_ms, 1),
+                    "reads": s.reads,
+                    "coalesced": s.coalesced,
+                    "sampling": bool(self._threads.get(name) and self._threads[name].is_alive()),
+                    "error": s.error,
+                }
+        return out
+
+
+SENSORS = SensorCache()
+SENSORS.register("environment", read_environment, CONFIG.sensor_env_sec)
+SENSORS.register("location", get_location, CONFIG.sensor_gps_sec)
+SENSORS.register("gesture", read_gesture, CONFIG.sensor_gesture_sec)
+
+
+def _on_config(changed: dict) -> None:
+    # A new GPS port or simulation flag makes the cached readings meaningless
+    if {"gps_serial_port", "gps_baudrate", "simulate"} & changed.keys():
+        SENSORS.invalidate("location")
+    if "simulate" in changed:
+        SENSORS.invalidate("environment")
+        SENSORS.invalidate("gesture")
+    for name, field in (("environment", "sensor_env_sec"), ("location", "sensor_gps_sec"),
+                        ("gesture", "sensor_gesture_sec")):
+        if field in changed:
+            SENSORS.set_interval(name, getattr(CONFIG, field))
+
+
+CONFIG_STORE.subscribe(_on_config, ("gps_serial_port", "gps_baudrate", "simulate",
+                                    "sensor_env_sec", "sensor_gps_sec", "sensor_gesture_sec"))
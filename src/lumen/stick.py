@@ -9,6 +9,7 @@ except Exception:  # pragma: no cover
     GPIO = None
 
 from .config import CONFIG
+from .devices import DEVICES
 
 # Ultrasonic sensor HC-SR04 pins (BCM numbering)
 TRIG_PIN = 23
@@ -37,7 +38,10 @@ def read_distance_cm() -> float | None:
         if random.random() < 0.2:
             base = random.uniform(20, 60)
         return round(base, 1)
+    return DEVICES.read("ultrasonic", _read_hc_sr04, devices=["gpio:ultrasonic"])
 
+
+def _read_hc_sr04() -> float | None:
     try:
         _setup_ultrasonic()
         # Trigger pulse
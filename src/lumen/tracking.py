@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .objects import detect_objects_in_frame
+from .vision import detect_faces, recognize_face
+
+
+Box = Tuple[int, int, int, int]  # x1, y1, x2, y2
+
+
+@dataclass
+class Track:
+    track_id: int
+    kind: str  # "face" or "object"
+    label: str
+    confidence: float
+    box: np.ndarray  # float32 [x1, y1, x2, y2]
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(4, dtype=np.float32))
+    hits: int = 1
+    misses: int = 0
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    # Recognized name for face tracks; computed once per track, retried while it is "Unknown"
+    identity: Optional[str] = None
+    recognized_ts: float = 0.0
+
+    def as_tuple(self) -> Tuple[str, float, Box]:
+        return (self.label, self.confidence, tuple(int(v) for v in self.box))
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) boxes in x1, y1, x2, y2 form."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-6)
+
+
+def _overlaps(box: np.ndarray, region: Box) -> bool:
+    return bool(box[0] < region[2] and box[2] > region[0] and box[1] < region[3] and box[3] > region[1])
+
+
+class MultiObjectTracker:
+    """IoU tracker with a constant-velocity motion model.
+
+    Tracks are predicted forward every frame and associated greedily with new
+    detections of the same label by IoU against the predicted box.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_misses: int = 2, smoothing: float = 0.5) -> None:
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.smoothing = smoothing
+        self.tracks: List[Track] = []
+        self._next_id = 1
+
+    def predict(self) -> None:
+        for t in self.tracks:
+            t.box = t.box + t.velocity
+
+    def update(self, detections: List[Tuple[str, str, float, Box]],
+               region: Optional[Box] = None) -> Tuple[List[Track], List[Track]]:
+        """Associate ``(kind, label, confidence, box)`` detections with the current tracks.
+
+        When ``region`` is given, detection only covered that part of the frame,
+        so tracks lying entirely outside it are kept without counting a miss.
+        Returns ``(new_tracks, lost_tracks)``.
+        """
+        now = time.time()
+        det_boxes = np.array([d[3] for d in detections], dtype=np.float32).reshape(-1, 4)
+        trk_boxes = np.array([t.box for t in self.tracks], dtype=np.float32).reshape(-1, 4)
+        iou = iou_matrix(trk_boxes, det_boxes)
+        if iou.size:
+            same = np.array([[t.kind == d[0] and t.label == d[1] for d in detections] for t in self.tracks])
+            iou = np.where(same, iou, 0.0)
+
+        matched_trk: set[int] = set()
+        matched_det: set[int] = set()
+        if iou.size:
+            order = np.dstack(np.unravel_index(np.argsort(-iou, axis=None), iou.shape))[0]
+            for ti, di in order:
+                if iou[ti, di] < self.iou_threshold:
+                    break
+                if ti in matched_trk or di in matched_det:
+                    continue
+                matched_trk.add(int(ti))
+                matched_det.add(int(di))
+                t = self.tracks[ti]
+                new_box = det_boxes[di]
+                t.velocity = self.smoothing * (new_box - t.box) + (1 - self.smoothing) * t.velocity
+                t.box = new_box
+                t.confidence = float(detections[di][2])
+                t.hits += 1
+                t.misses = 0
+                t.last_seen = now
+
+        lost: List[Track] = []
+        kept: List[Track] = []
+        for i, t in enumerate(self.tracks):
+            if i not in matched_trk and (region is None or _overlaps(t.box, region)):
+                t.misses += 1
+                if t.misses > self.max_misses:
+                    lost.append(t)
+                    continue
+            kept.append(t)
+
+        new: List[Track] = []
+        for di, (kind, label, conf, _) in enumerate(detections):
+            if di in matched_det:
+                continue
+            t = Track(self._next_id, kind, label, float(conf), det_boxes[di].copy())
+            self._next_id += 1
+            new.append(t)
+        self.tracks = kept + new
+        return new, lost
+
+
+@dataclass
+class SceneState:
+    tracks: List[Track]
+    new_tracks: List[Track]
+    detector_ran: bool
+
+    def confirmed(self) -> List[Track]:
+        """Tracks matched by the latest detection; ones coasting on missed detections are left out."""
+        return [t for t in self.tracks if t.misses == 0]
+
+    def names(self, only_new: bool = False) -> List[str]:
+        src = self.new_tracks if only_new else self.confirmed()
+        return [t.identity or "Unknown" for t in src if t.kind == "face"]
+
+    def objects(self, only_new: bool = False) -> List[Tuple[str, float, Box]]:
+        src = self.new_tracks if only_new else self.confirmed()
+        return [t.as_tuple() for t in src if t.kind == "object"]
+
+
+class SceneTracker:
+    """Runs detection and face recognition only when the tracks need it.
+
+    The SSD and face detectors run every ``detect_every`` frames, whenever a
+    track was lost, when nothing is tracked, or when the last detection is
+    older than ``max_interval_sec``. Each face track is recognized once and
+    keeps its identity while it is tracked; a track still "Unknown" is tried
+    again every ``retry_unknown_sec`` (the first crop may have been blurred
+    or turned away).
+    """
+
+    def __init__(self, detect_every: int = 5, max_interval_sec: float = 5.0,
+                 tracker: MultiObjectTracker | None = None, retry_unknown_sec: float = 3.0) -> None:
+        self.detect_every = max(1, detect_every)
+        self.max_interval_sec = max_interval_sec
+        self.retry_unknown_sec = retry_unknown_sec
+        self.tracker = tracker or MultiObjectTracker()
+        self.frames = 0
+        self.detector_runs = 0
+        self.recognitions = 0
+        self._since_detect = 0
+        self._last_detect_ts = 0.0
+        self._lost_pending = False
+
+    def _needs_detection(self) -> bool:
+        return (
+            not self.tracker.tracks
+            or self._lost_pending
+            or self._since_detect >= self.detect_every
+            or time.time() - self._last_detect_ts > self.max_interval_sec
+        )
+
+    def process(self, frame: np.ndarray, force_detect: bool = False, roi: Optional[Box] = None) -> SceneState:
+        """Advance the tracks by one frame, running detection only when needed.
+
+        ``roi`` restricts detection to the part of the frame that changed.
+        """
+        self.frames += 1
+        self.tracker.predict()
+        if not (force_detect or self._needs_detection()):
+            self._since_detect += 1
+            return SceneState(list(self.tracker.tracks), [], False)
+
+        ox, oy = 0, 0
+        view = frame
+        if roi is not None:
+            ox, oy = roi[0], roi[1]
+            view = frame[roi[1]:roi[3], roi[0]:roi[2]]
+        detections: List[Tuple[str, str, float, Box]] = []
+        for (x, y, w, h) in detect_faces(view):
+            detections.append(("face", "face", 1.0, (x + ox, y + oy, x + w + ox, y + h + oy)))
+        for label, conf, (x1, y1, x2, y2) in detect_objects_in_frame(view):
+            detections.append(("object", label, conf, (x1 + ox, y1 + oy, x2 + ox, y2 + oy)))
+        self.detector_runs += 1
+        self._since_detect = 0
+        self._last_detect_ts = time.time()
+
+        new, lost = self.tracker.update(detections, roi)
+        self._lost_pending = bool(lost)
+        now = time.time()
+        for t in self.tracker.tracks:
+            if t.kind != "face" or t.misses:
+                continue
+            retry = t.identity == "Unknown" and now - t.recognized_ts >= self.retry_unknown_sec
+            if t.identity is None or retry:
+                x1, y1, x2, y2 = (int(v) for v in t.box)
+                crop = frame[max(0, y1):y2, max(0, x1):x2]
+                t.identity = recognize_face(crop) if crop.size else "Unknown"
+                t.recognized_ts = now
+                self.recognitions += 1
+        return SceneState(list(self.tracker.tracks), new, True)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "detector_runs": self.detector_runs,
+            "recognitions": self.recognitions,
+            "tracks": len(self.tracker.tracks),
+        }
@@ -4,6 +4,7 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import sys
 
 try:
@@ -16,7 +17,7 @@ try:
 except Exception:  # pragma: no cover
     winsound = None
 
-from .config import CONFIG
+from .config import CONFIG, CONFIG_STORE
 
 
 class TTS:
@@ -26,6 +27,11 @@ class TTS:
         self.tts_engine = (CONFIG.tts_engine or "pyttsx3").lower()
         self.piper_voice = CONFIG.piper_voice
         self.engine = None
+        # One utterance at a time: the pyttsx3 engine is not re-entrant and there is one speaker
+        self.lock = threading.RLock()
+        self._init_engine()
+
+    def _init_engine(self) -> None:
         # Initialize pyttsx3 when requested
         if not self.simulate and self.tts_engine == "pyttsx3" and pyttsx3 is not None:
             try:
@@ -34,6 +40,20 @@ class TTS:
             except Exception:
                 self.engine = None
 
+    def reconfigure(self, changed: dict) -> None:
+        """Apply config changes, re-initialising only the parts they affect."""
+        with self.lock:
+            self.simulate = CONFIG.simulate
+            self.language = CONFIG.language.lower() if CONFIG.language else "en"
+            self.tts_engine = (CONFIG.tts_engine or "pyttsx3").lower()
+            # Piper is run per utterance with the voice path, so a new voice needs no rebuild
+            self.piper_voice = CONFIG.piper_voice
+            if "tts_engine" in changed or "simulate" in changed:
+                self.engine = None
+                self._init_engine()
+            elif "language" in changed:
+                self._select_voice_by_language(self.language)
+
     def _select_voice_by_language(self, lang: str) -> None:
         if self.engine is None:
             return
@@ -68,24 +88,39 @@ class TTS:
             # Create a temporary wav file
             tmp_dir = tempfile.gettempdir()
             wav_path = os.path.join(tmp_dir, 'lumen_tts.wav')
-            # Run Piper: text via stdin, output to wav file
-            cmd = [piper_bin, '-m', self.piper_voice, '--output_file', wav_path]
-            subprocess.run(cmd, input=text.encode('utf-8'), check=True)
-            # Play the wav (Windows: winsound)
-            if winsound is not None:
-                winsound.PlaySound(wav_path, winsound.SND_FILENAME)
-            else:
-                # Fallback: try to open with OS default player
-                if sys.platform.startswith('darwin'):
-                    subprocess.run(['afplay', wav_path], check=False)
-                elif sys.platform.startswith('linux'):
-                    subprocess.run(['aplay', wav_path], check=False)
-                else:
-                    os.startfile(wav_path)  # type: ignore
+            if not self._synthesize_with_piper(text, wav_path):
+                return False
+            play_audio(wav_path)
             return True
         except Exception:
             return False
 
+    def _synthesize_with_piper(self, text: str, wav_path: str) -> bool:
+        piper_bin = shutil.which('piper')
+        if not piper_bin or not self.piper_voice:
+            return False
+        # Run Piper: text via stdin, output to wav file
+        cmd = [piper_bin, '-m', self.piper_voice, '--output_file', wav_path]
+        subprocess.run(cmd, input=text.encode('utf-8'), check=True)
+        return True
+
+    def synthesize_to_file(self, text: str, wav_path: str) -> bool:
+        """Render speech to a wav file instead of playing it. Returns False if no engine can."""
+        try:
+            if self.tts_engine == 'piper' or self.language.startswith('bn'):
+                if self._synthesize_with_piper(text, wav_path):
+                    return True
+            if self.engine is None and pyttsx3 is not None and not self.simulate:
+                self.engine = pyttsx3.init()
+                self._select_voice_by_language(self.language)
+            if self.engine is None:
+                return False
+            self.engine.save_to_file(text, wav_path)
+            self.engine.runAndWait()
+            return os.path.exists(wav_path)
+        except Exception:
+            return False
+
     def _speak_with_pyttsx3(self, text: str) -> bool:
         if self.simulate:
             print(f"[SIM-TTS] {text}")
@@ -100,6 +135,10 @@ class TTS:
             return False
 
     def speak(self, text: str) -> None:
+        with self.lock:
+            self._speak(text)
+
+    def _speak(self, text: str) -> None:
         # Prefer Piper for Bangla if configured
         if self.tts_engine == 'piper' or self.language.startswith('bn'):
             if self._speak_with_piper(text):
@@ -123,5 +162,47 @@ class TTS:
         print(f"[SIM-TTS] {text}")
 
 
+def play_audio(path: str) -> None:
+    """Play a wav (or, with ffplay installed, compressed) audio file."""
+    if CONFIG.simulate:
+        print(f"[SIM-AUDIO] {path}")
+        return
+    # Play the wav (Windows: winsound)
+    if winsound is not None and path.endswith('.wav'):
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+    elif not path.endswith('.wav') and shutil.which('ffplay'):
+        subprocess.run(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', path], check=False)
+    # Fallback: try to open with OS default player
+    elif sys.platform.startswith('darwin'):
+        subprocess.run(['afplay', path], check=False)
+    elif sys.platform.startswith('linux'):
+        subprocess.run(['aplay', path], check=False)
+    else:
+        os.startfile(path)  # type: ignore
+
+
+_TTS: TTS | None = None
+_TTS_LOCK = threading.Lock()
+
+
+def get_tts() -> TTS:
+    """Shared TTS instance, kept in step with the config."""
+    global _TTS
+    with _TTS_LOCK:
+        if _TTS is None:
+            _TTS = TTS()
+        return _TTS
+
+
+def _on_config(changed: dict) -> None:
+    with _TTS_LOCK:
+        tts = _TTS
+    if tts is not None:
+        tts.reconfigure(changed)
+
+
+CONFIG_STORE.subscribe(_on_config, ("simulate", "language", "tts_engine", "piper_voice"))
+
+
 def speak(text: str) -> None:
-    TTS().speak(text)
\ No newline at end of file
+    get_tts().speak(text)
\ No newline at end of file
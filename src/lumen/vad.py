@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+
+@dataclass
+class VADEvent:
+    kind: str  # "onset", "offset", "speech_start" or "speech_end"
+    ts: float
+    energy_db: float
+
+
+@dataclass
+class VADResult:
+    """Per-frame decisions for one ``StreamingVAD.process`` call."""
+    active: np.ndarray  # sound above the noise floor (with hangover)
+    speech: np.ndarray  # speech-like sound (with hangover)
+    energy_db: np.ndarray
+    events: List[VADEvent] = field(default_factory=list)
+
+    @property
+    def onset(self) -> bool:
+        return any(e.kind == "onset" for e in self.events)
+
+
+def frame_features(frames: np.ndarray):
+    """Energy (dBFS), zero-crossing rate and spectral flatness for (n_frames, frame_len) float frames."""
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    energy_db = 20.0 * np.log10(rms + 1e-9)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    power = np.abs(np.fft.rfft(frames * np.hanning(frames.shape[1]), axis=1)) ** 2 + 1e-12
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    return energy_db, zcr, flatness
+
+
+class StreamingVAD:
+    """Frame-based voice-activity detector with an adaptive noise floor.
+
+    Audio is cut into ``frame_ms`` frames (leftover samples carry over to the
+    next call) and features are computed for all frames at once. A frame is
+    active when it is ``margin_db`` above the noise floor, and speech when it
+    is also tonal (low spectral flatness) with a speech-like zero-crossing
+    rate. The floor follows quiet frames quickly and creeps up slowly during
+    constant sound, so steady background noise stops counting as activity
+    after a few seconds. While speech is detected the creep is capped at
+    ``speech_rise_db_per_sec``, so a long sentence is not absorbed into the
+    floor before it ends. Decisions are held for ``hangover_ms``.
+    """
+
+    def __init__(self, samplerate: int = 16000, frame_ms: int = 30, margin_db: float = 9.0,
+                 hangover_ms: int = 300, flatness_max: float = 0.45, zcr_range=(0.01, 0.35),
+                 floor_rise_db_per_sec: float = 1.5, speech_rise_db_per_sec: float = 0.5) -> None:
+        self.samplerate = samplerate
+        self.frame_len = samplerate * frame_ms // 1000
+        self.frame_sec = frame_ms / 1000.0
+        self.margin_db = margin_db
+        self.hangover = max(1, hangover_ms // frame_ms)
+        self.flatness_max = flatness_max
+        self.zcr_range = zcr_range
+        self.floor_rise = floor_rise_db_per_sec * self.frame_sec
+        self.speech_rise = min(speech_rise_db_per_sec, floor_rise_db_per_sec) * self.frame_sec
+        self.noise_floor_db: Optional[float] = None
+        self.active = False
+        self.speech = False
+        self._active_hold = 0
+        self._speech_hold = 0
+        self._rest = np.zeros(0, dtype=np.float32)
+
+    def reset(self) -> None:
+        self.active = self.speech = False
+        self._active_hold = self._speech_hold = 0
+        self._rest = np.zeros(0, dtype=np.float32)
+
+    def process(self, samples: np.ndarray, ts: float | None = None) -> VADResult:
+        """Classify a chunk of mono samples (int16 or float in [-1, 1]).
+
+        ``ts`` is the wall time of the end of the chunk (defaults to now) and
+        is used to timestamp events.
+        """
+        x = np.asarray(samples).reshape(-1)
+        if x.dtype == np.int16:
+            x = x.astype(np.float32) / 32768.0
+        x = np.concatenate([self._rest, x.astype(np.float32, copy=False)])
+        n = len(x) // self.frame_len
+        self._rest = x[n * self.frame_len:]
+        active = np.zeros(n, dtype=bool)
+        speech = np.zeros(n, dtype=bool)
+        if n == 0:
+            return VADResult(active, speech, np.zeros(0))
+        energy_db, zcr, flatness = frame_features(x[:n * self.frame_len].reshape(n, self.frame_len))
+        tonal = (flatness < self.flatness_max) & (zcr >= self.zcr_range[0]) & (zcr <= self.zcr_range[1])
+        end = time.time() if ts is None else ts
+        events: List[VADEvent] = []
+        for i in range(n):
+            e = float(energy_db[i])
+            if self.noise_floor_db is None:
+                self.noise_floor_db = e
+            loud = e > self.noise_floor_db + self.margin_db
+            # Noise floor: fast down, slow towards quiet frames, very slow creep under constant sound
+            if e < self.noise_floor_db:
+                self.noise_floor_db = 0.7 * self.noise_floor_db + 0.3 * e
+            elif not loud:
+                self.noise_floor_db += 0.05 * (e - self.noise_floor_db)
+            elif tonal[i] or self._speech_hold > 0:
+                self.noise_floor_db += self.speech_rise
+            else:
+                self.noise_floor_db += self.floor_rise
+
+            self._active_hold = self.hangover if loud else max(0, self._active_hold - 1)
+            self._speech_hold = self.hangover if (loud and tonal[i]) else max(0, self._speech_hold - 1)
+            now_active = self._active_hold > 0
+            now_speech = self._speech_hold > 0
+            frame_ts = end - (n - 1 - i) * self.frame_sec
+            if now_active != self.active:
+                events.append(VADEvent("onset" if now_active else "offset", frame_ts, e))
+            if now_speech != self.speech:
+                events.append(VADEvent("speech_start" if now_speech else "speech_end", frame_ts, e))
+            self.active, self.speech = now_active, now_speech
+            active[i], speech[i] = now_active, now_speech
+        return VADResult(active, speech, energy_db, events)
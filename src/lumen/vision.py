@@ -2,24 +2,45 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 import time
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import cv2
 import numpy as np
 
 from .camera import capture_image
+from .models import MODELS, process_context
 
 
 PEOPLE_DIR = Path("./data/people")
 PEOPLE_DIR.mkdir(parents=True, exist_ok=True)
+# Every enrolled person lives in this one file, which is replaced as a whole on each change
+GALLERY_PATH = PEOPLE_DIR / "gallery.json"
+_GALLERY_LOCK = threading.Lock()
 
+MAX_PEOPLE = 10
+# Variance of the Laplacian below this is treated as a blurry face crop
+BLUR_THRESHOLD = 60.0
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".ppm"}
 
-def _detect_faces(image_bgr: np.ndarray) -> List[Tuple[int, int, int, int]]:
+
+def _load_face_cascade():
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+MODELS.register("haar_face", _load_face_cascade)
+# One cascade is shared by the engine, API and job threads; detectMultiScale is not safe to call concurrently
+_CASCADE_LOCK = threading.Lock()
+
+
+def detect_faces(image_bgr: np.ndarray) -> List[Tuple[int, int, int, int]]:
     gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
-    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    boxes = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60))
+    with MODELS.use("haar_face") as cascade, _CASCADE_LOCK:
+        boxes = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60))
     return [tuple(map(int, b)) for b in boxes]
 
 
@@ -33,62 +54,206 @@ def _extract_face_embedding(face_bgr: np.ndarray) -> List[float]:
     return vec.astype(float).tolist()
 
 
-def _load_known_embeddings() -> List[Tuple[str, np.ndarray]]:
-    out: List[Tuple[str, np.ndarray]] = []
+def _sharpness(image_bgr: np.ndarray) -> float:
+    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def _read_gallery_files() -> Tuple[Dict[str, Dict], List[Path]]:
+    """Enrolled people by name, plus the per-person files from older versions that were merged in.
+
+    A legacy file that cannot be parsed is skipped and not listed, so it is
+    never deleted as if it had been migrated.
+    """
+    people: Dict[str, Dict] = {}
+    merged: List[Path] = []
     for p in PEOPLE_DIR.glob("*.json"):
+        if p == GALLERY_PATH:
+            continue
         try:
             data = json.loads(p.read_text())
-            name = data.get("name")
-            emb = np.array(data.get("embedding", []), dtype=np.float32)
-            if name and emb.size == 32 * 32:
-                out.append((name, emb))
+            if data.get("name"):
+                people[data["name"]] = data
+                merged.append(p)
         except Exception:
             pass
+    try:
+        people.update(json.loads(GALLERY_PATH.read_text()).get("people", {}))
+    except Exception:
+        pass
+    return people, merged
+
+
+def _read_gallery() -> Dict[str, Dict]:
+    return _read_gallery_files()[0]
+
+
+def _save_gallery(people: Dict[str, Dict], merged: List[Path]) -> None:
+    """Write the whole gallery to a temporary file and swap it in with one ``os.replace``.
+
+    Readers see either the old or the new gallery, never part of a batch.
+    ``merged`` are the legacy per-person files folded into ``people``; they
+    are removed once the gallery is in place. Call with ``_GALLERY_LOCK`` held.
+    """
+    tmp = GALLERY_PATH.with_name(GALLERY_PATH.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps({"people": people}))
+        os.replace(tmp, GALLERY_PATH)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    for p in merged:
+        p.unlink(missing_ok=True)
+
+
+def _capacity_error(people: Dict[str, Dict], adding: Iterable[str]) -> Dict | None:
+    # Capacity limit: up to 10 people
+    if len(set(people) | set(adding)) > MAX_PEOPLE:
+        return {"ok": False, "error": f"Capacity reached ({MAX_PEOPLE} people). Forget someone first."}
+    return None
+
+
+def _load_known_embeddings() -> List[Tuple[str, np.ndarray]]:
+    out: List[Tuple[str, np.ndarray]] = []
+    for name, data in _read_gallery().items():
+        emb = np.array(data.get("embedding", []), dtype=np.float32)
+        if emb.size == 32 * 32:
+            out.append((name, emb))
     return out
 
 
 def enroll_person(name: str, image_path: str | None = None) -> dict:
-    # Capacity limit: up to 10 people
-    existing = list(PEOPLE_DIR.glob("*.json"))
-    if len(existing) >= 10 and not (PEOPLE_DIR / f"{name}.json").exists():
-        return {"ok": False, "error": "Capacity reached (10 people). Forget someone first."}
+    error = _capacity_error(_read_gallery(), [name])
+    if error:
+        return error
     path = image_path or capture_image("./data/enroll.jpg")
     img = cv2.imread(path)
     if img is None:
         return {"ok": False, "error": "Image not found"}
-    boxes = _detect_faces(img)
+    boxes = detect_faces(img)
     if not boxes:
         return {"ok": False, "error": "No face detected"}
     x, y, w, h = boxes[0]
     face = img[y:y + h, x:x + w]
     emb = _extract_face_embedding(face)
     data = {"name": name, "embedding": emb, "added_at": time.time()}
-    (PEOPLE_DIR / f"{name}.json").write_text(json.dumps(data))
+    with _GALLERY_LOCK:
+        people, merged = _read_gallery_files()
+        error = _capacity_error(people, [name])
+        if error:
+            return error
+        people[name] = data
+        _save_gallery(people, merged)
     return {"ok": True}
 
 
+def _embed_enrollment_image(path: str, blur_threshold: float = BLUR_THRESHOLD) -> Dict:
+    """Detect, crop and embed the largest face in one image (runs in a worker process)."""
+    img = cv2.imread(path)
+    if img is None:
+        return {"image": path, "ok": False, "reason": "unreadable"}
+    boxes = detect_faces(img)
+    if not boxes:
+        return {"image": path, "ok": False, "reason": "no_face"}
+    x, y, w, h = max(boxes, key=lambda b: b[2] * b[3])
+    face = img[y:y + h, x:x + w]
+    sharpness = _sharpness(face)
+    if sharpness < blur_threshold:
+        return {"image": path, "ok": False, "reason": "blurry", "sharpness": round(sharpness, 1)}
+    return {
+        "image": path,
+        "ok": True,
+        "faces": len(boxes),
+        "sharpness": round(sharpness, 1),
+        "embedding": _extract_face_embedding(face),
+    }
+
+
+def enroll_from_directory(root: str | os.PathLike, workers: int | None = None,
+                          blur_threshold: float = BLUR_THRESHOLD) -> Dict:
+    """Enroll everyone found in ``root``, which holds one subfolder of photos per person.
+
+    Faces are detected and embedded across a process pool. Blurry or faceless
+    images are skipped; each person's remaining embeddings are averaged and the
+    gallery file is replaced in a single step. Returns a per-image report.
+    """
+    base = Path(root)
+    if not base.is_dir():
+        return {"ok": False, "error": "Directory not found"}
+    jobs: List[Tuple[str, str]] = []
+    for person_dir in sorted(p for p in base.iterdir() if p.is_dir()):
+        for img in sorted(person_dir.iterdir()):
+            if img.suffix.lower() in IMAGE_EXTENSIONS:
+                jobs.append((person_dir.name, str(img)))
+    if not jobs:
+        return {"ok": False, "error": "No images found"}
+
+    worker = partial(_embed_enrollment_image, blur_threshold=blur_threshold)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        results = list(pool.map(worker, [path for _, path in jobs], chunksize=4))
+
+    report: List[Dict] = []
+    embeddings: Dict[str, List[np.ndarray]] = {}
+    for (name, _), res in zip(jobs, results):
+        emb = res.pop("embedding", None)
+        res["person"] = name
+        report.append(res)
+        if emb is not None:
+            embeddings.setdefault(name, []).append(np.array(emb, dtype=np.float32))
+
+    gallery: Dict[str, Dict] = {}
+    now = time.time()
+    for name, embs in embeddings.items():
+        mean = np.mean(embs, axis=0)
+        mean = mean / (np.linalg.norm(mean) + 1e-6)
+        gallery[name] = {"name": name, "embedding": mean.astype(float).tolist(), "added_at": now}
+
+    skipped = sorted({name for name, _ in jobs} - set(gallery))
+    with _GALLERY_LOCK:
+        people, merged = _read_gallery_files()
+        error = _capacity_error(people, gallery)
+        if error:
+            return {**error, "images": report}
+        if gallery:
+            people.update(gallery)
+            _save_gallery(people, merged)
+    return {"ok": bool(gallery), "enrolled": sorted(gallery), "skipped_people": skipped, "images": report}
+
+
 def list_people() -> List[str]:
-    names = []
-    for p in PEOPLE_DIR.glob("*.json"):
-        try:
-            data = json.loads(p.read_text())
-            name = data.get("name")
-            if name:
-                names.append(name)
-        except Exception:
-            pass
-    return sorted(names)
+    return sorted(_read_gallery())
 
 
 def forget_person(name: str) -> dict:
-    p = PEOPLE_DIR / f"{name}.json"
-    if p.exists():
+    with _GALLERY_LOCK:
+        people, merged = _read_gallery_files()
+        if name not in people:
+            return {"ok": False, "error": "Not found"}
+        del people[name]
         try:
-            p.unlink()
+            _save_gallery(people, merged)
             return {"ok": True}
         except Exception:
             return {"ok": False, "error": "Unable to delete"}
-    return {"ok": False, "error": "Not found"}
+
+
+def recognize_face(face_bgr: np.ndarray, known: List[Tuple[str, np.ndarray]] | None = None,
+                   threshold: float = 0.8) -> str:
+    """Return the enrolled name that best matches a face crop, or "Unknown"."""
+    if known is None:
+        known = _load_known_embeddings()
+    emb = np.array(_extract_face_embedding(face_bgr), dtype=np.float32)
+    best_name = None
+    best_score = 0.0
+    for name, kemb in known:
+        # cosine similarity
+        score = float(np.dot(emb, kemb) / ((np.linalg.norm(emb) * np.linalg.norm(kemb)) + 1e-6))
+        if score > best_score:
+            best_score = score
+            best_name = name
+    if best_name and best_score >= threshold:
+        return best_name
+    return "Unknown"
 
 
 def recognize(image_path: str | None = None, threshold: float = 0.8) -> List[str]:
@@ -96,22 +261,10 @@ def recognize(image_path: str | None = None, threshold: float = 0.8) -> List[str
     img = cv2.imread(path)
     if img is None:
         return []
-    boxes = _detect_faces(img)
+    boxes = detect_faces(img)
     known = _load_known_embeddings()
     names: List[str] = []
     for (x, y, w, h) in boxes:
         face = img[y:y + h, x:x + w]
-        emb = np.array(_extract_face_embedding(face), dtype=np.float32)
-        best_name = None
-        best_score = 0.0
-        for name, kemb in known:
-            # cosine similarity
-            score = float(np.dot(emb, kemb) / ((np.linalg.norm(emb) * np.linalg.norm(kemb)) + 1e-6))
-            if score > best_score:
-                best_score = score
-                best_name = name
-        if best_name and best_score >= threshold:
-            names.append(best_name)
-        else:
-            names.append("Unknown")
+        names.append(recognize_face(face, known, threshold))
     return names
\ No newline at end of file
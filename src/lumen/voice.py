@@ -1,16 +1,30 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
 
 try:
     from vosk import Model, KaldiRecognizer
-    import sounddevice as sd
 except Exception:  # pragma: no cover
     Model = None
     KaldiRecognizer = None
-    sd = None
 
 from .config import CONFIG
+from .models import MODELS
+from .audio_bus import SAMPLERATE, Subscription, get_audio_bus
+from .vad import StreamingVAD
+
+
+def _load_vosk(model_path: str):
+    try:
+        return Model(model_path)
+    except Exception:
+        return None
 
 
 class VoiceRecognizer:
@@ -18,23 +32,39 @@ class VoiceRecognizer:
         self.simulate = CONFIG.simulate
         self.model_path = model_path
         self.model = None
-        self.samplerate = 16000
-        if not self.simulate and Model is not None and model_path:
-            try:
-                self.model = Model(model_path)
-            except Exception:
-                self.model = None
+        self.samplerate = SAMPLERATE
+        self._model_name: str | None = None
+        self.open()
+
+    def open(self) -> None:
+        """Take a reference on the Vosk model; recognizers with the same path share one instance."""
+        if self._model_name is not None or self.simulate or Model is None or not self.model_path:
+            return
+        self._model_name = f"vosk:{os.path.abspath(self.model_path)}"
+        path = self.model_path
+        self.model = MODELS.acquire(self._model_name, lambda: _load_vosk(path))
+
+    def close(self) -> None:
+        """Drop the model reference so the registry may unload it when memory is short."""
+        if self._model_name is not None:
+            MODELS.release(self._model_name)
+            self._model_name = None
+            self.model = None
 
     def listen_once(self, timeout_sec: float = 5.0) -> str:
-        if self.simulate or self.model is None or sd is None:
+        if self.simulate or self.model is None:
             return "Simulation: navigate to library"
+        bus = get_audio_bus()
+        if not bus.running:
+            return "Error: Audio input unavailable"
         rec = KaldiRecognizer(self.model, self.samplerate)
+        sub = bus.subscribe("listen_once")
         try:
-            audio = sd.rec(int(timeout_sec * self.samplerate), samplerate=self.samplerate, channels=1, dtype='int16')
-            sd.wait()
-        except Exception:
-            return "Error: Audio input unavailable"
-        if rec.AcceptWaveform(audio.tobytes()):
+            audio = sub.read(int(timeout_sec * self.samplerate), timeout=timeout_sec + 1.0,
+                             min_frames=int(timeout_sec * self.samplerate))
+        finally:
+            sub.close()
+        if rec.AcceptWaveform(audio[:, 0].tobytes()):
             result = rec.Result()
         else:
             result = rec.PartialResult()
@@ -42,4 +72,135 @@ class VoiceRecognizer:
             data = json.loads(result)
             return data.get("text", "")
         except Exception:
-            return ""
\ No newline at end of file
+            return ""
+
+
+@dataclass
+class VoiceEvent:
+    text: str
+    final: bool
+    ts: float = field(default_factory=time.time)
+
+
+class StreamingVoiceRecognizer(VoiceRecognizer):
+    """Continuous recognition over the shared microphone stream.
+
+    A worker thread reads the audio bus and feeds a single long-lived
+    ``KaldiRecognizer``, so utterances are never cut at window boundaries.
+    Final utterances are queued as events (read with ``poll``) and partial
+    hypotheses are kept in ``partial``. ``grammar`` limits decoding to a
+    phrase list (see ``lumen.intents.vosk_grammar``). With ``gated`` set, a streaming VAD
+    keeps silence and non-speech noise away from the decoder; the block
+    before each speech onset is fed as pre-roll.
+    """
+
+    def __init__(self, model_path: str | None = None, block_ms: int = 100, gated: bool = True,
+                 grammar: Optional[List[str]] = None,
+                 on_partial: Optional[Callable[[str], None]] = None,
+                 on_final: Optional[Callable[[str], None]] = None) -> None:
+        super().__init__(model_path)
+        self.blocksize = int(self.samplerate * block_ms / 1000)
+        self.vad = StreamingVAD(self.samplerate) if gated else None
+        # Restricting the decoder to known phrases lowers CPU use and misrecognitions
+        self.grammar = grammar
+        self.skipped_blocks = 0
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.partial = ""
+        self.events: "queue.Queue[VoiceEvent]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sub: Optional[Subscription] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Open the microphone and start recognizing. Returns False when unavailable."""
+        if self.running:
+            return True
+        self.open()
+        if self.simulate or self.model is None:
+            return False
+        bus = get_audio_bus()
+        if not bus.running:
+            return False
+        self._sub = bus.subscribe("asr")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sub is not None:
+            self._sub.close()
+            self._sub = None
+
+    def _run(self) -> None:
+        if self.grammar:
+            rec = KaldiRecognizer(self.model, self.samplerate, json.dumps(self.grammar, ensure_ascii=False))
+        else:
+            rec = KaldiRecognizer(self.model, self.samplerate)
+        sub = self._sub
+        prev = None
+        in_speech = False
+        while not self._stop.is_set() and sub is not None:
+            block = sub.read(self.blocksize, timeout=0.5, min_frames=self.blocksize)
+            if not len(block):
+                continue
+            audio = block[:, 0]
+            if self.vad is not None:
+                if not (self.vad.process(audio).speech.any() or self.vad.speech):
+                    if in_speech:
+                        # Speech ended: flush the utterance instead of waiting for decoder silence
+                        in_speech = False
+                        self._finish(_text_of(rec.FinalResult(), "text"))
+                    prev = audio
+                    self.skipped_blocks += 1
+                    continue
+                if not in_speech:
+                    in_speech = True
+                    if prev is not None:
+                        rec.AcceptWaveform(prev.tobytes())
+            if rec.AcceptWaveform(audio.tobytes()):
+                self._finish(_text_of(rec.Result(), "text"))
+            else:
+                partial = _text_of(rec.PartialResult(), "partial")
+                if partial and partial != self.partial:
+                    self.partial = partial
+                    self._emit(VoiceEvent(partial, False))
+
+    def _finish(self, text: str) -> None:
+        self.partial = ""
+        if text:
+            self._emit(VoiceEvent(text, True))
+
+    def _emit(self, event: VoiceEvent) -> None:
+        if event.final:
+            self.events.put(event)
+        callback = self.on_final if event.final else self.on_partial
+        if callback is not None:
+            try:
+                callback(event.text)
+            except Exception:
+                pass
+
+    def poll(self) -> str:
+        """Next final utterance, or "" if none is ready. Never blocks."""
+        if not self.running:
+            if self.simulate or self.model is None:
+                return self.listen_once(timeout_sec=0.0)
+            return ""
+        try:
+            return self.events.get_nowait().text
+        except queue.Empty:
+            return ""
+
+
+def _text_of(result: str, key: str) -> str:
+    try:
+        return json.loads(result).get(key, "").strip()
+    except Exception:
+        return ""
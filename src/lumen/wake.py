@@ -1,47 +1,148 @@
 from __future__ import annotations
 
+import json
 import threading
 import time
 from typing import Callable, Optional
 
-from .voice import VoiceRecognizer
+import numpy as np
+
+from .voice import VoiceRecognizer, KaldiRecognizer
+from .audio_bus import get_audio_bus
 from .config import CONFIG
+from .vad import StreamingVAD
+
+
+# Wake phrases plus Vosk's garbage token, so anything else decodes as [unk]
+WAKE_WORDS = ["lumen", "লুমেন"]
+WAKE_GRAMMAR = WAKE_WORDS + ["[unk]"]
+
+FRAME_MS = 30
 
 
 class WakeWordListener:
-    """Lightweight wake-word listener using Vosk partial results.
+    """Low-CPU wake-word listener on the shared audio bus.
 
-    Triggers a callback when the phrase "lumen" (or Bengali "লুমেন") is detected.
-    Designed to run as a background thread alongside the API server.
+    Audio is first screened by the streaming VAD; only speech segments (plus a
+    short pre-roll) are decoded, by a ``KaldiRecognizer`` restricted to the
+    wake phrases in English and Bengali. Triggers a callback when "lumen" (or
+    "লুমেন") is heard. ``stats`` reports CPU use and detection latency.
     """
 
-    def __init__(self, vosk_model_path: Optional[str]) -> None:
+    def __init__(self, vosk_model_path: Optional[str], cooldown_sec: float = 1.5,
+                 preroll_ms: int = 300) -> None:
         self.vosk_model_path = vosk_model_path
         self.vr = VoiceRecognizer(vosk_model_path)
+        self.cooldown_sec = cooldown_sec
+        self.preroll_ms = preroll_ms
+        self.vad = StreamingVAD(self.vr.samplerate, frame_ms=FRAME_MS)
         self.stop_event = threading.Event()
         self.thread: Optional[threading.Thread] = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.frames = 0
+        self.voiced_frames = 0
+        self.detections = 0
+        self.decode_sec = 0.0
+        self.cpu_sec = 0.0
+        self.started_ts = time.time()
+        self.latencies_ms: list[float] = []
+
+    def _recognizer(self):
+        return KaldiRecognizer(self.vr.model, self.vr.samplerate, json.dumps(WAKE_GRAMMAR))
 
     def start(self, callback: Callable[[], None], interval_sec: float = 0.6) -> None:
+        """Start listening. ``interval_sec`` is kept for API compatibility and ignored."""
         if self.thread and self.thread.is_alive():
             return
+        self.vr.open()
+        if CONFIG.simulate or self.vr.model is None or KaldiRecognizer is None:
+            return
+        bus = get_audio_bus()
+        if not bus.running:
+            return
+        self.stop_event.clear()
+        self._reset_stats()
+        self.thread = threading.Thread(target=self._loop, args=(bus, callback), daemon=True)
+        self.thread.start()
 
-        def _loop() -> None:
+    def _loop(self, bus, callback: Callable[[], None]) -> None:
+        sub = bus.subscribe("wake")
+        frame_len = bus.samplerate * FRAME_MS // 1000
+        preroll = bus.samplerate * self.preroll_ms // 1000
+        rec = self._recognizer()
+        in_segment = False
+        onset_ts = 0.0
+        mute_until = 0.0
+        cpu_last = time.thread_time()
+        try:
             while not self.stop_event.is_set():
-                heard = self.vr.listen_once(timeout_sec=interval_sec)
-                t = (heard or "").lower().strip()
-                if t and ("lumen" in t or "লুমেন" in t):
+                cpu_now = time.thread_time()
+                self.cpu_sec += cpu_now - cpu_last
+                cpu_last = cpu_now
+                block = sub.read(frame_len * 4, timeout=0.5, min_frames=frame_len * 4)
+                end = sub.cursor
+                n = len(block) // frame_len
+                if n == 0:
+                    continue
+                block = block[:n * frame_len, 0]
+                voiced = self.vad.process(block).speech
+                self.frames += n
+                self.voiced_frames += int(voiced.sum())
+                now = time.time()
+                if not voiced.any():
+                    if in_segment:
+                        rec.FinalResult()
+                        rec.Reset()
+                        in_segment = False
+                    continue
+                if not in_segment:
+                    in_segment = True
+                    first = int(np.argmax(voiced))
+                    onset_ts = now - (n - first) * FRAME_MS / 1000.0
+                    # Feed the audio just before the onset so the first syllable is not clipped
+                    start = end - n * frame_len + first * frame_len
+                    pre = bus.view(max(0, start - preroll), min(preroll, start))[:, 0]
+                    audio = np.concatenate([pre, block[first * frame_len:]])
+                else:
+                    audio = block
+                t0 = time.perf_counter()
+                final = rec.AcceptWaveform(audio.tobytes())
+                text = json.loads(rec.Result() if final else rec.PartialResult()).get("text" if final else "partial", "")
+                self.decode_sec += time.perf_counter() - t0
+                if now >= mute_until and any(w in text for w in WAKE_WORDS):
+                    self.detections += 1
+                    self.latencies_ms.append((time.time() - onset_ts) * 1000.0)
+                    self.latencies_ms = self.latencies_ms[-50:]
+                    rec.Reset()
+                    in_segment = False
+                    # Cooldown avoids multiple triggers for one utterance
+                    mute_until = now + self.cooldown_sec
                     try:
                         callback()
                     except Exception:
                         pass
-                    # small cooldown to avoid multiple triggers
-                    time.sleep(1.5)
-                time.sleep(0.05)
-
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=_loop, daemon=True)
-        self.thread.start()
+        finally:
+            sub.close()
+            self.vr.close()
 
     def stop(self) -> None:
         self.stop_event.set()
-        # Do not join daemon thread aggressively; allow graceful exit
\ No newline at end of file
+        # Do not join daemon thread aggressively; allow graceful exit
+
+    def stats(self) -> dict:
+        """Gate/decoder load and wake latency since start (latency runs from speech onset to trigger)."""
+        wall = max(1e-6, time.time() - self.started_ts)
+        lat = self.latencies_ms
+        return {
+            "running": bool(self.thread and self.thread.is_alive()),
+            "frames": self.frames,
+            "voiced_fraction": round(self.voiced_frames / self.frames, 3) if self.frames else 0.0,
+            "noise_floor_db": round(self.vad.noise_floor_db or 0.0, 1),
+            "decode_sec": round(self.decode_sec, 3),
+            "cpu_pct": round(100.0 * self.cpu_sec / wall, 2),
+            "detections": self.detections,
+            "latency_ms_last": round(lat[-1], 1) if lat else None,
+            "latency_ms_avg": round(sum(lat) / len(lat), 1) if lat else None,
+        }
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import argparse
-import os
 from pathlib import Path
 
-from lumen.config import CONFIG, Config
+from lumen.config import CONFIG, CONFIG_STORE
 from lumen.tts import speak
 from lumen.ocr import read_text_from_image
 from lumen.camera import capture_image
@@ -17,8 +16,10 @@ from lumen.env_sensors import read_environment
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="lumen", description="Lumen Assistive Robot CLI")
     p.add_argument("command", choices=[
-        "read-text", "speak", "capture", "listen", "gesture", "gps", "status", "assist"
+        "read-text", "speak", "capture", "listen", "gesture", "gps", "status", "assist",
+        "enroll-dir", "bench-ocr", "digitize", "bench-intents",
     ], help="Command to run")
+    p.add_argument("path", nargs="?", help="Folder argument for enroll-dir and digitize")
     p.add_argument("--image", help="Path to image for OCR or capture output", default="./data/capture.jpg")
     p.add_argument("--text", help="Text to speak", default="Hello from Lumen!")
     p.add_argument("--simulate", action="store_true", help="Run in simulation mode")
@@ -26,16 +27,23 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--gps-port", help="Serial port for GPS (COM3 or /dev/serial0)")
     p.add_argument("--iterations", type=int, default=30, help="Iterations for assist loop")
     p.add_argument("--interval", type=float, default=1.0, help="Interval seconds for assist loop")
+    p.add_argument("--output", help="Output folder for digitize (default: <folder>/digitized)")
+    p.add_argument("--audio", action="store_true", help="Also pre-render per-page audio when digitizing")
+    p.add_argument("--runs", type=int, default=5, help="Repetitions for benchmark commands")
+    p.add_argument("--workers", type=int, help="Worker processes for batch commands (default: CPU count)")
     return p
 
 
 def apply_overrides(args: argparse.Namespace) -> None:
+    # Applied to the shared CONFIG in place so every module sees them
+    changes = {}
     if args.simulate:
-        os.environ["SIMULATION"] = "1"
+        changes["simulate"] = True
     if args.vosk_model:
-        os.environ["VOSK_MODEL"] = args.vosk_model
+        changes["vosk_model"] = args.vosk_model
     if args.gps_port:
-        os.environ["GPS_SERIAL_PORT"] = args.gps_port
+        changes["gps_serial_port"] = args.gps_port
+    CONFIG_STORE.update(**changes)
 
 
 def cmd_read_text(image_path: str) -> None:
@@ -58,7 +66,7 @@ def cmd_capture(image_path: str) -> None:
 
 
 def cmd_listen(vosk_model: str | None) -> None:
-    model_path = vosk_model or os.getenv("VOSK_MODEL")
+    model_path = vosk_model or CONFIG.vosk_model
     vr = VoiceRecognizer(model_path)
     print("Listening...")
     heard = vr.listen_once()
@@ -86,19 +94,67 @@ def cmd_assist(iterations:int, interval:float, vosk_model:str|None) -> None:
     engine.run_loop(iterations=iterations, interval_sec=interval)
 
 
+def cmd_enroll_dir(folder: str | None, workers: int | None) -> None:
+    from lumen.vision import enroll_from_directory
+    if not folder:
+        print("Usage: lumen enroll-dir <folder>  (one subfolder of photos per person)")
+        return
+    res = enroll_from_directory(folder, workers=workers)
+    for item in res.get("images", []):
+        status = "ok" if item.get("ok") else item.get("reason", "skipped")
+        print(f"{item['person']}: {item['image']} -> {status}")
+    if res.get("ok"):
+        print("Enrolled:", ", ".join(res["enrolled"]))
+    if res.get("skipped_people"):
+        print("No usable photos for:", ", ".join(res["skipped_people"]))
+    if res.get("error"):
+        print("Error:", res["error"])
+
+
+def cmd_bench_ocr(image_path: str, runs: int) -> None:
+    from lumen.ocr import benchmark
+    if not Path(image_path).exists():
+        print("Image not found; capturing a new image...")
+        capture_image(image_path)
+    res = benchmark(image_path, runs=runs)
+    print(f"OCR language: {res['lang']}, runs: {res['runs']}")
+    for backend in ("subprocess", "tesserocr"):
+        if backend in res:
+            r = res[backend]
+            print(f"{backend:>10}: first {r['first_ms']} ms, mean {r['mean_ms']} ms, min {r['min_ms']} ms per page")
+
+
+def cmd_digitize(folder: str | None, output: str | None, audio: bool, workers: int | None) -> None:
+    from lumen.digitize import digitize
+    if not folder:
+        print("Usage: lumen digitize <folder> [--output DIR] [--audio] [--workers N]")
+        return
+
+    def _progress(p: dict) -> None:
+        print(f"[{p['done']}/{p['total']}] {p['page']}")
+
+    res = digitize(folder, output, audio=audio, workers=workers, progress=_progress)
+    print(f"Pages: {res['pages']}, processed: {res['processed']}, already done: {res['skipped']}")
+    print(f"Throughput: {res['pages_per_minute']} pages/min ({res['elapsed_sec']} s)")
+    for err in res["errors"]:
+        print("Error:", err)
+    print(f"Output: {res['output']}")
+
+
+def cmd_bench_intents(runs: int) -> None:
+    from lumen.intents import benchmark
+    res = benchmark(runs=max(1, runs) * 100)
+    print(f"Corpus: {res['utterances']} utterances x {res['runs']} runs; grammar: {res['grammar_phrases']} phrases")
+    for name in ("compiled", "substring"):
+        r = res[name]
+        print(f"{name:>10}: accuracy {r['accuracy']:.0%}, {r['us_per_utterance']} us/utterance")
+
+
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
     apply_overrides(args)
 
-    # Rebuild config with updated env (simple approach)
-    global CONFIG
-    CONFIG = Config(simulate=bool(int(os.getenv("SIMULATION", "0"))),
-                    tesseract_cmd=os.getenv("TESSERACT_CMD"),
-                    gps_serial_port=os.getenv("GPS_SERIAL_PORT"),
-                    gps_baudrate=int(os.getenv("GPS_BAUDRATE", "9600")),
-                    camera_index=int(os.getenv("CAMERA_INDEX", "0")))
-
     if args.command == "read-text":
         cmd_read_text(args.image)
     elif args.command == "speak":
@@ -115,6 +171,14 @@ def main() -> None:
         cmd_status()
     elif args.command == "assist":
         cmd_assist(args.iterations, args.interval, args.vosk_model)
+    elif args.command == "enroll-dir":
+        cmd_enroll_dir(args.path, args.workers)
+    elif args.command == "bench-ocr":
+        cmd_bench_ocr(args.image, args.runs)
+    elif args.command == "bench-intents":
+        cmd_bench_intents(args.runs)
+    elif args.command == "digitize":
+        cmd_digitize(args.path, args.output, args.audio, args.workers)
 
 
 if __name__ == "__main__":
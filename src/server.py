@@ -1,28 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import threading
-import os
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, Body
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Body, WebSocket
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 
-from lumen.config import CONFIG, Config
+from lumen.config import CONFIG, CONFIG_STORE
 from lumen.tts import speak
 from lumen.camera import capture_image
-from lumen.ocr import read_text_from_image
-from lumen.gps import get_location
-from lumen.gesture import read_gesture
-from lumen.env_sensors import read_environment
+from lumen.ocr import read_page, iter_page_text
+from lumen.ocr_cache import get_cache as get_ocr_cache
+from lumen.sensors import SENSORS
 from lumen.fusion import AssistEngine
 from lumen.wake import WakeWordListener
-from lumen.vision import enroll_person, list_people, forget_person, recognize
+from lumen.audio_bus import get_audio_bus
+from lumen.audio_localization import get_doa_engine
+from lumen.vision import BLUR_THRESHOLD, enroll_person, enroll_from_directory, list_people, forget_person, recognize
 from lumen.persona import get_persona, update_on_event
-from lumen.memory import list_events
+from lumen.memory import event_counts, query_events
+from lumen.events import EVENTS
+from lumen.jobs import JOBS, Job, JobCancelled
+from lumen.devices import DEVICES
+from lumen.models import MODELS
 
 app = FastAPI(title="Lumen Control API")
 
@@ -44,14 +50,32 @@ _wake_listener: Optional[WakeWordListener] = None
 _wake_enabled: bool = False
 
 
+@app.on_event("startup")
+def _warm_up_models() -> None:
+    SENSORS.start()
+    if CONFIG.ssd_warmup:
+        from lumen.objects import warm_up
+        warm_up(background=True)
+
+
+def _snapshot(name: str, max_age: Optional[float], force: bool) -> dict:
+    """A cached sensor snapshot as a flat dict: the reading plus ``ts``/``age_sec`` (and ``error``)."""
+    snap = SENSORS.get(name, max_age=max_age, force=force)
+    value = snap["value"] if isinstance(snap["value"], dict) else {}
+    out = {**value, "ts": snap["ts"], "age_sec": snap["age_sec"]}
+    if snap["error"]:
+        out["error"] = snap["error"]
+    return out
+
+
 @app.get("/api/status")
-def status():
+def status(max_age: Optional[float] = None, force: bool = False):
     running = _engine_thread is not None and _engine_thread.is_alive()
     return {
         "simulate": CONFIG.simulate,
         "engine_running": running,
-        "env": read_environment(),
-        "location": get_location(),
+        "env": _snapshot("environment", max_age, force),
+        "location": _snapshot("location", max_age, force),
     }
 
 
@@ -79,12 +103,35 @@ def _ensure_wake_listener():
     global _wake_listener
     with _wake_lock:
         if _wake_listener is None:
-            _wake_listener = WakeWordListener(os.getenv("VOSK_MODEL"))
+            _wake_listener = WakeWordListener(CONFIG.vosk_model)
+
+
+def _on_wake_wakeword():
+    # Start assist with no iteration limit when wake word detected
+    _start_assist_internal(iterations=None, interval=1.0, vosk_model=CONFIG.vosk_model)
+    speak("Hello, how can I help?")
+
+
+def _on_vosk_config(changed: dict) -> None:
+    """Reload the wake listener with the new Vosk model (restarting it if it was on)."""
+    global _wake_listener
+    with _wake_lock:
+        old, _wake_listener = _wake_listener, None
+    if old is None:
+        return
+    old.stop()
+    if _wake_enabled:
+        _ensure_wake_listener()
+        _wake_listener.start(_on_wake_wakeword)
+
+
+CONFIG_STORE.subscribe(_on_vosk_config, ("vosk_model",))
 
 
 @app.get("/api/wake")
 def api_wake_status():
-    return {"enabled": _wake_enabled}
+    stats = _wake_listener.stats() if _wake_listener is not None else None
+    return {"enabled": _wake_enabled, "stats": stats}
 
 
 @app.post("/api/wake")
@@ -94,11 +141,7 @@ def api_wake_set(payload: dict = Body({})):
     interval = float(payload.get("interval", 0.6))
     _ensure_wake_listener()
     if enable and not _wake_enabled and _wake_listener:
-        def _cb():
-            # Start assist with no iteration limit when wake word detected
-            _start_assist_internal(iterations=None, interval=1.0, vosk_model=os.getenv("VOSK_MODEL"))
-            speak("Hello, how can I help?")
-        _wake_listener.start(_cb, interval_sec=interval)
+        _wake_listener.start(_on_wake_wakeword, interval_sec=interval)
         _wake_enabled = True
     elif not enable and _wake_enabled and _wake_listener:
         _wake_listener.stop()
@@ -117,21 +160,12 @@ def get_language() -> dict:
 
 @app.post("/api/language")
 def set_language(payload: dict = Body({})) -> dict:
-    lang = payload.get("language")
-    tts_engine = payload.get("tts_engine")
-    piper_voice = payload.get("piper_voice")
-    # Update config snapshot with overrides, preserving other fields
-    global CONFIG
-    CONFIG = Config(
-        simulate=CONFIG.simulate,
-        tesseract_cmd=CONFIG.tesseract_cmd,
-        gps_serial_port=CONFIG.gps_serial_port,
-        gps_baudrate=CONFIG.gps_baudrate,
-        camera_index=CONFIG.camera_index,
-        language=lang or CONFIG.language,
-        tts_engine=tts_engine or CONFIG.tts_engine,
-        piper_voice=piper_voice or CONFIG.piper_voice,
-    )
+    # Applied in place, so TTS, OCR and the voice grammar pick it up without a restart
+    changes = {k: payload[k] for k in ("language", "tts_engine", "piper_voice") if payload.get(k)}
+    try:
+        CONFIG_STORE.update(**changes)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
     return {
         "ok": True,
         "language": CONFIG.language,
@@ -140,37 +174,191 @@ def set_language(payload: dict = Body({})) -> dict:
     }
 
 
+@app.get("/api/config")
+def api_config_get():
+    return CONFIG_STORE.snapshot()
+
+
+# Settings POST /api/config may change. Commands and file paths (tesseract_cmd, book_dir, vosk_model, ...)
+# are deliberately absent: the API is unauthenticated and those are executed or opened.
+RUNTIME_SETTINGS = (
+    "simulate", "language", "tts_engine", "voice_grammar",
+    "ocr_backend", "ocr_lang", "ocr_layout", "ocr_workers",
+    "camera_index", "camera_ring_size", "camera_ring_fps", "gps_baudrate",
+    "sensor_env_sec", "sensor_gps_sec", "sensor_gesture_sec",
+)
+
+
+@app.post("/api/config")
+def api_config_set(payload: dict = Body(...)):
+    """Change runtime-tunable settings (``RUNTIME_SETTINGS``), e.g. ``{"sensor_gps_sec": 5}``."""
+    refused = sorted(k for k in payload if k not in RUNTIME_SETTINGS)
+    if refused:
+        return JSONResponse({"ok": False, "error": f"Cannot be changed at runtime: {', '.join(refused)}",
+                             "allowed": list(RUNTIME_SETTINGS)}, status_code=400)
+    try:
+        changed = CONFIG_STORE.update(**payload)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+    return {"ok": True, "changed": {k: new for k, (_old, new) in changed.items()}}
+
+
+@app.get("/api/audio")
+def api_audio_stats():
+    """Shared microphone bus: stream state and per-subscriber overrun counters."""
+    return get_audio_bus(start=False).stats()
+
+
+@app.get("/api/audio/direction")
+def api_audio_direction():
+    """Latest sound direction from the mic array (needs MIC_ARRAY and AUDIO_CHANNELS >= 2)."""
+    doa = get_doa_engine()
+    if doa is None:
+        return {"available": False}
+    return {"available": True, **doa.stats()}
+
+
+@app.get("/api/models")
+def api_models():
+    """Shared models: loaded state, references, measured size and last use."""
+    return MODELS.stats()
+
+
+def _bad_request(e: Exception) -> JSONResponse:
+    return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+
+
+async def _job_response(job: Job, payload: dict):
+    """``{"async": true}`` returns the job id at once (202); otherwise wait for the result without holding a thread."""
+    if payload.get("async"):
+        return JSONResponse({"ok": True, "job_id": job.id, "status": job.status}, status_code=202)
+    try:
+        # Shielded: a client hanging up must not cancel the job's future under the worker
+        return await asyncio.shield(asyncio.wrap_future(job.future))
+    except JobCancelled:
+        return JSONResponse({"ok": False, "job_id": job.id, "status": job.status, "error": job.error},
+                            status_code=504 if job.status == "timeout" else 409)
+    except RuntimeError:
+        return JSONResponse({"ok": False, "job_id": job.id, "status": job.status, "error": job.error},
+                            status_code=500)
+
+
 @app.post("/api/capture")
-def api_capture(payload: dict = Body({})):
+async def api_capture(payload: dict = Body({})):
     path = payload.get("path", "./data/capture.jpg")
-    saved = capture_image(path)
-    return {"ok": True, "path": saved}
+    try:
+        job = JOBS.submit("capture", "camera", lambda job: {"ok": True, "path": capture_image(path)},
+                          timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    return await _job_response(job, payload)
 
 
 @app.post("/api/read-text")
-def api_read_text(payload: dict = Body({})):
+async def api_read_text(payload: dict = Body({})):
     path = payload.get("path", "./data/read.jpg")
     p = Path(path)
-    if not p.exists():
-        capture_image(path)
-    text = read_text_from_image(path)
-    speak(text)
-    return {"ok": True, "text": text}
+    if payload.get("stream"):
+        return _stream_text(p, payload)
+
+    def _read(job: Job) -> dict:
+        if not p.exists():
+            JOBS.run("camera", capture_image, path)
+        job.checkpoint()
+        page = read_page(path, layout=payload.get("layout"))
+        job.checkpoint()
+        speak(page["text"])
+        return {"ok": True, "text": page["text"], "skew_deg": page["skew_deg"],
+                "regions": page["regions"], "timings": page["timings"], "cached": page["cached"]}
+    try:
+        job = JOBS.submit("read_text", "ocr", _read, timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    return await _job_response(job, payload)
+
+
+def _stream_text(p: Path, payload: dict):
+    """NDJSON: one line per text block, spoken and sent as soon as it is recognized.
+
+    The OCR runs as a job on the ``ocr`` pool like any other read; its blocks
+    are handed to the response through a queue. A client that hangs up
+    cancels the job.
+    """
+    loop = asyncio.get_running_loop()
+    blocks: asyncio.Queue = asyncio.Queue()
+
+    def _push(item) -> None:
+        try:
+            loop.call_soon_threadsafe(blocks.put_nowait, item)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def _read(job: Job) -> dict:
+        if not p.exists():
+            JOBS.run("camera", capture_image, str(p))
+        text = []
+        for block in iter_page_text(str(p), layout=payload.get("layout")):
+            job.checkpoint()
+            _push(block)
+            speak(block)
+            text.append(block)
+        return {"ok": True, "text": "\n\n".join(text)}
+    try:
+        job = JOBS.submit("read_text", "ocr", _read, timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    job.future.add_done_callback(lambda _f: _push(None))
+
+    async def _lines():
+        try:
+            while True:
+                block = await blocks.get()
+                if block is None:
+                    break
+                yield json.dumps({"text": block}) + "\n"
+            if job.status != "done":
+                yield json.dumps({"error": job.error or job.status, "status": job.status}) + "\n"
+        finally:
+            if not job.future.done():
+                JOBS.cancel(job.id)
+    return StreamingResponse(_lines(), media_type="application/x-ndjson", headers={"X-Job-Id": job.id})
+
+
+@app.get("/api/ocr/cache")
+def api_ocr_cache_stats():
+    return get_ocr_cache().stats()
+
+
+@app.delete("/api/ocr/cache")
+def api_ocr_cache_clear():
+    get_ocr_cache().clear()
+    return {"ok": True}
 
 
 @app.get("/api/gps")
-def api_gps():
-    return get_location()
+def api_gps(max_age: Optional[float] = None, force: bool = False):
+    return _snapshot("location", max_age, force)
 
 
 @app.get("/api/gesture")
-def api_gesture():
-    return {"gesture": read_gesture()}
+def api_gesture(max_age: Optional[float] = None, force: bool = False):
+    snap = SENSORS.get("gesture", max_age=max_age, force=force)
+    return {"gesture": snap["value"], "ts": snap["ts"], "age_sec": snap["age_sec"], "error": snap["error"]}
 
 
 @app.get("/api/environment")
-def api_env():
-    return read_environment()
+def api_env(max_age: Optional[float] = None, force: bool = False):
+    return _snapshot("environment", max_age, force)
+
+
+@app.get("/api/sensors")
+def api_sensors():
+    return SENSORS.stats()
+
+
+@app.get("/api/devices")
+def api_devices():
+    return DEVICES.stats()
 
 
 @app.post("/api/assist/start")
@@ -182,30 +370,18 @@ def api_assist_start(payload: dict = Body({})):
     gps_port = payload.get("gps_port")
 
     # Apply runtime overrides
+    changes = {}
     if simulate:
-        os.environ["SIMULATION"] = "1"
+        changes["simulate"] = True
     if vosk_model:
-        os.environ["VOSK_MODEL"] = vosk_model
+        changes["vosk_model"] = vosk_model
     if gps_port:
-        os.environ["GPS_SERIAL_PORT"] = gps_port
-
-    # Rebuild config snapshot
-    global CONFIG
-    CONFIG = Config(simulate=bool(int(os.getenv("SIMULATION", "0"))),
-                    tesseract_cmd=os.getenv("TESSERACT_CMD"),
-                    gps_serial_port=os.getenv("GPS_SERIAL_PORT"),
-                    gps_baudrate=int(os.getenv("GPS_BAUDRATE", "9600")),
-                    camera_index=int(os.getenv("CAMERA_INDEX", "0")),
-                    language=os.getenv("LANGUAGE", CONFIG.language),
-                    tts_engine=os.getenv("TTS_ENGINE", CONFIG.tts_engine),
-                    piper_voice=os.getenv("PIPER_VOICE", CONFIG.piper_voice))
+        changes["gps_serial_port"] = gps_port
+    CONFIG_STORE.update(**changes)
 
-    with _engine_lock:
-        global _engine, _engine_thread
-        if _engine_thread is not None and _engine_thread.is_alive():
-            return JSONResponse({"ok": False, "error": "Engine already running"}, status_code=400)
-        _start_assist_internal(iterations=iterations, interval=interval, vosk_model=os.getenv("VOSK_MODEL"))
-        return {"ok": True}
+    if not _start_assist_internal(iterations=iterations, interval=interval, vosk_model=CONFIG.vosk_model):
+        return JSONResponse({"ok": False, "error": "Engine already running"}, status_code=400)
+    return {"ok": True}
 
 
 # --- People (Face Enrollment/Recognition) ---
@@ -216,12 +392,42 @@ def api_people_list():
 
 
 @app.post("/api/people/enroll")
-def api_people_enroll(payload: dict = Body(...)):
+async def api_people_enroll(payload: dict = Body(...)):
     name = payload.get("name")
     image_path = payload.get("image_path")
     if not name:
         return JSONResponse({"ok": False, "error": "Missing name"}, status_code=400)
-    return enroll_person(name, image_path)
+
+    def _enroll(job: Job) -> dict:
+        path = image_path or JOBS.run("camera", capture_image, "./data/enroll.jpg")
+        job.checkpoint()
+        return enroll_person(name, path)
+    try:
+        job = JOBS.submit("enroll", "vision", _enroll, timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    return await _job_response(job, payload)
+
+
+@app.post("/api/people/enroll-batch")
+async def api_people_enroll_batch(payload: dict = Body(...)):
+    directory = payload.get("directory")
+    if not directory:
+        return JSONResponse({"ok": False, "error": "Missing directory"}, status_code=400)
+    workers = payload.get("workers")
+    blur_threshold = payload.get("blur_threshold", BLUR_THRESHOLD)
+
+    def _enroll_batch(job: Job) -> dict:
+        return enroll_from_directory(directory, workers=workers, blur_threshold=float(blur_threshold))
+    try:
+        if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers <= 0):
+            raise ValueError("workers must be a positive integer")
+        if isinstance(blur_threshold, bool) or not isinstance(blur_threshold, (int, float)):
+            raise ValueError("blur_threshold must be a number")
+        job = JOBS.submit("enroll-batch", "vision", _enroll_batch, timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    return await _job_response(job, payload)
 
 
 @app.delete("/api/people/{name}")
@@ -230,10 +436,47 @@ def api_people_forget(name: str):
 
 
 @app.post("/api/recognize")
-def api_recognize(payload: dict = Body({})):
+async def api_recognize(payload: dict = Body({})):
     image_path = payload.get("image_path")
-    names = recognize(image_path)
-    return {"recognized": names}
+
+    def _recognize(job: Job) -> dict:
+        path = image_path or JOBS.run("camera", capture_image, "./data/recognize.jpg")
+        job.checkpoint()
+        return {"recognized": recognize(path)}
+    try:
+        job = JOBS.submit("recognize", "vision", _recognize, timeout_sec=payload.get("timeout"))
+    except ValueError as e:
+        return _bad_request(e)
+    return await _job_response(job, payload)
+
+
+# --- Jobs (async capture/OCR/recognition requests) ---
+
+@app.get("/api/jobs")
+def api_jobs_list(limit: int = 50):
+    return {"jobs": JOBS.list(limit), **JOBS.stats()}
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_job_status(job_id: str, wait: float = 0.0):
+    """Job status, with ``result`` once done. ``wait`` (seconds, max 30) long-polls until it finishes."""
+    job = JOBS.get(job_id)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "Unknown job"}, status_code=404)
+    if wait > 0:
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout=min(wait, 30.0))
+        except Exception:
+            pass
+    return job.summary()
+
+
+@app.delete("/api/jobs/{job_id}")
+def api_job_cancel(job_id: str):
+    job = JOBS.cancel(job_id)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "Unknown job"}, status_code=404)
+    return {"ok": True, "status": job.status}
 
 
 # --- Persona & Memory ---
@@ -254,8 +497,78 @@ def api_persona_event(payload: dict = Body(...)):
 
 
 @app.get("/api/memory")
-def api_memory_list(limit: int = 50):
-    return {"events": list_events(limit)}
+def api_memory_list(limit: int = 50, kind: Optional[str] = None, since: Optional[float] = None,
+                    until: Optional[float] = None, cursor: Optional[str] = None, order: str = "desc",
+                    fresh: bool = False):
+    try:
+        return query_events(kind, since, until, limit, cursor, order, fresh)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+
+
+@app.get("/api/memory/counts")
+def api_memory_counts(kind: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+                      fresh: bool = False):
+    return {"counts": event_counts(kind, since, until, fresh)}
+
+
+# --- Live stream (engine events, engine state and sensor snapshots) ---
+
+def _topics(topics: Optional[str]):
+    # Comma-separated topic prefixes, e.g. "engine,sensor.location,event.obstacle"; empty means everything
+    return [t.strip() for t in topics.split(",")] if topics else None
+
+
+@app.get("/api/stream")
+async def api_stream(topics: Optional[str] = None):
+    """Server-sent events: one JSON message per ``data:`` line, a comment every 15 s to keep proxies open."""
+    sub = EVENTS.subscribe(_topics(topics))
+
+    async def _events():
+        try:
+            yield "retry: 2000\n\n"
+            while not sub.closed:
+                msg = await sub.aget(timeout=15.0)
+                if msg is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {msg['seq']}\ndata: {json.dumps(msg)}\n\n"
+        finally:
+            sub.close()
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/ws/stream")
+async def ws_stream(websocket: WebSocket, topics: Optional[str] = None):
+    await websocket.accept()
+    sub = EVENTS.subscribe(_topics(topics))
+    # Wait for the next event and for the client at the same time; neither holds a thread
+    recv = asyncio.ensure_future(websocket.receive())
+    get = asyncio.ensure_future(sub.aget())
+    try:
+        while True:
+            await asyncio.wait({recv, get}, return_when=asyncio.FIRST_COMPLETED)
+            if get.done():
+                msg = get.result()
+                if msg is None:
+                    break
+                await websocket.send_json(msg)
+                get = asyncio.ensure_future(sub.aget())
+            if recv.done():
+                if recv.result().get("type") == "websocket.disconnect":
+                    break
+                recv = asyncio.ensure_future(websocket.receive())
+    except Exception:
+        pass
+    finally:
+        recv.cancel()
+        get.cancel()
+        sub.close()
+
+
+@app.get("/api/stream/stats")
+def api_stream_stats():
+    return EVENTS.stats()
 
 
 # --- Autonomy (convenience to start/stop infinite assist loop) ---
@@ -265,7 +578,7 @@ def api_autonomy(payload: dict = Body(...)):
     enable = bool(payload.get("enabled", True))
     interval = float(payload.get("interval", 1.0))
     if enable:
-        res = _start_assist_internal(iterations=None, interval=interval, vosk_model=os.getenv("VOSK_MODEL"))
+        res = _start_assist_internal(iterations=None, interval=interval, vosk_model=CONFIG.vosk_model)
         if not res:
             return JSONResponse({"ok": False, "error": "Engine already running"}, status_code=400)
         return {"ok": True, "running": True}
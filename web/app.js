@@ -55,6 +55,31 @@ async function showGesture() {
   document.getElementById('sensorStatus').textContent = JSON.stringify(r, null, 2);
 }
 
+// Live state pushed by /api/stream; state topics arrive as a full snapshot, then only changed fields
+const live = { state: {}, events: [] };
+
+function applyMessage(msg) {
+  if (msg.full === undefined) {
+    live.events.unshift(`${new Date(msg.ts * 1000).toLocaleTimeString()} ${msg.topic} ${JSON.stringify(msg.data)}`);
+    live.events = live.events.slice(0, 20);
+  } else if (msg.full) {
+    live.state[msg.topic] = msg.data;
+  } else {
+    const cur = Object.assign(live.state[msg.topic] || {}, msg.changed);
+    (msg.removed || []).forEach((k) => delete cur[k]);
+    live.state[msg.topic] = cur;
+  }
+  document.getElementById('liveState').textContent = JSON.stringify(live.state, null, 2);
+  document.getElementById('liveEvents').textContent = live.events.join('\n');
+}
+
+function connectLive() {
+  // EventSource reconnects by itself after errors
+  const source = new EventSource('/api/stream?topics=engine,sensor,event');
+  source.onmessage = (e) => applyMessage(JSON.parse(e.data));
+  source.onopen = () => { live.state = {}; };
+}
+
 window.addEventListener('DOMContentLoaded', () => {
   document.getElementById('refresh').addEventListener('click', refreshStatus);
   document.getElementById('start').addEventListener('click', startEngine);
@@ -66,4 +91,5 @@ window.addEventListener('DOMContentLoaded', () => {
   document.getElementById('envBtn').addEventListener('click', showEnv);
   document.getElementById('gestureBtn').addEventListener('click', showGesture);
   refreshStatus();
+  connectLive();
 });
\ No newline at end of file